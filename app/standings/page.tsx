@@ -58,7 +58,7 @@ export default function StandingsPage() {
   const fetchStandings = async () => {
     setIsLoading(true)
     try {
-      const response = await fetch(`${API_URL}/standings/${selectedLeague}`)
+      const response = await fetch(`${API_URL}/standings/${selectedLeague}?fields=team,MP,W,D,L,GF,GA,GD,Pts`)
       if (response.ok) {
         const data = await response.json()
         // API'den gelen veriyi dönüştür
@@ -8,11 +8,31 @@ import json
 import os
 from dotenv import load_dotenv
 
+from http_clients import http_clients
+from resilience import CircuitOpenError, breakers
+
 load_dotenv()
 
 # Grok API ayarları
 GROK_API_KEY = os.getenv("GROK_API_KEY", "")
-GROK_API_URL = "https://api.x.ai/v1/chat/completions"
+GROK_API_URL = os.getenv("GROK_API_URL", "https://api.x.ai/v1/chat/completions")
+
+# Paylaşılan bağlantı havuzu (yanıt üretimi uzun sürebilir: 60 sn)
+GROK_CONNECT_TIMEOUT = float(os.getenv("GROK_CONNECT_TIMEOUT", "5"))
+GROK_READ_TIMEOUT = float(os.getenv("GROK_READ_TIMEOUT", "60"))
+client = http_clients.client(
+    "grok",
+    httpx.Timeout(GROK_READ_TIMEOUT, connect=GROK_CONNECT_TIMEOUT),
+    max_connections=int(os.getenv("GROK_MAX_CONNECTIONS", "10")),
+)
+
+# Grok art arda zaman aşımı/5xx verirse istekler 60 sn beklenmeden reddedilir
+# (POST idempotent olmadığından yeniden denenmez)
+breaker = breakers.breaker("grok")
+
+
+class GrokUnavailable(Exception):
+    """Grok geçici olarak yanıt veremiyor (5xx)"""
 
 # Sistem promptu
 SYSTEM_PROMPT = """Sen profesyonel bir futbol analisti ve asistanısın. Türkçe konuşuyorsun.
@@ -70,7 +90,7 @@ async def chat_with_grok(
     messages.append({"role": "user", "content": user_message})
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        with breaker.protect((httpx.TransportError, GrokUnavailable)):
             response = await client.post(
                 GROK_API_URL,
                 headers={
@@ -84,15 +104,21 @@ async def chat_with_grok(
                     "max_tokens": 2000
                 }
             )
+            if response.status_code >= 500:
+                raise GrokUnavailable(f"API Hatası: {response.status_code} - {response.text}")
 
-            if response.status_code == 200:
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
-            else:
-                return f"API Hatası: {response.status_code} - {response.text}"
+        if response.status_code == 200:
+            data = response.json()
+            return data["choices"][0]["message"]["content"]
+        else:
+            return f"API Hatası: {response.status_code} - {response.text}"
 
     except httpx.TimeoutException:
         return "İstek zaman aşımına uğradı. Lütfen tekrar deneyin."
+    except CircuitOpenError as e:
+        return f"AI servisi şu an yanıt vermiyor, {int(e.retry_after) + 1} sn sonra tekrar deneyin."
+    except GrokUnavailable as e:
+        return str(e)
     except Exception as e:
         return f"Bir hata oluştu: {str(e)}"
 
@@ -5,20 +5,58 @@ https://www.api-football.com/
 Süper Lig dahil tüm liglerin canlı verileri
 """
 
+import asyncio
 import httpx
-from typing import Optional, List, Dict, Any
-from datetime import datetime, date
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime, timezone
 import os
+import time
 from dotenv import load_dotenv
-from cachetools import TTLCache
+from apif_keys import canonical_params, request_fingerprint, request_metrics
+from apif_quota import APIF_MAX_THROTTLE_RETRIES, Priority, QuotaDeferredError, priority_for, quota
+from apif_store import response_store
+from apif_ttl import APIF_CACHE_HARD_TTL, APIF_CACHE_TTL, PERMANENT, ttl_policy
+from cache import CACHE_NEGATIVE_TTL, CACHE_STALE_IF_ERROR, cache_registry
+from http_clients import http_clients
+from name_index import fold
+from resilience import breakers, retry_async
 
 load_dotenv()
 
 API_FOOTBALL_KEY = os.getenv("API_FOOTBALL_KEY", "")
-API_FOOTBALL_URL = "https://v3.football.api-sports.io"
+API_FOOTBALL_URL = os.getenv("API_FOOTBALL_URL", "https://v3.football.api-sports.io")
+
+# Paylaşılan bağlantı havuzu (bağlantı 5 sn, yanıt 15 sn)
+APIF_CONNECT_TIMEOUT = float(os.getenv("APIF_CONNECT_TIMEOUT", "5"))
+APIF_READ_TIMEOUT = float(os.getenv("APIF_READ_TIMEOUT", "15"))
+client = http_clients.client(
+    "api_football",
+    httpx.Timeout(APIF_READ_TIMEOUT, connect=APIF_CONNECT_TIMEOUT),
+)
+
+# Cache (süreler endpoint'e göre apif_ttl tablosundan, bulunamazsa 15 dk / 1 saat)
+# Aynı sorgu için eşzamanlı istekler tek upstream çağrısında birleşir
+cache = cache_registry.namespace("apif", APIF_CACHE_TTL, APIF_CACHE_HARD_TTL, share=0.3)
+
+
+# `ids` sorgusunda istek başına en fazla maç sayısı
+APIF_MAX_IDS = 20
+
+
+# Geçici sayılıp yeniden denenen yanıt kodları
+APIF_RETRY_STATUSES = {500, 502, 503, 504}
+
+# Art arda hatalarda istekleri upstream'i beklemeden reddeden devre kesici
+breaker = breakers.breaker("api_football")
+
+
+class APIFootballError(Exception):
+    """API-Football başarısız yanıt döndü"""
+
+
+class APIFootballUnavailable(APIFootballError):
+    """API-Football geçici olarak yanıt veremiyor (5xx)"""
 
-# Cache (15 dakika TTL)
-cache = TTLCache(maxsize=100, ttl=900)
 
 # Lig ID'leri
 LEAGUE_IDS = {
@@ -56,57 +94,161 @@ TURKISH_TEAMS = {
 }
 
 
-async def api_request(endpoint: str, params: Dict[str, Any] = None) -> Dict:
-    """API-Football'a istek gönder"""
+async def api_request(
+    endpoint: str,
+    params: Dict[str, Any] = None,
+    refresh: bool = False,
+    priority: Optional[Priority] = None
+) -> Dict:
+    """
+    API-Football'a istek gönder (refresh=True ise cache atlanır ve yenilenir)
+
+    Bellekte olmayan sorgu önce kalıcı depodan (apif_store) okunur; taze
+    veya değişmez kayıt varsa upstream'e gidilmez. Kota yetersizliğinden
+    ertelenen, hata veren veya devre kesicisi açık istekte süresi dolmuş
+    olsa da bellekteki ya da depodaki son sağlam yanıt döner. Parametre
+    sırası, tipi ve None değerleri anahtarı değiştirmez
+    (apif_keys.request_fingerprint). priority verilmezse kota önceliği
+    endpoint'ten belirlenir (apif_quota.priority_for).
+    """
     if not API_FOOTBALL_KEY:
         return {"error": "API key yapılandırılmamış"}
 
-    cache_key = f"{endpoint}_{str(params)}"
-    if cache_key in cache:
-        return cache[cache_key]
+    params = canonical_params(params)
+    cache_key = request_fingerprint(endpoint, params)
+    request_metrics.request(endpoint, cache_key)
 
-    headers = {
-        "x-apisports-key": API_FOOTBALL_KEY,
-    }
+    # Bellek cache'ine yazılacak TTL (depodan gelen kaydın yaşı kadar kısa)
+    entry_ttl = None
 
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{API_FOOTBALL_URL}/{endpoint}",
-                headers=headers,
-                params=params
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                cache[cache_key] = data
-                return data
+    async def fetch() -> Dict:
+        nonlocal entry_ttl
+        stored = None if refresh else await response_store.get(cache_key)
+        if stored is not None and stored.is_fresh:
+            if stored.immutable:
+                # Değişmez yazılmış kayıt (bitmiş maç, geçmiş sezon) süresiz kalır
+                entry_ttl = PERMANENT
             else:
-                return {"error": f"API Hatası: {response.status_code}"}
+                entry_ttl = _remaining(ttl_policy.ttl(endpoint, params, stored.value), stored.age)
+            return stored.value
+
+        request_metrics.upstream(endpoint, cache_key)
+        try:
+            data = await _fetch(endpoint, params, priority)
+        except Exception as e:
+            stored = stored or await response_store.get(cache_key)
+            if stored is None or time.time() >= stored.expires_at + CACHE_STALE_IF_ERROR:
+                raise
+            # Negatif TTL boyunca bellekten döner; upstream ancak sonra yeniden denenir
+            _on_fallback(e)
+            entry_ttl = (CACHE_NEGATIVE_TTL, CACHE_NEGATIVE_TTL + CACHE_STALE_IF_ERROR)
+            return stored.value
+
+        await _learn_fixture_status(endpoint, params)
+        entry_ttl = ttl_policy.ttl(endpoint, params, data)
+        if not data.get("errors"):
+            await response_store.put(cache_key, endpoint, data, entry_ttl)
+        return data
 
+    try:
+        return await cache.get_or_fetch(
+            cache_key,
+            fetch,
+            refresh=refresh,
+            ttl=lambda data: entry_ttl,
+            on_fallback=_on_fallback,
+        )
     except Exception as e:
         return {"error": str(e)}
 
 
-async def get_live_matches(league_id: int = None) -> Dict:
+async def _learn_fixture_status(endpoint: str, params: Dict[str, Any]):
+    """
+    Alt kaynağın maçı bu süreçte görülmediyse bitmiş olup olmadığını
+    paylaşılan depodaki `fixtures?id=` kaydından öğren (bitmiş maç
+    değişmez yazılır; yeniden başlatma ve diğer worker'lar için)
+    """
+    fixture_id = ttl_policy.needs_fixture_status(endpoint, params)
+    if fixture_id is None:
+        return
+    stored = await response_store.get(request_fingerprint("fixtures", {"id": fixture_id}))
+    if stored is not None and stored.immutable:
+        ttl_policy.learn("fixtures", stored.value)
+
+
+def _remaining(ttl: Tuple[float, float], age: float) -> Tuple[float, float]:
+    soft_ttl, hard_ttl = ttl
+    return max(0.0, soft_ttl - age), max(0.0, hard_ttl - age)
+
+
+def _on_fallback(error: Exception):
+    if isinstance(error, QuotaDeferredError):
+        quota.served_stale()
+
+
+async def _send(endpoint: str, params: Optional[Dict[str, Any]]) -> httpx.Response:
+    """Tek upstream denemesi; 5xx'te APIFootballUnavailable"""
+    response = await client.get(
+        f"{API_FOOTBALL_URL}/{endpoint}",
+        headers={"x-apisports-key": API_FOOTBALL_KEY},
+        params=params
+    )
+    quota.update(response.headers)
+    if response.status_code in APIF_RETRY_STATUSES:
+        raise APIFootballUnavailable(f"API Hatası: {response.status_code}")
+    return response
+
+
+async def _fetch(endpoint: str, params: Optional[Dict[str, Any]], priority: Optional[Priority] = None) -> Dict:
+    """
+    Upstream isteği kota zamanlayıcısı ve devre kesiciden geçirerek yap;
+    başarısız yanıtta hata fırlat (cache'lenmez). Bağlantı hataları ve 5xx
+    yanıtlar beklemeyle yeniden denenir, 429'da istek sıraya geri alınır.
+
+    Kota token'ı mantıksal istek başına bir kez alınır; geçici hata
+    denemeleri (en fazla RETRY_ATTEMPTS) aynı token'la yapılır ve gerçek
+    kullanım yanıt başlıklarından güncellenir. Yalnızca 429 sonrası istek
+    sıraya yeniden girer.
+    """
+    if priority is None:
+        priority = priority_for(endpoint, params)
+
+    with breaker.protect((httpx.TransportError, APIFootballUnavailable)):
+        for attempt in range(APIF_MAX_THROTTLE_RETRIES + 1):
+            await quota.acquire(priority)
+            response = await retry_async(
+                lambda: _send(endpoint, params),
+                retry_on=(httpx.TransportError, APIFootballUnavailable),
+            )
+            if response.status_code != 429:
+                break
+            retry_after = response.headers.get("retry-after")
+            quota.throttled(float(retry_after) if retry_after and retry_after.isdigit() else None)
+
+    if response.status_code == 200:
+        return response.json()
+    raise APIFootballError(f"API Hatası: {response.status_code}")
+
+
+async def get_live_matches(league_id: int = None, refresh: bool = False, priority: Optional[Priority] = None) -> Dict:
     """Canlı maçları getir"""
     params = {"live": "all"}
     if league_id:
         params["league"] = league_id
 
-    return await api_request("fixtures", params)
+    return await api_request("fixtures", params, refresh=refresh, priority=priority)
 
 
-async def get_standings(league_id: int, season: int = 2024) -> Dict:
+async def get_standings(league_id: int, season: int = 2024, refresh: bool = False) -> Dict:
     """Lig puan durumunu getir"""
     params = {
         "league": league_id,
         "season": season
     }
-    return await api_request("standings", params)
+    return await api_request("standings", params, refresh=refresh)
 
 
-async def get_fixtures(league_id: int, season: int = 2024, next_matches: int = None, last_matches: int = None) -> Dict:
+async def get_fixtures(league_id: int, season: int = 2024, next_matches: int = None, last_matches: int = None, refresh: bool = False) -> Dict:
     """Fikstür getir"""
     params = {
         "league": league_id,
@@ -118,7 +260,7 @@ async def get_fixtures(league_id: int, season: int = 2024, next_matches: int = N
     if last_matches:
         params["last"] = last_matches
 
-    return await api_request("fixtures", params)
+    return await api_request("fixtures", params, refresh=refresh)
 
 
 async def get_fixture_by_id(fixture_id: int) -> Dict:
@@ -127,6 +269,27 @@ async def get_fixture_by_id(fixture_id: int) -> Dict:
     return await api_request("fixtures", params)
 
 
+async def get_fixtures_by_ids(fixture_ids: List[int]) -> Dict:
+    """
+    Birden çok maçı olaylar, kadrolar ve istatistiklerle birlikte getir
+
+    API-Football `ids` sorgusu istek başına en fazla APIF_MAX_IDS maç
+    kabul eder; daha uzun listeler parçalara bölünüp eşzamanlı çekilir.
+    """
+    fixture_ids = sorted(set(fixture_ids))
+    chunks = [fixture_ids[i:i + APIF_MAX_IDS] for i in range(0, len(fixture_ids), APIF_MAX_IDS)]
+    results = await asyncio.gather(*[
+        api_request("fixtures", {"ids": "-".join(str(fixture_id) for fixture_id in chunk)})
+        for chunk in chunks
+    ])
+
+    errors = [data["error"] for data in results if "error" in data]
+    if errors and len(errors) == len(results):
+        return {"error": errors[0]}
+    response = [item for data in results if "error" not in data for item in data.get("response", [])]
+    return {"results": len(response), "response": response, "errors": errors}
+
+
 async def get_head_to_head(team1_id: int, team2_id: int, last: int = 10) -> Dict:
     """İki takım arasındaki geçmiş maçları getir"""
     params = {
@@ -142,6 +305,24 @@ async def get_team_info(team_id: int) -> Dict:
     return await api_request("teams", params)
 
 
+async def get_team_leagues(team_id: int, season: int = 2024) -> Dict:
+    """Takımın sezonda oynadığı tüm turnuvaları getir"""
+    params = {
+        "team": team_id,
+        "season": season
+    }
+    return await api_request("leagues", params)
+
+
+async def get_league_teams(league_id: int, season: int = 2024) -> Dict:
+    """Ligdeki takımları getir"""
+    params = {
+        "league": league_id,
+        "season": season
+    }
+    return await api_request("teams", params)
+
+
 async def get_team_statistics(team_id: int, league_id: int, season: int = 2024) -> Dict:
     """Takım istatistiklerini getir"""
     params = {
@@ -228,14 +409,23 @@ def get_league_id(league_name: str) -> Optional[int]:
 
 def get_team_id(team_name: str) -> Optional[int]:
     """Takım adından ID'yi bul"""
-    team_key = team_name.lower().replace(" ", "_").replace("ş", "s").replace("ı", "i").replace("ğ", "g").replace("ü", "u").replace("ö", "o").replace("ç", "c")
+    team_key = fold(team_name).replace(" ", "_")
     return TURKISH_TEAMS.get(team_key)
 
 
+def utc_today() -> str:
+    """
+    Bugünün tarihi (YYYY-MM-DD, UTC)
+
+    API-Football `date=` sorgusunu ve maç tarihlerini (timezone verilmezse)
+    UTC'ye göre yorumlar; gün hesapları hep bu tarihle yapılır.
+    """
+    return datetime.now(timezone.utc).date().isoformat()
+
+
 async def get_today_matches(league_id: int = None) -> Dict:
-    """Bugünün maçlarını getir"""
-    today = date.today().strftime("%Y-%m-%d")
-    params = {"date": today}
+    """Bugünün (UTC) maçlarını getir"""
+    params = {"date": utc_today()}
 
     if league_id:
         params["league"] = league_id
@@ -0,0 +1,92 @@
+"""
+API-Football İstek Parmak İzi
+
+Aynı upstream sorgusu, parametreler farklı sırada, farklı tiplerle
+(203 / "203") ya da None değerli parametrelerle kurulsa da tek bir kanonik
+anahtara indirgenir. Cache, eşzamanlı isteklerin birleştirilmesi
+(single-flight) ve istek ölçümleri bu anahtarı kullanır; upstream'e de
+kanonik parametreler gönderilir.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+# Ölçümleri tutulan en fazla farklı sorgu (en eskisi düşer)
+MAX_TRACKED_FINGERPRINTS = 500
+
+
+def _normalize(value: Any) -> str:
+    # httpx'in query string kodlamasıyla aynı gösterim
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def canonical_params(params: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """None değerleri atılmış, string'e çevrilmiş ve anahtara göre sıralı parametreler"""
+    return {
+        str(key): _normalize(value)
+        for key, value in sorted((params or {}).items(), key=lambda item: str(item[0]))
+        if value is not None
+    }
+
+
+def request_fingerprint(endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Upstream sorgusunun kanonik anahtarı
+
+    Örn. request_fingerprint("fixtures", {"season": 2024, "league": "203", "next": None})
+    -> "fixtures?league=203&season=2024"
+    """
+    query = urlencode(canonical_params(params))
+    endpoint = endpoint.strip("/")
+    return f"{endpoint}?{query}" if query else endpoint
+
+
+class RequestMetrics:
+    """Parmak izi ve endpoint başına istek / upstream çağrısı sayıları"""
+
+    def __init__(self, max_tracked: int = MAX_TRACKED_FINGERPRINTS):
+        self.max_tracked = max_tracked
+        self._fingerprints: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def _counters(self, endpoint: str, fingerprint: str):
+        counters = self._fingerprints.get(fingerprint)
+        if counters is None:
+            counters = self._fingerprints[fingerprint] = {"requests": 0, "upstream": 0}
+            while len(self._fingerprints) > self.max_tracked:
+                self._fingerprints.popitem(last=False)
+        else:
+            self._fingerprints.move_to_end(fingerprint)
+        return counters, self._endpoints.setdefault(endpoint, {"requests": 0, "upstream": 0})
+
+    def request(self, endpoint: str, fingerprint: str):
+        """api_request çağrısı (cache'ten veya birleştirilerek karşılanmış olabilir)"""
+        for counters in self._counters(endpoint, fingerprint):
+            counters["requests"] += 1
+
+    def upstream(self, endpoint: str, fingerprint: str):
+        """Sorgu için gerçek upstream çağrısı yapıldı"""
+        for counters in self._counters(endpoint, fingerprint):
+            counters["upstream"] += 1
+
+    def stats(self, top: int = 20) -> Dict[str, Any]:
+        """Endpoint toplamları ve en çok istenen sorgular"""
+        requests = sum(counters["requests"] for counters in self._endpoints.values())
+        upstream = sum(counters["upstream"] for counters in self._endpoints.values())
+        busiest = sorted(self._fingerprints.items(), key=lambda item: item[1]["requests"], reverse=True)
+        return {
+            "requests": requests,
+            "upstream": upstream,
+            "deduplicated": max(0, requests - upstream),
+            "tracked_fingerprints": len(self._fingerprints),
+            "endpoints": self._endpoints,
+            "top": [{"fingerprint": fingerprint, **counters} for fingerprint, counters in busiest[:top]],
+        }
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,242 @@
+"""
+API-Football Kota Zamanlayıcısı
+
+Upstream istekleri dakikalık bir token bucket'tan geçer. Bucket ve günlük
+kota API-Football'un `x-ratelimit-*` yanıt başlıklarıyla güncellenir.
+Token yokken bekleyen istekler öncelik sırasıyla (canlı maçlar ve olaylar
+önce, aramalar ve sezon istatistikleri sonra) gönderilir.
+
+Kota azaldığında düşük öncelikli istekler ertelenir (QuotaDeferredError);
+çağıran taraf varsa bayat cache kaydını döndürür. 429 yanıtında bucket
+boşaltılır ve istek sıraya geri alınır.
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from datetime import datetime, timezone
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Plan limitleri (başlıklar gelince güncellenir)
+APIF_RATE_PER_MINUTE = int(os.getenv("APIF_RATE_PER_MINUTE", "10"))
+APIF_DAILY_LIMIT = int(os.getenv("APIF_DAILY_LIMIT", "100"))
+
+# Günlük kotanın bu oranı kaldığında düşük/normal öncelikli istekler ertelenir
+APIF_LOW_RESERVE = float(os.getenv("APIF_LOW_RESERVE", "0.2"))
+APIF_NORMAL_RESERVE = float(os.getenv("APIF_NORMAL_RESERVE", "0.05"))
+
+# 429 sonrası en fazla yeniden deneme
+APIF_MAX_THROTTLE_RETRIES = int(os.getenv("APIF_MAX_THROTTLE_RETRIES", "2"))
+
+
+class Priority(IntEnum):
+    HIGH = 0        # canlı maçlar, maç olayları
+    NORMAL = 1      # günün maçları, maç detayı, puan durumu
+    LOW = 2         # aramalar, sezon istatistikleri, takım bilgileri
+
+
+# Sıradaki bir token için en fazla bekleme (saniye); aşılırsa ertelenir
+MAX_WAIT = {
+    Priority.HIGH: float(os.getenv("APIF_HIGH_MAX_WAIT", "15")),
+    Priority.NORMAL: float(os.getenv("APIF_NORMAL_MAX_WAIT", "10")),
+    Priority.LOW: float(os.getenv("APIF_LOW_MAX_WAIT", "3")),
+}
+
+RESERVES = {
+    Priority.HIGH: 0.0,
+    Priority.NORMAL: APIF_NORMAL_RESERVE,
+    Priority.LOW: APIF_LOW_RESERVE,
+}
+
+
+class QuotaDeferredError(Exception):
+    """Kota yetersiz olduğu için istek ertelendi"""
+
+    # Upstream hatası değil: cache'te negatif kayıt olarak tutulmaz
+    negative_cacheable = False
+
+
+def priority_for(endpoint: str, params: Optional[Dict[str, Any]]) -> Priority:
+    """Endpoint ve parametrelere göre isteğin önceliği"""
+    params = params or {}
+    if endpoint == "fixtures/events" or (endpoint == "fixtures" and "live" in params):
+        return Priority.HIGH
+    if endpoint in ("standings", "fixtures/statistics", "fixtures/lineups"):
+        return Priority.NORMAL
+    if endpoint == "fixtures" and ({"id", "ids", "date", "next", "last"} & set(params)):
+        return Priority.NORMAL
+    return Priority.LOW
+
+
+def _int_header(headers, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class QuotaScheduler:
+    """Dakikalık token bucket + günlük kota + öncelik kuyruğu"""
+
+    def __init__(self, per_minute: int = APIF_RATE_PER_MINUTE, daily_limit: int = APIF_DAILY_LIMIT):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.daily_limit = daily_limit
+        self.daily_remaining: Optional[int] = None      # ilk yanıta kadar bilinmez
+        self._daily_date: Optional[str] = None
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._pump_task: Optional[asyncio.Task] = None
+        self._counts = {
+            "granted": 0, "queued": 0, "deferred": 0, "served_stale": 0, "throttled": 0,
+        }
+        self._by_priority = {p.name.lower(): {"granted": 0, "deferred": 0} for p in Priority}
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.capacity / 60)
+        self._updated = now
+
+    def _daily_remaining(self) -> Optional[int]:
+        # Günlük kota UTC gece yarısı sıfırlanır
+        today = datetime.now(timezone.utc).date().isoformat()
+        if self._daily_date != today:
+            return None
+        return self.daily_remaining
+
+    def in_reserve(self, priority: Priority) -> bool:
+        """Günlük kota önceliğin rezervine indi mi (henüz bilinmiyorsa False)"""
+        remaining = self._daily_remaining()
+        if remaining is None:
+            return False
+        return remaining <= 0 or remaining <= RESERVES[priority] * self.daily_limit
+
+    def _check_daily(self, priority: Priority):
+        if self.in_reserve(priority):
+            self._defer(priority)
+            raise QuotaDeferredError(f"Günlük API kotası azaldı ({self.daily_remaining}/{self.daily_limit})")
+
+    def _defer(self, priority: Priority):
+        self._counts["deferred"] += 1
+        self._by_priority[priority.name.lower()]["deferred"] += 1
+
+    def _grant(self, priority: Priority):
+        self.tokens -= 1
+        self._counts["granted"] += 1
+        self._by_priority[priority.name.lower()]["granted"] += 1
+
+    async def acquire(self, priority: Priority):
+        """
+        İstek için token al
+
+        Token yoksa öncelik sırasıyla bekler. Günlük kota önceliğin
+        rezervinin altındaysa veya bekleme MAX_WAIT'i aşarsa
+        QuotaDeferredError fırlatır.
+        """
+        self._check_daily(priority)
+        self._refill()
+        if not self._queue and self.tokens >= 1 and time.monotonic() >= self._paused_until:
+            self._grant(priority)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._seq), future))
+        self._counts["queued"] += 1
+        if self._pump_task is None or self._pump_task.done():
+            self._pump_task = asyncio.ensure_future(self._pump())
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=MAX_WAIT[priority])
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return
+            future.cancel()
+            self._defer(priority)
+            raise QuotaDeferredError("API-Football dakikalık kotası dolu, istek ertelendi")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    async def _pump(self):
+        while self._queue:
+            self._refill()
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) * 60 / self.capacity)
+                continue
+
+            priority, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self._grant(Priority(priority))
+            future.set_result(None)
+
+    def update(self, headers):
+        """Yanıt başlıklarından dakikalık ve günlük kotayı güncelle"""
+        minute_limit = _int_header(headers, "x-ratelimit-limit")
+        minute_remaining = _int_header(headers, "x-ratelimit-remaining")
+        daily_limit = _int_header(headers, "x-ratelimit-requests-limit")
+        daily_remaining = _int_header(headers, "x-ratelimit-requests-remaining")
+
+        if minute_limit:
+            self.capacity = minute_limit
+        if minute_remaining is not None:
+            self._refill()
+            self.tokens = min(self.tokens, float(minute_remaining))
+        if daily_limit:
+            self.daily_limit = daily_limit
+        if daily_remaining is not None:
+            self.daily_remaining = daily_remaining
+            self._daily_date = datetime.now(timezone.utc).date().isoformat()
+
+    def throttled(self, retry_after: Optional[float] = None):
+        """429 alındı: bucket'ı boşalt ve süre dolana kadar bekle"""
+        self._counts["throttled"] += 1
+        self.tokens = 0.0
+        self._updated = time.monotonic()
+        self._paused_until = time.monotonic() + (retry_after if retry_after else 60.0)
+
+    def served_stale(self):
+        """Ertelenen isteğin yerine bayat cache kaydı döndü"""
+        self._counts["served_stale"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Kota durumu"""
+        self._refill()
+        remaining = self._daily_remaining()
+        return {
+            "per_minute": {
+                "limit": self.capacity,
+                "tokens": round(self.tokens, 2),
+                "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            },
+            "daily": {
+                "limit": self.daily_limit,
+                "remaining": remaining,
+                "used": self.daily_limit - remaining if remaining is not None else None,
+                "low_reserve": int(APIF_LOW_RESERVE * self.daily_limit),
+                "normal_reserve": int(APIF_NORMAL_RESERVE * self.daily_limit),
+            },
+            "queue": {
+                p.name.lower(): sum(1 for item in self._queue if item[0] == p and not item[2].done())
+                for p in Priority
+            },
+            **self._counts,
+            "by_priority": self._by_priority,
+        }
+
+
+quota = QuotaScheduler()
@@ -0,0 +1,205 @@
+"""
+API-Football Kalıcı Yanıt Deposu (SQLite)
+
+Ham API-Football yanıtları kanonik istek anahtarıyla (apif_keys) yerel bir
+SQLite dosyasında saklanır. Bellek cache'inde olmayan bir sorgu önce
+buradan okunur; yeniden başlatma, yeni deploy veya bellekten atılma
+kotaya yeniden mal olmaz. Dosya WAL modunda açıldığından aynı makinedeki
+tüm uvicorn worker'ları tarafından paylaşılır.
+
+Her kayıt endpoint'e göre bir son kullanma zamanı (apif_ttl) ve
+değişmezlik bayrağı taşır. Bitmiş maçlar ve geçmiş sezon verileri
+değişmez olarak yazılır ve hiç silinmez.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+from dotenv import load_dotenv
+
+from cache import CACHE_STALE_IF_ERROR
+from serialization import dumps
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson yoksa standart json kullanılır
+    import json
+    _loads = json.loads
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+APIF_STORE_ENABLED = os.getenv("APIF_STORE_ENABLED", "true").lower() == "true"
+APIF_STORE_PATH = os.getenv("APIF_STORE_PATH", "data/apif.sqlite3")
+
+# Bu kadar yazmada bir süresi (ve stale-if-error penceresi) dolan kayıtlar silinir
+APIF_STORE_PRUNE_EVERY = int(os.getenv("APIF_STORE_PRUNE_EVERY", "500"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    body BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    fresh_until REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    immutable INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (immutable, expires_at);
+"""
+
+
+class StoredResponse(NamedTuple):
+    value: Dict[str, Any]
+    stored_at: float
+    fresh_until: float      # soft TTL sonu
+    expires_at: float       # hard TTL sonu (değişmezse inf)
+    immutable: bool
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.immutable or time.time() < self.fresh_until
+
+
+def _finite(value: float) -> float:
+    # SQLite REAL inf saklayabilir ama açıkça büyük bir sayı daha taşınabilir
+    return value if value != float("inf") else 1e18
+
+
+class ResponseStore:
+    """Kanonik anahtarlı, süreli ve değişmezlik bayraklı yanıt deposu"""
+
+    def __init__(self, path: str = APIF_STORE_PATH, enabled: bool = APIF_STORE_ENABLED):
+        self.path = path
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._counts = {"hits": 0, "stale_reads": 0, "misses": 0, "writes": 0, "errors": 0, "pruned": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            # WAL: worker'lar okurken yazabilir; bekleme süresi kilit çakışmaları için
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key: str) -> Optional[StoredResponse]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT body, stored_at, fresh_until, expires_at, immutable FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        body, stored_at, fresh_until, expires_at, immutable = row
+        return StoredResponse(_loads(body), stored_at, fresh_until, expires_at, bool(immutable))
+
+    def _put(self, key: str, endpoint: str, value: Dict[str, Any], soft_ttl: float, hard_ttl: float):
+        now = time.time()
+        immutable = hard_ttl == float("inf")
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, stored_at, fresh_until, expires_at, immutable)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, dumps(value), now, _finite(now + soft_ttl), _finite(now + hard_ttl), int(immutable)),
+            )
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= APIF_STORE_PRUNE_EVERY:
+                self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection):
+        cursor = conn.execute(
+            "DELETE FROM responses WHERE immutable = 0 AND expires_at < ?",
+            (time.time() - CACHE_STALE_IF_ERROR,),
+        )
+        self._counts["pruned"] += cursor.rowcount
+        self._writes_since_prune = 0
+
+    async def get(self, key: str) -> Optional[StoredResponse]:
+        """
+        Kaydı oku (süresi dolmuş olabilir; tazeliğe çağıran karar verir)
+
+        Hata durumunda (bozuk dosya, kilit) None döner; depo cache'in
+        önünde olmadığından hiçbir zaman isteği düşürmez.
+        """
+        if not self.enabled:
+            return None
+        try:
+            stored = await asyncio.to_thread(self._get, key)
+        except Exception as e:
+            self._counts["errors"] += 1
+            logger.warning("API-Football deposu okunamadı (%s): %s", key, e)
+            return None
+        if stored is None:
+            self._counts["misses"] += 1
+        elif stored.is_fresh:
+            self._counts["hits"] += 1
+        else:
+            self._counts["stale_reads"] += 1
+        return stored
+
+    async def put(self, key: str, endpoint: str, value: Dict[str, Any], ttl: tuple):
+        """Yanıtı (soft, hard) TTL'iyle yaz; hard TTL sonsuzsa değişmez işaretlenir"""
+        if not self.enabled:
+            return
+        try:
+            await asyncio.to_thread(self._put, key, endpoint, value, *ttl)
+            self._counts["writes"] += 1
+        except Exception as e:
+            self._counts["errors"] += 1
+            logger.warning("API-Football deposuna yazılamadı (%s): %s", key, e)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _summary(self) -> Dict[str, Any]:
+        with self._lock:
+            conn = self._connect()
+            rows, immutable = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(immutable), 0) FROM responses"
+            ).fetchone()
+            by_endpoint = dict(conn.execute(
+                "SELECT endpoint, COUNT(*) FROM responses GROUP BY endpoint ORDER BY endpoint"
+            ).fetchall())
+        return {
+            "rows": rows,
+            "immutable": immutable,
+            "by_endpoint": by_endpoint,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Depo durumu (dosya, kayıt sayıları, okuma/yazma sayaçları)"""
+        result: Dict[str, Any] = {"enabled": self.enabled, "path": self.path, **self._counts}
+        if self.enabled:
+            try:
+                result.update(self._summary())
+            except Exception as e:
+                result["error"] = str(e)
+        return result
+
+
+response_store = ResponseStore()
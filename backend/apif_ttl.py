@@ -0,0 +1,186 @@
+"""
+API-Football Cache TTL Politikası
+
+Her yanıtın cache süresi endpoint ve parametrelere göre tablodan seçilir:
+canlı maçlar saniyeler, puan durumu dakikalar, takım/lig bilgisi günler
+boyunca tutulur. Bitmiş maçların verileri (fikstür, olaylar, istatistik,
+kadrolar) ve geçmiş sezonların verileri değişmediğinden süresiz cache'lenir.
+Maç durumu önce yanıtın kendisinden (fixture.status.short) okunur; durum
+taşımayan alt kaynaklarda daha önce görülen fikstür yanıtlarına bakılır.
+"""
+
+import os
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+APIF_CACHE_TTL = int(os.getenv("APIF_CACHE_TTL", "900"))
+APIF_CACHE_HARD_TTL = int(os.getenv("APIF_CACHE_HARD_TTL", "3600"))
+
+# Sık değişen veriler için süreler (saniye)
+APIF_LIVE_TTL = int(os.getenv("APIF_LIVE_TTL", "15"))
+APIF_TODAY_TTL = int(os.getenv("APIF_TODAY_TTL", "60"))
+APIF_STANDINGS_TTL = int(os.getenv("APIF_STANDINGS_TTL", "600"))
+APIF_STATIC_TTL = int(os.getenv("APIF_STATIC_TTL", str(3 * 86400)))
+
+# Güncel API-Football sezonu; daha eski sezonların verisi değişmez
+APIF_CURRENT_SEASON = int(os.getenv("APIF_CURRENT_SEASON", "2024"))
+
+PERMANENT = (float("inf"), float("inf"))
+
+# Gövdesinde hata dönen yanıtlar (kota, geçersiz parametre) kısa tutulur
+APIF_ERROR_TTL = (60, 60)
+
+# Sonucu artık değişmeyecek maç durumları
+FINISHED_STATUSES = {"FT", "AET", "PEN", "AWD", "WO"}
+
+
+def _status(item: Dict[str, Any]) -> Optional[str]:
+    """Yanıt kaydındaki maç durumu (fixture.status.short; yoksa None)"""
+    return ((item.get("fixture") or {}).get("status") or {}).get("short")
+
+
+class TTLRule(NamedTuple):
+    endpoint: str
+    params: FrozenSet[str]      # kuralın eşleşmesi için bulunması gereken parametreler
+    soft_ttl: float
+    hard_ttl: float
+    immutable_when_finished: bool = False
+
+
+def _rule(endpoint: str, params: Tuple[str, ...], soft_ttl: float, hard_ttl: float, finished: bool = False) -> TTLRule:
+    return TTLRule(endpoint, frozenset(params), soft_ttl, hard_ttl, finished)
+
+
+# İlk eşleşen kural uygulanır (özelden genele)
+TTL_RULES = [
+    _rule("fixtures", ("live",), APIF_LIVE_TTL, 4 * APIF_LIVE_TTL),
+    _rule("fixtures", ("id",), APIF_TODAY_TTL, 10 * APIF_TODAY_TTL, finished=True),
+    _rule("fixtures", ("ids",), APIF_TODAY_TTL, 10 * APIF_TODAY_TTL, finished=True),
+    _rule("fixtures", ("date",), APIF_TODAY_TTL, 10 * APIF_TODAY_TTL, finished=True),
+    _rule("fixtures", ("next",), 300, 3600),
+    _rule("fixtures", ("last",), 600, 3600),
+    _rule("fixtures", ("league", "season"), APIF_STANDINGS_TTL, 6 * APIF_STANDINGS_TTL),
+    _rule("fixtures/events", ("fixture",), 30, 300, finished=True),
+    _rule("fixtures/statistics", ("fixture",), APIF_TODAY_TTL, 10 * APIF_TODAY_TTL, finished=True),
+    _rule("fixtures/lineups", ("fixture",), 300, 3600, finished=True),
+    _rule("fixtures/headtohead", (), 3600, 86400),
+    _rule("predictions", ("fixture",), 3600, 21600, finished=True),
+    _rule("standings", (), APIF_STANDINGS_TTL, 6 * APIF_STANDINGS_TTL),
+    _rule("teams/statistics", (), 3600, 21600),
+    _rule("players/topscorers", (), 1800, 7200),
+    _rule("players/topassists", (), 1800, 7200),
+    _rule("players", (), 21600, 86400),
+    _rule("teams", (), APIF_STATIC_TTL, 2 * APIF_STATIC_TTL),
+    _rule("leagues", (), APIF_STATIC_TTL, 2 * APIF_STATIC_TTL),
+]
+
+
+class TTLPolicy:
+    """Endpoint/parametre tablosundan TTL seçer, bitmiş maçları hatırlar"""
+
+    def __init__(
+        self,
+        rules=TTL_RULES,
+        default: Tuple[float, float] = (APIF_CACHE_TTL, APIF_CACHE_HARD_TTL),
+        current_season: int = APIF_CURRENT_SEASON
+    ):
+        self.rules = rules
+        self.default = default
+        self.current_season = current_season
+        self.finished_fixtures: Set[int] = set()
+
+    def rule_for(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[TTLRule]:
+        """Endpoint ve parametrelere uyan ilk kural"""
+        keys = set(params or {})
+        for rule in self.rules:
+            if rule.endpoint == endpoint and rule.params <= keys:
+                return rule
+        return None
+
+    def learn(self, endpoint: str, data: Dict[str, Any]):
+        """Fikstür yanıtlarındaki bitmiş maçları kaydet"""
+        if endpoint not in ("fixtures", "fixtures/headtohead"):
+            return
+        for item in data.get("response") or []:
+            fixture_id = (item.get("fixture") or {}).get("id")
+            if fixture_id and _status(item) in FINISHED_STATUSES:
+                self.finished_fixtures.add(fixture_id)
+
+    def needs_fixture_status(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Optional[int]:
+        """
+        Bitmiş maçta süresiz olacak ama maç durumu henüz bilinmeyen alt
+        kaynak isteğinin fikstür ID'si (değilse None)
+        """
+        fixture_id = (params or {}).get("fixture")
+        rule = self.rule_for(endpoint, params)
+        if fixture_id is None or rule is None or not rule.immutable_when_finished:
+            return None
+        fixture_id = int(fixture_id)
+        return None if fixture_id in self.finished_fixtures else fixture_id
+
+    def _is_past_season(self, params: Dict[str, Any]) -> bool:
+        try:
+            return int(params["season"]) < self.current_season
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    def _is_finished(self, endpoint: str, params: Dict[str, Any], data: Dict[str, Any]) -> bool:
+        # Önce yanıtın kendisi: maç durumu taşıyan kayıtların hepsi bitmiş mi
+        statuses = [_status(item) for item in data.get("response") or [] if isinstance(item, dict)]
+        statuses = [status for status in statuses if status]
+        if statuses:
+            return all(status in FINISHED_STATUSES for status in statuses)
+        if endpoint == "fixtures":
+            return False
+
+        # Durum taşımayan alt kaynaklar (olaylar, kadrolar ...) için görülen
+        # fikstür yanıtları (api_football eksikse paylaşılan depodan tamamlar)
+        fixture_id = params.get("fixture")
+        return fixture_id is not None and int(fixture_id) in self.finished_fixtures
+
+    def ttl(self, endpoint: str, params: Optional[Dict[str, Any]], data: Dict[str, Any]) -> Tuple[float, float]:
+        """
+        Yanıtın (soft, hard) TTL'i
+
+        Args:
+            endpoint: API-Football endpoint'i
+            params: İstek parametreleri
+            data: Upstream yanıtı
+
+        Returns:
+            Tablodaki süreler; bitmiş maç ve geçmiş sezon verisi için süresiz
+        """
+        if data.get("errors"):
+            return APIF_ERROR_TTL
+        self.learn(endpoint, data)
+        if self._is_past_season(params or {}):
+            return PERMANENT
+        rule = self.rule_for(endpoint, params)
+        if rule is None:
+            return self.default
+        if rule.immutable_when_finished and self._is_finished(endpoint, params or {}, data):
+            return PERMANENT
+        return rule.soft_ttl, rule.hard_ttl
+
+    def stats(self) -> Dict[str, Any]:
+        """Kural tablosu ve bilinen bitmiş maç sayısı"""
+        return {
+            "finished_fixtures": len(self.finished_fixtures),
+            "current_season": self.current_season,
+            "rules": [
+                {
+                    "endpoint": rule.endpoint,
+                    "params": sorted(rule.params),
+                    "soft_ttl": rule.soft_ttl,
+                    "hard_ttl": rule.hard_ttl,
+                    "permanent_when_finished": rule.immutable_when_finished,
+                }
+                for rule in self.rules
+            ],
+        }
+
+
+ttl_policy = TTLPolicy()
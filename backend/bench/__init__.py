@@ -0,0 +1,20 @@
+"""
+Performans Ölçüm Düzeneği (benchmark)
+
+Backend gerçek upstream'ler (FBref, API-Football, xAI Grok) olmadan yerel
+sahte servislerle çalıştırılıp yük altında ölçülür:
+
+- recorded: FBref tabloları kayıtlı Parquet dosyalarından okunur
+  (`get_fbref_scraper` yerine; dosya biçimi snapshot.py ile aynıdır)
+- fakes: API-Football yanıtlarını kayıtlı SQLite deposundan (apif_store
+  biçimi) ayarlanabilir gecikmeyle tekrar oynatan ve Grok sohbet
+  yanıtı üreten sahte HTTP sunucusu
+- load: rota başına p50/p95/p99 gecikme ve RPS raporlayan yük üreteci
+- results: sonuçların commit bilgisiyle saklanması ve karşılaştırılması
+
+Kullanım (backend dizininden):
+
+    python -m bench record                  # gerçek upstream'lerden kayıt al
+    python -m bench run --duration 30       # ölç, sonucu sakla, son sonuçla karşılaştır
+    python -m bench compare A.json B.json   # iki sonucu karşılaştır
+"""
@@ -0,0 +1,257 @@
+"""
+Ölçüm komut satırı (backend dizininden `python -m bench ...`)
+
+    run      Backend'i kayıtlı FBref tabloları ve sahte API-Football/Grok
+             sunucusuyla başlatıp yük uygular, sonucu saklar ve önceki
+             sonuçla karşılaştırır
+    record   Backend'i gerçek upstream'lerle başlatıp senaryodaki her rotayı
+             bir kez çağırır; FBref tabloları ve API-Football yanıtları kayıt
+             dizinine yazılır (AI rotaları atlanır)
+    compare  İki sonuç dosyasını karşılaştırır
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+import httpx
+
+from bench import results
+from bench.load import format_report, load_scenario, prime, run_load
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCENARIO = os.path.join(BACKEND_DIR, "bench", "scenarios", "default.json")
+DEFAULT_RECORDINGS = os.path.join(BACKEND_DIR, "bench", "recordings")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Service:
+    """uvicorn alt sürecinde çalışan ASGI uygulaması"""
+
+    def __init__(
+        self,
+        app: str,
+        env: Dict[str, str],
+        ready_path: str,
+        log_path: str,
+        workers: int = 1,
+        timeout: float = 60
+    ):
+        self.app = app
+        self.log_path = log_path
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.env = {**os.environ, **env}
+        self.ready_path = ready_path
+        self.workers = workers
+        self.timeout = timeout
+        self._process: Optional[subprocess.Popen] = None
+
+    def _log_tail(self, lines: int = 20) -> str:
+        with open(self.log_path, encoding="utf-8", errors="replace") as f:
+            return "".join(f.readlines()[-lines:])
+
+    def __enter__(self) -> "Service":
+        # Uygulama logları rapora karışmasın; başlatma hatasında gösterilir
+        self._log = open(self.log_path, "w")
+        self._process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", self.app,
+                "--host", "127.0.0.1", "--port", str(self.port),
+                "--workers", str(self.workers), "--log-level", "warning", "--no-access-log",
+            ],
+            cwd=BACKEND_DIR,
+            env=self.env,
+            stdout=self._log,
+            stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                self._log.close()
+                raise RuntimeError(f"{self.app} başlatılamadı (çıkış kodu {self._process.returncode}):\n{self._log_tail()}")
+            try:
+                if httpx.get(self.url + self.ready_path, timeout=2).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"{self.app} {self.timeout} sn içinde hazır olmadı:\n{self._log_tail()}")
+
+    def __exit__(self, *exc):
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        self._log.close()
+
+
+def cmd_run(args) -> int:
+    routes = load_scenario(args.scenario)
+    recordings = os.path.abspath(args.recordings)
+    scenario = os.path.splitext(os.path.basename(args.scenario))[0]
+    baseline = results.latest(scenario=scenario) if args.baseline == "latest" else args.baseline
+    started_at = datetime.now().isoformat(timespec="seconds")
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        fakes_env = {
+            "BENCH_APIF_RECORDINGS": os.path.join(recordings, "apif.sqlite3"),
+            "BENCH_APIF_LATENCY": str(args.apif_latency),
+            "BENCH_GROK_LATENCY": str(args.grok_latency),
+            "BENCH_LATENCY_JITTER": str(args.jitter),
+        }
+        with Service("bench.fakes:app", fakes_env, "/__bench/stats", os.path.join(tmp, "fakes.log")) as fakes:
+            backend_env = {
+                "API_FOOTBALL_KEY": "bench",
+                "API_FOOTBALL_URL": f"{fakes.url}/apif",
+                "GROK_API_KEY": "bench",
+                "GROK_API_URL": f"{fakes.url}/grok/v1/chat/completions",
+                "BENCH_FBREF_DIR": os.path.join(recordings, "fbref"),
+                "BENCH_FBREF_LATENCY": str(args.fbref_latency),
+                "FBREF_EXECUTOR": "thread",
+                "FBREF_SNAPSHOT_ENABLED": "false",
+                "SCHEDULER_ENABLED": "true" if args.scheduler else "false",
+                # Her çalıştırma boş kalıcı depo ve ID tablosuyla başlar
+                "APIF_STORE_PATH": os.path.join(tmp, "apif.sqlite3"),
+                "ID_MAP_PATH": os.path.join(tmp, "id_map.json"),
+                "APIF_RATE_PER_MINUTE": "100000",
+                "APIF_DAILY_LIMIT": "10000000",
+            }
+            with Service(
+                "bench.app:app", backend_env, "/health", os.path.join(tmp, "backend.log"), workers=args.workers
+            ) as backend:
+                primed = asyncio.run(prime(backend.url, routes))
+                summary = asyncio.run(run_load(
+                    backend.url, routes,
+                    concurrency=args.concurrency, duration=args.duration,
+                    warmup=args.warmup, timeout=args.timeout, seed=args.seed,
+                ))
+            upstream = httpx.get(fakes.url + "/__bench/stats", timeout=5).json()
+
+    result = {
+        "started_at": started_at,
+        "git": results.git_revision(),
+        "config": {
+            "scenario": scenario,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "workers": args.workers,
+            "scheduler": args.scheduler,
+            "seed": args.seed,
+            "latency": {"apif": args.apif_latency, "grok": args.grok_latency, "fbref": args.fbref_latency, "jitter": args.jitter},
+        },
+        "primed": primed,
+        "summary": summary,
+        "upstream": upstream,
+    }
+
+    print(format_report(summary))
+    failed = {name: status for name, status in primed.items() if not 200 <= status < 400}
+    if failed:
+        print(f"\nUyarı: ilk çağrıda başarısız rotalar (kayıt eksik olabilir): {failed}")
+    if upstream["apif"]["misses"]:
+        print(f"Uyarı: kaydı olmayan API-Football sorguları: {sorted(upstream['apif']['missing'])}")
+
+    if not args.no_save:
+        print(f"\nSonuç: {results.save(result)}")
+
+    if baseline:
+        report, regressions = results.compare(results.load(baseline), result, args.threshold)
+        print("\n" + report)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+def cmd_record(args) -> int:
+    routes = [route for route in load_scenario(args.scenario) if not route.path.startswith("/ai/")]
+    recordings = os.path.abspath(args.recordings)
+    os.makedirs(recordings, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        env = {
+            "FBREF_SNAPSHOT_ENABLED": "true",
+            "FBREF_SNAPSHOT_DIR": os.path.join(recordings, "fbref"),
+            "APIF_STORE_ENABLED": "true",
+            "APIF_STORE_PATH": os.path.join(recordings, "apif.sqlite3"),
+            "ID_MAP_PATH": os.path.join(tmp, "id_map.json"),
+            "SCHEDULER_ENABLED": "false",
+        }
+        with Service("main:app", env, "/health", os.path.join(tmp, "backend.log")) as backend:
+            primed = asyncio.run(prime(backend.url, routes, timeout=args.timeout))
+            # Parquet yazımları arka planda biter
+            time.sleep(args.settle)
+
+    for name, status in primed.items():
+        print(f"{name:<28}{status}")
+    print(f"Kayıtlar: {recordings}")
+    return 0 if all(200 <= status < 400 for status in primed.values()) else 1
+
+
+def cmd_compare(args) -> int:
+    report, regressions = results.compare(results.load(args.baseline), results.load(args.current), args.threshold)
+    print(report)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Backend performans ölçümü")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="sahte upstream'lerle yük testi")
+    run.add_argument("--scenario", default=DEFAULT_SCENARIO)
+    run.add_argument("--recordings", default=DEFAULT_RECORDINGS)
+    run.add_argument("--duration", type=float, default=30, help="ölçülen süre (sn)")
+    run.add_argument("--warmup", type=float, default=5, help="ölçüm öncesi yük süresi (sn)")
+    run.add_argument("--concurrency", type=int, default=16)
+    run.add_argument("--workers", type=int, default=1, help="uvicorn worker sayısı")
+    run.add_argument("--timeout", type=float, default=30, help="istek zaman aşımı (sn)")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--apif-latency", type=float, default=0.05, help="sahte API-Football gecikmesi (sn)")
+    run.add_argument("--grok-latency", type=float, default=0.5, help="sahte Grok gecikmesi (sn)")
+    run.add_argument("--fbref-latency", type=float, default=0.0, help="kayıtlı FBref okuma gecikmesi (sn)")
+    run.add_argument("--jitter", type=float, default=0.2, help="gecikme sapması (oran)")
+    run.add_argument("--scheduler", action="store_true", help="ön ısıtma zamanlayıcısını da çalıştır")
+    run.add_argument("--baseline", default="latest", help="karşılaştırılacak sonuç dosyası ya da 'latest'")
+    run.add_argument("--threshold", type=float, default=results.BENCH_REGRESSION_THRESHOLD)
+    run.add_argument("--fail-on-regression", action="store_true")
+    run.add_argument("--no-save", action="store_true")
+    run.set_defaults(func=cmd_run)
+
+    record = sub.add_parser("record", help="gerçek upstream'lerden kayıt al")
+    record.add_argument("--scenario", default=DEFAULT_SCENARIO)
+    record.add_argument("--recordings", default=DEFAULT_RECORDINGS)
+    record.add_argument("--timeout", type=float, default=300, help="rota başına zaman aşımı (sn)")
+    record.add_argument("--settle", type=float, default=5, help="kapatmadan önce bekleme (sn)")
+    record.set_defaults(func=cmd_record)
+
+    compare = sub.add_parser("compare", help="iki sonucu karşılaştır")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=results.BENCH_REGRESSION_THRESHOLD)
+    compare.add_argument("--fail-on-regression", action="store_true")
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Ölçüm Giriş Noktası
+
+Kayıtlı FBref tablolarıyla çalışan backend (`uvicorn bench.app:app`).
+API-Football ve Grok adresleri ortam değişkenleriyle sahte sunucuya
+yönlendirilir (bkz. bench.__main__).
+"""
+
+from bench import recorded
+
+recorded.install()
+
+from main import app  # noqa: E402,F401
@@ -0,0 +1,161 @@
+"""
+Sahte API-Football ve Grok Sunucusu
+
+- /apif/{endpoint}: İstek, backend'in kullandığı kanonik parmak iziyle
+  (apif_keys) kayıtlı SQLite deposunda (apif_store biçimi) aranır ve
+  kayıtlı gövde olduğu gibi döner. Tarihe bağlı sorgular (`date=`) kayıtta
+  yoksa aynı sorgunun kayıtlı herhangi bir tarihi kullanılır. Kaydı
+  olmayan sorgu API-Football'un hata biçimiyle (errors dolu) döner.
+- /grok/v1/chat/completions: Sabit bir asistan yanıtı üretir.
+- /__bench/stats: Endpoint başına isabet/kayıp sayıları ve kayıtsız sorgular.
+
+Gecikmeler ortam değişkenleriyle ayarlanır (`uvicorn bench.fakes:app`).
+"""
+
+import asyncio
+import os
+import random
+import sqlite3
+from collections import Counter
+from typing import Dict, Optional
+from urllib.parse import parse_qsl
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from apif_keys import request_fingerprint
+
+load_dotenv()
+
+BENCH_APIF_RECORDINGS = os.getenv("BENCH_APIF_RECORDINGS", "bench/recordings/apif.sqlite3")
+
+# Yanıt gecikmeleri (saniye) ve ± oransal sapma
+BENCH_APIF_LATENCY = float(os.getenv("BENCH_APIF_LATENCY", "0.05"))
+BENCH_GROK_LATENCY = float(os.getenv("BENCH_GROK_LATENCY", "0.5"))
+BENCH_LATENCY_JITTER = float(os.getenv("BENCH_LATENCY_JITTER", "0.2"))
+
+# Kayıtsız sorgulardan saklanan en fazla örnek
+MAX_MISSING_SAMPLES = 50
+
+# Gerçek API-Football'un döndüğü kota başlıkları (limitler ölçümü kısmasın)
+RATE_LIMIT_HEADERS = {
+    "x-ratelimit-limit": "100000",
+    "x-ratelimit-remaining": "100000",
+    "x-ratelimit-requests-limit": "10000000",
+    "x-ratelimit-requests-remaining": "10000000",
+}
+
+# Kayıt bulunamadığında tarih değeri yok sayılarak eşleştirilen parametreler
+VOLATILE_PARAMS = ("date",)
+
+
+def _without_volatile(endpoint: str, params: Dict[str, str]) -> str:
+    return request_fingerprint(endpoint, {key: value for key, value in params.items() if key not in VOLATILE_PARAMS})
+
+
+class Recordings:
+    """Kayıtlı API-Football yanıtları (parmak izi -> ham JSON gövdesi)"""
+
+    def __init__(self, path: str = BENCH_APIF_RECORDINGS):
+        self.path = path
+        self.bodies: Dict[str, bytes] = {}
+        self.loose: Dict[str, bytes] = {}
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.missing: Dict[str, int] = {}
+
+    def load(self):
+        """Tüm kayıtları belleğe al (yanıt süresine disk okuması karışmasın)"""
+        if not os.path.exists(self.path):
+            return
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute("SELECT key, body FROM responses").fetchall()
+        finally:
+            conn.close()
+        for key, body in rows:
+            self.bodies[key] = bytes(body)
+            endpoint, _, query = key.partition("?")
+            params = dict(parse_qsl(query))
+            if any(name in params for name in VOLATILE_PARAMS):
+                self.loose[_without_volatile(endpoint, params)] = bytes(body)
+
+    def find(self, endpoint: str, params: Dict[str, str]) -> Optional[bytes]:
+        key = request_fingerprint(endpoint, params)
+        body = self.bodies.get(key)
+        if body is None and any(name in params for name in VOLATILE_PARAMS):
+            body = self.loose.get(_without_volatile(endpoint, params))
+        if body is None:
+            self.misses[endpoint] += 1
+            if key in self.missing or len(self.missing) < MAX_MISSING_SAMPLES:
+                self.missing[key] = self.missing.get(key, 0) + 1
+        else:
+            self.hits[endpoint] += 1
+        return body
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "recorded": len(self.bodies),
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "missing": self.missing,
+        }
+
+
+async def _delay(base: float):
+    if base > 0:
+        await asyncio.sleep(base * random.uniform(1 - BENCH_LATENCY_JITTER, 1 + BENCH_LATENCY_JITTER))
+
+
+recordings = Recordings()
+recordings.load()
+grok_calls = Counter()
+
+app = FastAPI(title="Bench upstream'leri")
+
+
+@app.get("/apif/{endpoint:path}")
+async def apif(endpoint: str, request: Request):
+    """Kayıtlı API-Football yanıtını tekrar oynat"""
+    params = dict(request.query_params)
+    body = recordings.find(endpoint, params)
+    await _delay(BENCH_APIF_LATENCY)
+    if body is None:
+        return JSONResponse(
+            {"get": endpoint, "parameters": params, "errors": {"bench": "kayıtlı yanıt yok"}, "results": 0, "response": []},
+            headers=RATE_LIMIT_HEADERS,
+        )
+    return Response(body, media_type="application/json", headers=RATE_LIMIT_HEADERS)
+
+
+@app.post("/grok/v1/chat/completions")
+async def grok(request: Request):
+    """OpenAI uyumlu sohbet yanıtı"""
+    payload = await request.json()
+    grok_calls["requests"] += 1
+    await _delay(BENCH_GROK_LATENCY)
+    messages = payload.get("messages") or [{}]
+    prompt = str(messages[-1].get("content", ""))
+    return {
+        "id": f"bench-{grok_calls['requests']}",
+        "object": "chat.completion",
+        "model": payload.get("model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": f"Bench yanıtı ({len(prompt)} karakterlik soru)"},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 8, "total_tokens": len(prompt) // 4 + 8},
+    }
+
+
+@app.get("/__bench/stats")
+async def stats():
+    """Tekrar oynatma sayaçları"""
+    return {
+        "apif": recordings.stats(),
+        "grok": dict(grok_calls),
+        "latency": {"apif": BENCH_APIF_LATENCY, "grok": BENCH_GROK_LATENCY, "jitter": BENCH_LATENCY_JITTER},
+    }
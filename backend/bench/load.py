@@ -0,0 +1,156 @@
+"""
+Yük Üreteci
+
+Sabit sayıda eşzamanlı istemci (kapalı döngü) senaryodaki rotaları
+ağırlıklarına göre seçip süre boyunca istek atar. Isınma süresindeki
+istekler ölçüme katılmaz. Sonuç rota başına istek/hata sayısı, RPS ve
+gecikme dağılımıdır (ms).
+"""
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import httpx
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class Route(NamedTuple):
+    name: str
+    path: str
+    method: str = "GET"
+    json: Optional[Dict[str, Any]] = None
+    weight: float = 1.0
+
+
+def load_scenario(path: str) -> List[Route]:
+    """Senaryo dosyasını oku ({"routes": [{"name", "path", "method", "json", "weight"}]})"""
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    return [Route(**route) for route in spec["routes"]]
+
+
+class Sample(NamedTuple):
+    route: str
+    latency: float          # saniye
+    status: int             # 0: bağlantı/zaman aşımı hatası
+
+
+def _ok(status: int) -> bool:
+    return 200 <= status < 400
+
+
+async def _request(client: httpx.AsyncClient, route: Route) -> Sample:
+    started = time.perf_counter()
+    try:
+        response = await client.request(route.method, route.path, json=route.json)
+        status = response.status_code
+    except httpx.HTTPError:
+        status = 0
+    return Sample(route.name, time.perf_counter() - started, status)
+
+
+async def prime(base_url: str, routes: List[Route], timeout: float = 120) -> Dict[str, int]:
+    """Her rotayı bir kez sırayla çağır (ilk yükleme ölçüme karışmasın); rota -> durum kodu"""
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        return {route.name: (await _request(client, route)).status for route in routes}
+
+
+async def run_load(
+    base_url: str,
+    routes: List[Route],
+    concurrency: int = 16,
+    duration: float = 30,
+    warmup: float = 5,
+    timeout: float = 30,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Rotalara süre boyunca yük uygula
+
+    Args:
+        base_url: Backend adresi
+        routes: Senaryo rotaları
+        concurrency: Eşzamanlı istemci sayısı
+        duration: Ölçülen süre (saniye)
+        warmup: Ölçüm öncesi yük süresi (saniye)
+        seed: Rota seçimi için tohum (çalıştırmalar arası aynı dağılım)
+
+    Returns:
+        summarize() çıktısı
+    """
+    weights = [route.weight for route in routes]
+    samples: List[Sample] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        measure_from = time.perf_counter() + warmup
+        stop_at = measure_from + duration
+
+        async def worker(index: int):
+            rng = random.Random(seed * 1000 + index)
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                sample = await _request(client, rng.choices(routes, weights)[0])
+                if now >= measure_from:
+                    samples.append(sample)
+
+        await asyncio.gather(*[worker(i) for i in range(concurrency)])
+        # Son istekler süre dolduktan sonra bitebilir; RPS gerçek süreye bölünür
+        measured = time.perf_counter() - measure_from
+
+    return summarize(samples, measured)
+
+
+def _distribution(latencies: List[float]) -> Dict[str, float]:
+    values = np.asarray(latencies) * 1000
+    result = {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+    result["mean"] = round(float(values.mean()), 2)
+    result["max"] = round(float(values.max()), 2)
+    return result
+
+
+def summarize(samples: List[Sample], duration: float) -> Dict[str, Any]:
+    """Örnekleri rota başına ve toplamda özetle (gecikmeler ms)"""
+    by_route: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_route.setdefault(sample.route, []).append(sample)
+
+    def describe(group: List[Sample]) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for sample in group:
+            statuses[str(sample.status)] = statuses.get(str(sample.status), 0) + 1
+        return {
+            "requests": len(group),
+            "errors": sum(1 for sample in group if not _ok(sample.status)),
+            "rps": round(len(group) / duration, 2) if duration > 0 else 0.0,
+            "latency_ms": _distribution([sample.latency for sample in group]),
+            "status": statuses,
+        }
+
+    return {
+        "duration": round(duration, 2),
+        "routes": {name: describe(group) for name, group in sorted(by_route.items())},
+        "total": describe(samples) if samples else {"requests": 0, "errors": 0, "rps": 0.0},
+    }
+
+
+def format_report(summary: Dict[str, Any]) -> str:
+    """Özet tablosu"""
+    header = f"{'rota':<28}{'istek':>8}{'hata':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    lines = [header, "-" * len(header)]
+    rows = list(summary["routes"].items()) + [("TOPLAM", summary["total"])]
+    for name, stats in rows:
+        latency = stats.get("latency_ms") or {}
+        lines.append(
+            f"{name[:27]:<28}{stats['requests']:>8}{stats['errors']:>7}{stats['rps']:>9.1f}"
+            + "".join(f"{latency.get(key, float('nan')):>9.1f}" for key in ("p50", "p95", "p99", "max"))
+        )
+    lines.append(f"süre: {summary['duration']} sn (gecikmeler ms)")
+    return "\n".join(lines)
@@ -0,0 +1,67 @@
+"""
+Kayıtlı FBref Tabloları
+
+soccerdata scraper'ı yerine kayıtlı Parquet dosyalarından okuyan
+sahte FBref. Dosyalar snapshot.SnapshotStore biçimindedir; bu yüzden
+üretimdeki `data/fbref` dizini de doğrudan kayıt olarak kullanılabilir.
+"""
+
+import os
+import time
+from typing import List, Optional
+
+import pandas as pd
+from dotenv import load_dotenv
+
+import fbref_pool
+from fbref_store import TABLES
+from snapshot import SnapshotStore
+
+load_dotenv()
+
+BENCH_FBREF_DIR = os.getenv("BENCH_FBREF_DIR", "bench/recordings/fbref")
+
+# Her okumada eklenen yapay scrape süresi (saniye)
+BENCH_FBREF_LATENCY = float(os.getenv("BENCH_FBREF_LATENCY", "0"))
+
+# soccerdata metodu -> tablo adı
+_METHOD_TABLES = {method: table for table, method in TABLES.items()}
+
+
+class RecordedFBref:
+    """sd.FBref ile aynı read_* arayüzünü kayıtlı tablolardan sunar"""
+
+    def __init__(self, leagues: List[str], seasons: List[str], store: SnapshotStore, latency: float = 0.0):
+        self.leagues = leagues
+        self.seasons = seasons
+        self.store = store
+        self.latency = latency
+
+    def _read(self, table: str, stat_type: Optional[str] = None) -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        frames = []
+        for league in self.leagues:
+            for season in self.seasons:
+                loaded = self.store.load((league, season, table, stat_type))
+                if loaded is None:
+                    raise FileNotFoundError(f"Kayıt yok: {self.store.path((league, season, table, stat_type))}")
+                frames.append(loaded[0])
+        return frames[0] if len(frames) == 1 else pd.concat(frames)
+
+    def __getattr__(self, method: str):
+        table = _METHOD_TABLES.get(method)
+        if table is None:
+            raise AttributeError(method)
+        return lambda stat_type=None: self._read(table, stat_type)
+
+
+def install(directory: str = BENCH_FBREF_DIR, latency: float = BENCH_FBREF_LATENCY):
+    """
+    fbref_pool'un scraper fabrikasını kayıtlı tablolarla değiştir
+
+    Havuz thread modunda çalışmalıdır (process modunda alt süreçler
+    değişikliği görmez).
+    """
+    store = SnapshotStore(directory)
+    fbref_pool.get_fbref_scraper = lambda leagues, seasons: RecordedFBref(leagues, seasons, store, latency)
@@ -0,0 +1,119 @@
+"""
+Ölçüm Sonuçları
+
+Her çalıştırma commit bilgisi ve ayarlarıyla birlikte `bench/results`
+altına JSON olarak yazılır (git'e eklenmez; commit değiştirilse de
+dizinde kalır). İki sonuç rota başına karşılaştırılır; p95 gecikmesi
+eşikten fazla kötüleşen veya hata veren rotalar gerileme sayılır.
+"""
+
+import json
+import os
+import subprocess
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+BENCH_RESULTS_DIR = os.getenv("BENCH_RESULTS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "results"))
+
+# Karşılaştırmada gerileme sayılan p95 artışı (oran)
+BENCH_REGRESSION_THRESHOLD = float(os.getenv("BENCH_REGRESSION_THRESHOLD", "0.10"))
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def git_revision() -> Dict[str, Any]:
+    """Çalışma ağacının commit'i ve commit dışı değişiklik olup olmadığı"""
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "subject": _git("log", "-1", "--format=%s"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+    }
+
+
+def save(result: Dict[str, Any], directory: str = BENCH_RESULTS_DIR) -> str:
+    """Sonucu zaman damgası ve commit'le adlandırılmış dosyaya yaz"""
+    os.makedirs(directory, exist_ok=True)
+    revision = result.get("git") or {}
+    name = f"{datetime.now():%Y%m%d-%H%M%S}-{revision.get('commit') or 'nogit'}{'-dirty' if revision.get('dirty') else ''}.json"
+    path = os.path.join(directory, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def history(directory: str = BENCH_RESULTS_DIR) -> List[str]:
+    """Kayıtlı sonuç dosyaları (eskiden yeniye)"""
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(".json")]
+
+
+def latest(directory: str = BENCH_RESULTS_DIR, scenario: Optional[str] = None) -> Optional[str]:
+    """Aynı senaryoyla alınmış en son sonuç"""
+    for path in reversed(history(directory)):
+        if scenario is None or load(path).get("config", {}).get("scenario") == scenario:
+            return path
+    return None
+
+
+def _change(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    if not old or new is None:
+        return None
+    return (new - old) / old
+
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = BENCH_REGRESSION_THRESHOLD
+) -> Tuple[str, List[str]]:
+    """
+    İki sonucu karşılaştır
+
+    Returns:
+        (rapor metni, gerileyen rotalar)
+    """
+    def label(result: Dict[str, Any]) -> str:
+        revision = result.get("git") or {}
+        return f"{revision.get('commit') or '?'}{'+' if revision.get('dirty') else ''} ({result.get('started_at', '?')})"
+
+    header = f"{'rota':<28}{'p50':>16}{'p95':>16}{'p99':>16}{'rps':>16}"
+    lines = [f"temel: {label(baseline)}", f"yeni:  {label(current)}", header, "-" * len(header)]
+    regressions = []
+
+    base_routes = {**baseline["summary"]["routes"], "TOPLAM": baseline["summary"]["total"]}
+    new_routes = {**current["summary"]["routes"], "TOPLAM": current["summary"]["total"]}
+    for name in [*sorted(set(base_routes) & set(new_routes) - {"TOPLAM"}), "TOPLAM"]:
+        old, new = base_routes[name], new_routes[name]
+        old_latency, new_latency = old.get("latency_ms") or {}, new.get("latency_ms") or {}
+        cells = []
+        for key in ("p50", "p95", "p99"):
+            change = _change(old_latency.get(key), new_latency.get(key))
+            cells.append(f"{new_latency.get(key, float('nan')):>8.1f}" + (f" {change:+6.0%}" if change is not None else " " * 7))
+        rps_change = _change(old.get("rps"), new.get("rps"))
+        cells.append(f"{new.get('rps', 0.0):>8.1f}" + (f" {rps_change:+6.0%}" if rps_change is not None else " " * 7))
+
+        p95_change = _change(old_latency.get("p95"), new_latency.get("p95"))
+        regressed = (p95_change is not None and p95_change > threshold) or new.get("errors", 0) > old.get("errors", 0)
+        if regressed and name != "TOPLAM":
+            regressions.append(name)
+        lines.append(f"{('! ' if regressed else '  ') + name[:25]:<28}" + "".join(f"{cell:>16}" for cell in cells))
+
+    only_base = sorted(set(base_routes) - set(new_routes))
+    only_new = sorted(set(new_routes) - set(base_routes))
+    if only_base or only_new:
+        lines.append(f"yalnızca temelde: {', '.join(only_base) or '-'}; yalnızca yenide: {', '.join(only_new) or '-'}")
+    lines.append(f"gerileme eşiği: p95 +{threshold:.0%} veya hata artışı")
+    return "\n".join(lines), regressions
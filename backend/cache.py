@@ -0,0 +1,572 @@
+"""
+Stale-While-Revalidate Cache
+
+Her kaydın bir yumuşak (soft) ve bir sert (hard) TTL'i vardır:
+- soft TTL dolmadan: kayıt doğrudan döner (hit)
+- soft ile hard TTL arası: eski kayıt hemen döner, arka planda tek bir
+  yenileme başlatılır (stale)
+- hard TTL sonrası: çağıran yeni veriyi bekler (miss)
+
+Her kayıt bir veri sürümü (içerik özeti) taşır; yenilenen kayıt aynı
+içeriği getirirse son değişiklik zamanı korunur.
+
+Cache'ler isimli alanlar (namespace) olarak CacheRegistry'den alınır.
+Her alanın kendi TTL'leri ve bayt bütçesi vardır; kayıtlar kodlanmış
+boyutlarıyla sayılır ve bütçe aşılınca en eski kullanılanlar atılır.
+Toplam bellek bütçesi aşılırsa payını en çok aşan alandan atılır.
+
+Yükleme hatası kısa süre (negatif TTL) cache'lenir; bu sürede aynı anahtar
+için upstream yeniden denenmez. Hata durumunda süresi dolmuş olsa da son
+sağlam kayıt (stale-if-error penceresi içinde) bayat olarak döner.
+
+Yanıtlara X-Cache, Age ve X-Data-Updated-At başlıkları eklenir. GET
+yanıtları kullanılan kayıtların sürümlerinden bir ETag ve Last-Modified
+alır; If-None-Match eşleşirse 304 döner. Cache-Control endpoint ailesine
+göre yol önekinden belirlenir.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from dotenv import load_dotenv
+
+from serialization import EncodedBody, content_version, dumps
+from singleflight import SingleFlight
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Tüm cache alanlarının toplam bellek bütçesi (bayt)
+CACHE_MEMORY_BUDGET = int(os.getenv("CACHE_MEMORY_BUDGET", str(256 * 1024 * 1024)))
+
+# Hatalı yüklemenin tekrar denenmeden önce cache'lendiği süre (saniye)
+CACHE_NEGATIVE_TTL = float(os.getenv("CACHE_NEGATIVE_TTL", "15"))
+
+# Hard TTL'den sonra kaydın hata durumunda hâlâ dönebileceği süre (saniye)
+CACHE_STALE_IF_ERROR = float(os.getenv("CACHE_STALE_IF_ERROR", "86400"))
+
+# İstek boyunca okunan cache kayıtlarının durumu (middleware doldurur)
+_cache_meta: ContextVar[Optional[Dict[str, Any]]] = ContextVar("cache_meta", default=None)
+
+CACHE_HEADERS = ["X-Cache", "Age", "X-Data-Updated-At", "ETag"]
+
+
+class CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+    version: Optional[str]      # içerik özeti (hesaplanamazsa None)
+    modified_at: float          # içeriğin son değiştiği zaman
+    size: int                   # kodlanmış boyut (bayt)
+    soft_ttl: float
+    hard_ttl: float
+
+
+def value_info(value: Any) -> Tuple[Optional[str], int]:
+    """Cache değerinin içerik özeti ve kodlanmış boyutu"""
+    if isinstance(value, EncodedBody):
+        return value.version, len(value.body)
+    try:
+        body = value if isinstance(value, bytes) else dumps(value)
+    except Exception:
+        return None, 0
+    return content_version(body), len(body)
+
+
+def _merge_state(meta: Dict[str, Any], state: str, stored_at: float):
+    is_stale = state == "stale"
+    was_stale = "state" in meta and meta["state"] == "stale"
+    if (
+        "state" not in meta
+        or (is_stale and not was_stale)
+        or (is_stale == was_stale and stored_at < meta["stored_at"])
+    ):
+        meta["state"] = state
+        meta["stored_at"] = stored_at
+
+
+def record_cache_state(
+    state: str,
+    stored_at: float,
+    version: Optional[str] = None,
+    modified_at: Optional[float] = None
+):
+    """İstekte kullanılan cache kaydını bildir (en eski/bayat olan başlığa yansır)"""
+    meta = _cache_meta.get()
+    if meta is None:
+        return
+    _merge_state(meta, state, stored_at)
+
+    # Sürümü bilinmeyen bir kayıt varsa ETag üretilmez
+    versions = meta.setdefault("versions", [])
+    versions.append(version)
+    modified_at = stored_at if modified_at is None else modified_at
+    meta["modified_at"] = max(meta.get("modified_at", 0), modified_at)
+
+
+async def track_cache_state(awaitable: Awaitable[Any]) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Awaitable'ı kendi cache durumu kaydıyla çalıştır
+
+    Birden çok parçadan oluşan yanıtlarda her parçanın cache durumunu
+    ayrı raporlamak için. Parçanın durumu isteğin geneline de yansır.
+
+    Returns:
+        (sonuç, {"cache": hit/stale/miss, "age": saniye}); cache'e hiç
+        dokunulmadıysa durum boş sözlüktür
+    """
+    parent = _cache_meta.get()
+    local: Dict[str, Any] = {}
+    token = _cache_meta.set(local)
+    try:
+        result = await awaitable
+    finally:
+        _cache_meta.reset(token)
+
+    if parent is not None:
+        if "state" in local:
+            _merge_state(parent, local["state"], local["stored_at"])
+            parent["modified_at"] = max(parent.get("modified_at", 0), local["modified_at"])
+        parent.setdefault("versions", []).extend(local.get("versions", []))
+
+    if "state" not in local:
+        return result, {}
+    return result, {"cache": local["state"], "age": max(0, int(time.time() - local["stored_at"]))}
+
+
+def record_version(version: str):
+    """Yanıtın dayandığı cache dışı bir veri sürümünü ETag'e ekle"""
+    meta = _cache_meta.get()
+    if meta is not None:
+        meta.setdefault("versions", []).append(version)
+
+
+class SWRCache:
+    """Soft/hard TTL'li, arka planda yenilenen, boyut sınırlı LRU cache"""
+
+    def __init__(
+        self,
+        maxsize: Optional[int],
+        soft_ttl: float,
+        hard_ttl: float,
+        max_bytes: Optional[int] = None,
+        name: str = "default",
+        info: Callable[[Any], Tuple[Optional[str], int]] = value_info,
+        negative_ttl: float = CACHE_NEGATIVE_TTL,
+        stale_if_error: float = CACHE_STALE_IF_ERROR
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = max(hard_ttl, soft_ttl)
+        self.info = info
+        self.negative_ttl = negative_ttl
+        self.stale_if_error = stale_if_error
+        self.registry: Optional["CacheRegistry"] = None
+        self._data: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._inflight = SingleFlight()
+        self._revalidating: Dict[Hashable, asyncio.Task] = {}
+        self._failures: "OrderedDict[Hashable, Tuple[float, Exception]]" = OrderedDict()
+        self._counts = {
+            "hits": 0, "stale": 0, "misses": 0, "evictions": 0, "expirations": 0, "rejected": 0,
+            "failures": 0, "negative_hits": 0, "fallbacks": 0,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._entry(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def _remove(self, key: Hashable, reason: str):
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+        self._counts[reason] += 1
+
+    def _entry(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        age = time.time() - entry.stored_at
+        if age >= entry.hard_ttl:
+            # Hata durumunda dönebilmesi için stale-if-error penceresinde tutulur
+            if age >= entry.hard_ttl + self.stale_if_error:
+                self._remove(key, "expirations")
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def fallback(self, key: Hashable) -> Optional[CacheEntry]:
+        """Yükleme başarısız olduğunda dönebilecek son sağlam kayıt"""
+        entry = self._data.get(key)
+        if entry is None or time.time() - entry.stored_at >= entry.hard_ttl + self.stale_if_error:
+            return None
+        return entry
+
+    def _recent_failure(self, key: Hashable) -> Optional[Exception]:
+        failure = self._failures.get(key)
+        if failure is None:
+            return None
+        if time.time() - failure[0] >= self.negative_ttl:
+            del self._failures[key]
+            return None
+        return failure[1]
+
+    def _record_failure(self, key: Hashable, error: Exception):
+        self._counts["failures"] += 1
+        self._failures[key] = (time.time(), error)
+        self._failures.move_to_end(key)
+        while len(self._failures) > (self.maxsize or 1024):
+            self._failures.popitem(last=False)
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        """Kaydı süresine ve LRU sırasına dokunmadan getir (süresi dolmuş olabilir)"""
+        return self._data.get(key)
+
+    def evict_oldest(self) -> bool:
+        """En eski kullanılan kaydı at (boşsa False)"""
+        if not self._data:
+            return False
+        self._remove(next(iter(self._data)), "evictions")
+        return True
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[Tuple[float, float]] = None):
+        """
+        Kaydı yaz (maxsize veya bayt bütçesi aşılınca en eski kayıtlar atılır)
+
+        Args:
+            key: Cache anahtarı
+            value: Değer
+            ttl: Bu kayda özel (soft, hard) TTL; None ise alanın TTL'leri
+        """
+        soft_ttl, hard_ttl = ttl if ttl is not None else (self.soft_ttl, self.hard_ttl)
+        now = time.time()
+        version, size = self.info(value)
+        previous = self._data.get(key)
+        if previous is not None and version is not None and previous.version == version:
+            modified_at = previous.modified_at
+        else:
+            modified_at = now
+        if previous is not None:
+            self._bytes -= previous.size
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Bütçeden büyük kayıt tutulmaz (diğer kayıtları boşuna atmamak için)
+            self._data.pop(key, None)
+            self._counts["rejected"] += 1
+            return
+
+        self._data[key] = CacheEntry(value, now, version, modified_at, size, soft_ttl, max(hard_ttl, soft_ttl))
+        self._bytes += size
+        self._data.move_to_end(key)
+        while len(self._data) > 1 and (
+            (self.maxsize is not None and len(self._data) > self.maxsize)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self.evict_oldest()
+
+        if self.registry is not None:
+            self.registry.enforce_budget()
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        refresh: bool = False,
+        ttl: Optional[Callable[[Any], Tuple[float, float]]] = None,
+        on_fallback: Optional[Callable[[Exception], None]] = None
+    ) -> Any:
+        """
+        Kaydı getir; yoksa veya bayatsa fetch ile doldur
+
+        Args:
+            key: Cache anahtarı
+            fetch: Veriyi çeken coroutine fonksiyonu (hata fırlatırsa değer
+                cache'lenmez, hata negatif TTL boyunca hatırlanır)
+            refresh: True ise kayda bakmadan yeniden çek
+            ttl: Çekilen değere göre (soft, hard) TTL döndüren fonksiyon
+                (None ise alanın TTL'leri)
+            on_fallback: Hata yüzünden son sağlam kayıt döndüğünde hatayla
+                çağrılır
+
+        Returns:
+            Cache'teki veya yeni çekilen değer; yükleme başarısızsa son
+            sağlam kayıt, o da yoksa hata fırlatılır
+        """
+        entry = None if refresh else self._entry(key)
+        if entry is not None:
+            if time.time() - entry.stored_at < entry.soft_ttl:
+                self._counts["hits"] += 1
+                record_cache_state("hit", entry.stored_at, entry.version, entry.modified_at)
+            else:
+                self._counts["stale"] += 1
+                record_cache_state("stale", entry.stored_at, entry.version, entry.modified_at)
+                self._revalidate(key, fetch, ttl)
+            return entry.value
+
+        self._counts["misses"] += 1
+        try:
+            failure = self._recent_failure(key)
+            if failure is not None:
+                self._counts["negative_hits"] += 1
+                raise failure.with_traceback(None)
+            value = await self._inflight.do(key, lambda: self._load(key, fetch, ttl))
+        except Exception as e:
+            entry = self.fallback(key)
+            if entry is None:
+                raise
+            self._counts["fallbacks"] += 1
+            record_cache_state("stale", entry.stored_at, entry.version, entry.modified_at)
+            if on_fallback is not None:
+                on_fallback(e)
+            return entry.value
+
+        entry = self._data.get(key)
+        if entry is not None:
+            record_cache_state("miss", entry.stored_at, entry.version, entry.modified_at)
+        else:
+            record_cache_state("miss", time.time())
+        return value
+
+    async def _load(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[Callable[[Any], Tuple[float, float]]] = None
+    ) -> Any:
+        try:
+            value = await fetch()
+        except Exception as e:
+            # Upstream hatası olmayan (ör. kota ertelemesi) hatalar hatırlanmaz
+            if getattr(e, "negative_cacheable", True):
+                self._record_failure(key, e)
+            raise
+        self._failures.pop(key, None)
+        self.set(key, value, ttl(value) if ttl is not None else None)
+        return value
+
+    def _revalidate(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[Callable[[Any], Tuple[float, float]]] = None
+    ):
+        if key in self._revalidating or self._recent_failure(key) is not None:
+            return
+
+        task = asyncio.ensure_future(self._inflight.do(key, lambda: self._load(key, fetch, ttl)))
+        self._revalidating[key] = task
+
+        def done(t: asyncio.Task):
+            self._revalidating.pop(key, None)
+            if not t.cancelled() and t.exception() is not None:
+                logger.warning("Arka plan yenileme başarısız (%s): %s", key, t.exception())
+
+        task.add_done_callback(done)
+
+    def stats(self, entries: bool = False) -> Dict[str, Any]:
+        """Alan durumu: kayıt/bayt sayıları, sayaçlar, yaşlar"""
+        now = time.time()
+        ages = [now - entry.stored_at for entry in self._data.values()]
+        result = {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "maxsize": self.maxsize,
+            "soft_ttl": self.soft_ttl,
+            "hard_ttl": self.hard_ttl,
+            "negative_ttl": self.negative_ttl,
+            "stale_if_error": self.stale_if_error,
+            "failing_keys": sum(1 for failed_at, _ in self._failures.values() if time.time() - failed_at < self.negative_ttl),
+            **self._counts,
+            "oldest_age_seconds": round(max(ages), 1) if ages else None,
+            "newest_age_seconds": round(min(ages), 1) if ages else None,
+        }
+        if entries:
+            result["items"] = [
+                {
+                    "key": str(key),
+                    "bytes": entry.size,
+                    "age_seconds": round(now - entry.stored_at, 1),
+                    "stale": now - entry.stored_at >= entry.soft_ttl,
+                    "ttl": [entry.soft_ttl, entry.hard_ttl] if entry.hard_ttl != float("inf") else "permanent",
+                    "version": entry.version,
+                }
+                for key, entry in reversed(self._data.items())
+            ]
+        return result
+
+
+class CacheRegistry:
+    """İsimli cache alanları ve ortak bellek bütçesi"""
+
+    def __init__(self, budget: int = CACHE_MEMORY_BUDGET):
+        self.budget = budget
+        self._namespaces: Dict[str, SWRCache] = {}
+
+    def namespace(
+        self,
+        name: str,
+        soft_ttl: float,
+        hard_ttl: float,
+        share: float = 0.1,
+        maxsize: Optional[int] = None
+    ) -> SWRCache:
+        """
+        Cache alanı oluştur (aynı isimle tekrar çağrılırsa mevcut alan döner)
+
+        Args:
+            name: Alan adı
+            soft_ttl, hard_ttl: Alanın TTL'leri (saniye)
+            share: Toplam bütçeden alana ayrılan pay (0-1)
+            maxsize: En fazla kayıt sayısı (None ise yalnızca bayt sınırı)
+        """
+        if name not in self._namespaces:
+            cache = SWRCache(maxsize, soft_ttl, hard_ttl, max_bytes=int(self.budget * share), name=name)
+            cache.registry = self
+            self._namespaces[name] = cache
+        return self._namespaces[name]
+
+    @property
+    def bytes(self) -> int:
+        return sum(cache.bytes for cache in self._namespaces.values())
+
+    def enforce_budget(self):
+        """Toplam bütçe aşıldıysa payını en çok aşan alandan kayıt at"""
+        while self.bytes > self.budget:
+            caches = [cache for cache in self._namespaces.values() if len(cache)]
+            if not caches:
+                return
+            worst = max(caches, key=lambda cache: cache.bytes / max(cache.max_bytes or self.budget, 1))
+            worst.evict_oldest()
+
+    def stats(self, entries: bool = False) -> Dict[str, Any]:
+        """Tüm alanların durumu"""
+        return {
+            "budget_bytes": self.budget,
+            "bytes": self.bytes,
+            "namespaces": {name: cache.stats(entries) for name, cache in self._namespaces.items()},
+        }
+
+
+cache_registry = CacheRegistry()
+
+
+def _etag(scope, versions: List[Optional[str]]) -> Optional[str]:
+    """İstekte okunan kayıtların sürümlerinden zayıf ETag (zaman damgaları farklı olabilir)"""
+    if not versions or any(v is None for v in versions):
+        return None
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(scope["path"].encode())
+    digest.update(b"?" + scope.get("query_string", b""))
+    for version in versions:
+        digest.update(b"|" + version.encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _not_modified(request_headers: Headers, etag: Optional[str], modified_at: Optional[float]) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and modified_at is not None:
+        try:
+            return int(modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class CacheStatusMiddleware:
+    """
+    Yanıtlara cache durumunu (X-Cache, Age, X-Data-Updated-At) ve HTTP
+    cache başlıklarını (ETag, Last-Modified, Cache-Control) ekleyen ASGI
+    middleware
+
+    Args:
+        app: ASGI uygulaması
+        cache_control: (yol öneki, Cache-Control değeri) listesi; ilk
+            eşleşen önek başarılı GET yanıtlarına uygulanır
+    """
+
+    def __init__(self, app, cache_control: Sequence[Tuple[str, str]] = ()):
+        self.app = app
+        self.cache_control = list(cache_control)
+
+    def _cache_control_for(self, path: str) -> Optional[str]:
+        for prefix, value in self.cache_control:
+            if path.startswith(prefix):
+                return value
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        meta: Dict[str, Any] = {}
+        token = _cache_meta.set(meta)
+        cacheable = scope["method"] in ("GET", "HEAD")
+        not_modified = False
+
+        async def send_with_headers(message):
+            nonlocal not_modified
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if "state" in meta:
+                    headers["X-Cache"] = meta["state"]
+                    headers["Age"] = str(max(0, int(time.time() - meta["stored_at"])))
+                    headers["X-Data-Updated-At"] = datetime.fromtimestamp(meta["stored_at"]).isoformat()
+
+                if cacheable and message["status"] == 200:
+                    cache_control = self._cache_control_for(scope["path"])
+                    if cache_control and "cache-control" not in headers:
+                        headers["Cache-Control"] = cache_control
+
+                    etag = _etag(scope, meta.get("versions", []))
+                    modified_at = meta.get("modified_at")
+                    if etag:
+                        headers["ETag"] = etag
+                    if modified_at:
+                        headers["Last-Modified"] = formatdate(modified_at, usegmt=True)
+
+                    if (etag or modified_at) and _not_modified(Headers(scope=scope), etag, modified_at):
+                        not_modified = True
+                        message["status"] = 304
+                        for name in ("content-length", "content-type"):
+                            if name in headers:
+                                del headers[name]
+
+            elif message["type"] == "http.response.body" and not_modified:
+                # 304 yanıtında gövde gönderilmez
+                if message.get("more_body", False):
+                    return
+                message = {"type": "http.response.body", "body": b"", "more_body": False}
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _cache_meta.reset(token)
@@ -0,0 +1,169 @@
+"""
+FBref İş Havuzu
+
+soccerdata çağrıları senkron ve saniyeler sürebilir. Event loop'u
+bloklamamaları için sınırlı bir thread/process havuzunda çalıştırılır.
+Başarısız okumalar beklemeyle yeniden denenir; FBref art arda hata
+verirse devre kesici açılır ve okumalar scrape beklenmeden reddedilir.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import soccerdata as sd
+from dotenv import load_dotenv
+
+from resilience import breakers, retry_async
+
+load_dotenv()
+
+# Havuz ayarları
+FBREF_EXECUTOR = os.getenv("FBREF_EXECUTOR", "thread")          # thread | process
+FBREF_WORKERS = int(os.getenv("FBREF_WORKERS", "4"))
+FBREF_QUEUE_SIZE = int(os.getenv("FBREF_QUEUE_SIZE", "32"))     # çalışan dışında bekleyebilecek iş sayısı
+FBREF_LEAGUE_CONCURRENCY = int(os.getenv("FBREF_LEAGUE_CONCURRENCY", "1"))
+
+# Başarısız okumanın yeniden deneme sayısı (scrape uzun sürdüğünden düşük)
+FBREF_RETRIES = int(os.getenv("FBREF_RETRIES", "1"))
+
+# Yeniden denenen ve devre kesiciye hata sayılan FBref hataları. soccerdata
+# indirme denemeleri bitince ConnectionError fırlatır; requests hataları da
+# OSError'dur. Geçersiz sezon/lig (ValueError) veya olmayan okuyucu
+# (AttributeError) gibi hatalar denenmeden geçer ve devreyi etkilemez.
+FBREF_TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (OSError,)
+try:  # soccerdata >= 1.8 (tls_requests / seleniumbase)
+    from tls_requests.exceptions import HTTPError as _TLSHTTPError
+    FBREF_TRANSIENT_ERRORS += (_TLSHTTPError,)
+except ImportError:
+    pass
+try:
+    from selenium.common.exceptions import WebDriverException as _WebDriverException
+    FBREF_TRANSIENT_ERRORS += (_WebDriverException,)
+except ImportError:
+    pass
+
+
+class FBrefBusyError(Exception):
+    """Havuz kuyruğu dolu, yeni iş kabul edilmiyor"""
+
+
+def get_fbref_scraper(leagues: List[str], seasons: List[str]):
+    """FBref scraper oluştur"""
+    return sd.FBref(leagues=leagues, seasons=seasons)
+
+
+def _read(leagues: List[str], seasons: List[str], method: str, kwargs: Dict[str, Any]):
+    """Havuz içinde çalışan okuma (process modunda pickle edilebilir olmalı)"""
+    scraper = get_fbref_scraper(leagues, seasons)
+    return getattr(scraper, method)(**kwargs)
+
+
+class FBrefPool:
+    """Sınırlı kuyruklu ve lig başına eşzamanlılık limitli soccerdata havuzu"""
+
+    def __init__(
+        self,
+        mode: str = FBREF_EXECUTOR,
+        workers: int = FBREF_WORKERS,
+        queue_size: int = FBREF_QUEUE_SIZE,
+        league_concurrency: int = FBREF_LEAGUE_CONCURRENCY,
+    ):
+        self.mode = mode
+        self.workers = workers
+        self.queue_size = queue_size
+        self.league_concurrency = league_concurrency
+        self._executor: Optional[Executor] = None
+        self._league_limits: Dict[str, asyncio.Semaphore] = {}
+        self.breaker = breakers.breaker("fbref")
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+        self._completed = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="fbref"
+                )
+        return self._executor
+
+    def _league_limit(self, league: str) -> asyncio.Semaphore:
+        if league not in self._league_limits:
+            self._league_limits[league] = asyncio.Semaphore(self.league_concurrency)
+        return self._league_limits[league]
+
+    async def run(self, leagues: List[str], seasons: List[str], method: str, **kwargs) -> Any:
+        """
+        FBref okumasını havuzda çalıştır
+
+        Args:
+            leagues: soccerdata lig adları
+            seasons: Sezonlar
+            method: Çağrılacak FBref metodu (read_schedule, read_team_season_stats ...)
+
+        Returns:
+            Okunan DataFrame
+        """
+        # Devre açıksa kuyruğa girmeden reddet
+        self.breaker.check()
+
+        if self._pending >= self.workers + self.queue_size:
+            self._rejected += 1
+            raise FBrefBusyError("FBref iş kuyruğu dolu")
+
+        self._pending += 1
+        try:
+            async with AsyncExitStack() as stack:
+                # Kilitlenmeyi önlemek için ligler sıralı alınır
+                for league in sorted(set(leagues)):
+                    await stack.enter_async_context(self._league_limit(league))
+
+                loop = asyncio.get_running_loop()
+                self._running += 1
+                try:
+                    with self.breaker.protect(FBREF_TRANSIENT_ERRORS):
+                        return await retry_async(
+                            lambda: loop.run_in_executor(
+                                self._get_executor(),
+                                functools.partial(_read, list(leagues), list(seasons), method, kwargs),
+                            ),
+                            retry_on=FBREF_TRANSIENT_ERRORS,
+                            attempts=FBREF_RETRIES,
+                        )
+                finally:
+                    self._running -= 1
+                    self._completed += 1
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Havuz durumunu getir"""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "league_concurrency": self.league_concurrency,
+            "pending": self._pending,
+            "running": self._running,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "busy_leagues": [
+                league for league, sem in self._league_limits.items() if sem.locked()
+            ],
+        }
+
+    def shutdown(self):
+        """Havuzu kapat"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+fbref_pool = FBrefPool()
@@ -0,0 +1,336 @@
+"""
+FBref DataFrame Deposu
+
+Ham FBref tabloları (lig, sezon, tablo, stat_type) anahtarıyla tek bir
+yerde tutulur. Endpoint'ler bu tabloları dilimler; yeni bir takım veya
+oyuncu sorgusu yeni bir scrape başlatmaz.
+
+Tablolar diske de yazılır (bkz. snapshot.py); yeniden başlatmada bellekte
+olmayan tablo önce diskten okunur, bayatsa arka planda yenilenir.
+
+Tamamlanmış sezonların tabloları değişmez: bir kez yüklenir ve süresiz
+tutulur. Yalnızca CURRENT_SEASON yenilenir. Bellekteki tablo sayısı
+FBREF_MAX_FRAMES ile sınırlıdır; çıkarılan tablo gerekince diskten okunur.
+
+Yenileme başarısız olursa (scrape hatası, devre kesici açık) eldeki bayat
+tablo döner; FBREF_FAILURE_BACKOFF süresince o tablo yeniden denenmez.
+
+Türetilmiş tablolar (ör. fikstürden hesaplanan puan durumu) scrape
+edilmez; kaynak tablo değiştikçe yeniden hesaplanır.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from fbref_pool import FBrefPool, fbref_pool
+from league_table import build_league_table
+from singleflight import SingleFlight
+from snapshot import SNAPSHOT_ENABLED, SnapshotStore
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Mevcut sezon (yalnızca bu sezonun tabloları yenilenir)
+CURRENT_SEASON = os.getenv("FBREF_CURRENT_SEASON", "2425")
+
+# Depodaki tabloların yenilenme süresi (saniye)
+FBREF_FRAME_TTL = int(os.getenv("FBREF_FRAME_TTL", "3600"))
+
+# Yenilemesi başarısız olan tablonun bayat hâliyle sunulduğu süre (saniye)
+FBREF_FAILURE_BACKOFF = float(os.getenv("FBREF_FAILURE_BACKOFF", "60"))
+
+# Bellekte tutulan en fazla tablo; aşılınca en uzun süredir kullanılmayan
+# tablo (önce mevcut sezonunkiler) çıkarılır ve gerekirse diskten okunur
+FBREF_MAX_FRAMES = int(os.getenv("FBREF_MAX_FRAMES", "128"))
+
+# Tablo adı -> soccerdata FBref metodu
+TABLES = {
+    "schedule": "read_schedule",
+    "team_season_stats": "read_team_season_stats",
+    "player_season_stats": "read_player_season_stats",
+}
+
+# Türetilmiş tablo adı -> (kaynak tablo, hesaplama); FBref okuyucusu yok
+DERIVED_TABLES: Dict[str, Tuple[str, Callable[[pd.DataFrame], pd.DataFrame]]] = {
+    "league_table": ("schedule", build_league_table),
+}
+
+
+class FrameKey(NamedTuple):
+    league: str
+    season: str
+    table: str
+    stat_type: Optional[str] = None
+
+
+class FrameEntry(NamedTuple):
+    frame: pd.DataFrame
+    loaded_at: float
+    source: str                 # scrape | snapshot
+    outdated: bool = False      # farklı soccerdata sürümüyle yazılmış anlık görüntü
+
+
+def _season_start(season: str) -> Optional[int]:
+    """"2425" biçimindeki sezonun başlangıç yılı (bilinmeyen biçimde None)"""
+    if len(season) == 4 and season.isdigit() and (int(season[:2]) + 1) % 100 == int(season[2:]):
+        return int(season[:2])
+    return None
+
+
+def is_completed_season(season: str, current_season: str = CURRENT_SEASON) -> bool:
+    """Sezon mevcut sezondan önce mi bitti (tabloları artık değişmez)"""
+    start, current = _season_start(season), _season_start(current_season)
+    if start is None or current is None:
+        return False
+    return start < current
+
+
+class FrameStore:
+    """Lig/sezon bazlı ham FBref tablolarının süreç içi deposu"""
+
+    def __init__(
+        self,
+        pool: FBrefPool,
+        ttl: int = FBREF_FRAME_TTL,
+        snapshots: Optional[SnapshotStore] = None,
+        current_season: str = CURRENT_SEASON,
+        max_frames: int = FBREF_MAX_FRAMES
+    ):
+        self.pool = pool
+        self.ttl = ttl
+        self.snapshots = snapshots
+        self.current_season = current_season
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[FrameKey, FrameEntry]" = OrderedDict()
+        self._inflight = SingleFlight()
+        self._refreshing: Dict[FrameKey, asyncio.Task] = {}
+        self._failed_at: Dict[FrameKey, float] = {}
+        self._saving: Set[asyncio.Task] = set()
+        self._listeners: List[Callable[[FrameKey, pd.DataFrame], None]] = []
+        self._derived: Dict[FrameKey, Tuple[pd.DataFrame, pd.DataFrame]] = {}
+        self._hits = 0
+        self._loads = 0
+        self._snapshot_loads = 0
+        self._fallbacks = 0
+        self._evictions = 0
+
+    async def get(self, league: str, season: str, table: str, stat_type: Optional[str] = None) -> pd.DataFrame:
+        """Tek lig/sezon tablosunu getir; yoksa veya süresi dolduysa yükle"""
+        if table in DERIVED_TABLES:
+            source_table = DERIVED_TABLES[table][0]
+            return self._derive(FrameKey(league, season, table), await self.get(league, season, source_table))
+        if table not in TABLES:
+            raise ValueError(f"Bilinmeyen tablo: {table}")
+
+        key = FrameKey(league, season, table, stat_type)
+        entry = self._frames.get(key)
+        if entry is not None:
+            self._frames.move_to_end(key)
+
+        if entry is None and self.snapshots is not None:
+            entry = await self._inflight.do(("snapshot", key), lambda: self._load_snapshot(key))
+
+        if entry is not None:
+            if self._is_fresh(key, entry):
+                self._hits += 1
+                return entry.frame
+            if entry.source == "snapshot":
+                # Diskten gelen bayat tablo hemen döner, arka planda yenilenir
+                self._hits += 1
+                self._refresh_in_background(key)
+                return entry.frame
+            if time.time() - self._failed_at.get(key, 0) < FBREF_FAILURE_BACKOFF:
+                # Son yenileme kısa süre önce başarısız oldu: bayat tablo
+                self._fallbacks += 1
+                return entry.frame
+
+        try:
+            return await self._inflight.do(key, lambda: self._load(key))
+        except Exception as e:
+            if entry is None:
+                raise
+            self._fallbacks += 1
+            logger.warning("Tablo yenilenemedi, bayat tablo kullanılıyor (%s): %s", key, e)
+            return entry.frame
+
+    def _derive(self, key: FrameKey, source: pd.DataFrame) -> pd.DataFrame:
+        """Türetilmiş tablo; kaynak tablo aynıysa önceki hesap kullanılır"""
+        cached = self._derived.get(key)
+        if cached is not None and cached[0] is source:
+            return cached[1]
+        frame = DERIVED_TABLES[key.table][1](source)
+        self._derived[key] = (source, frame)
+        return frame
+
+    def add_listener(self, listener: Callable[[FrameKey, pd.DataFrame], None]):
+        """Depoya yeni tablo girdiğinde çağrılacak fonksiyonu kaydet (indeksler için)"""
+        self._listeners.append(listener)
+
+    def _notify(self, key: FrameKey, frame: pd.DataFrame):
+        for listener in self._listeners:
+            try:
+                listener(key, frame)
+            except Exception:
+                logger.exception("Tablo dinleyicisi başarısız (%s)", key)
+
+    def is_pinned(self, key: FrameKey) -> bool:
+        """Tamamlanmış sezon tabloları süresiz tutulur"""
+        return is_completed_season(key.season, self.current_season)
+
+    def _is_fresh(self, key: FrameKey, entry: FrameEntry) -> bool:
+        if entry.outdated:
+            return False
+        if self.is_pinned(key):
+            return True
+        return time.time() - entry.loaded_at < self.ttl
+
+    async def get_many(
+        self,
+        leagues: List[str],
+        seasons: List[str],
+        table: str,
+        stat_type: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Birden fazla lig/sezon tablosunu eşzamanlı getirip birleştir
+
+        Her lig/sezon ayrı tutulduğundan çok sezonlu sorgular yalnızca
+        cache'teki tabloları birleştirir; bitmiş sezonlar yeniden okunmaz.
+        """
+        frames = await asyncio.gather(*[
+            self.get(league, season, table, stat_type)
+            for league in leagues
+            for season in seasons
+        ])
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames)
+
+    async def refresh(self, league: str, season: str, table: str, stat_type: Optional[str] = None) -> pd.DataFrame:
+        """Tabloyu süresine bakmadan yeniden yükle"""
+        if table in DERIVED_TABLES:
+            source_table = DERIVED_TABLES[table][0]
+            return self._derive(FrameKey(league, season, table), await self.refresh(league, season, source_table))
+        key = FrameKey(league, season, table, stat_type)
+        return await self._inflight.do(key, lambda: self._load(key))
+
+    async def _load(self, key: FrameKey) -> pd.DataFrame:
+        kwargs: Dict[str, Any] = {}
+        if key.stat_type is not None:
+            kwargs["stat_type"] = key.stat_type
+
+        try:
+            frame = await self.pool.run([key.league], [key.season], TABLES[key.table], **kwargs)
+        except Exception:
+            self._failed_at[key] = time.time()
+            raise
+        self._failed_at.pop(key, None)
+        entry = FrameEntry(frame, time.time(), "scrape")
+        self._put(key, entry)
+        self._loads += 1
+        self._notify(key, frame)
+
+        if self.snapshots is not None:
+            task = asyncio.ensure_future(self._save_snapshot(key, entry))
+            self._saving.add(task)
+            task.add_done_callback(self._saving.discard)
+
+        return entry.frame
+
+    async def _load_snapshot(self, key: FrameKey) -> Optional[FrameEntry]:
+        # Başka bir çağrı bu arada scrape ile doldurmuş olabilir
+        if key in self._frames:
+            return self._frames[key]
+
+        loaded = await asyncio.to_thread(self.snapshots.load, key)
+        if loaded is None:
+            return None
+
+        frame, meta = loaded
+        # Farklı sürümle yazılmışsa ilk erişimde arka planda yenilenir
+        entry = FrameEntry(frame, meta["saved_at"], "snapshot", self.snapshots.is_outdated(meta))
+        if key not in self._frames:
+            self._put(key, entry)
+            self._snapshot_loads += 1
+            self._notify(key, frame)
+        return self._frames[key]
+
+    def _put(self, key: FrameKey, entry: FrameEntry):
+        """Tabloyu ekle; sınır aşılırsa en uzun süredir kullanılmayanı çıkar"""
+        self._frames[key] = entry
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.max_frames:
+            # Önce yenilenen (mevcut sezon) tablolar; eklenen tablo hiç çıkarılmaz
+            candidates = [old for old in self._frames if old != key]
+            victim = next((old for old in candidates if not self.is_pinned(old)), candidates[0])
+            self._evict(victim)
+
+    def _evict(self, key: FrameKey):
+        del self._frames[key]
+        self._failed_at.pop(key, None)
+        for derived_key in [
+            derived_key for derived_key in self._derived
+            if (derived_key.league, derived_key.season) == (key.league, key.season)
+            and DERIVED_TABLES[derived_key.table][0] == key.table
+        ]:
+            del self._derived[derived_key]
+        self._evictions += 1
+
+    async def _save_snapshot(self, key: FrameKey, entry: FrameEntry):
+        try:
+            await asyncio.to_thread(self.snapshots.save, key, entry.frame, entry.loaded_at)
+        except Exception as e:
+            logger.warning("Anlık görüntü yazılamadı (%s): %s", key, e)
+
+    def _refresh_in_background(self, key: FrameKey):
+        if key in self._refreshing:
+            return
+
+        task = asyncio.ensure_future(self._inflight.do(key, lambda: self._load(key)))
+        self._refreshing[key] = task
+
+        def done(t: asyncio.Task):
+            self._refreshing.pop(key, None)
+            if not t.cancelled() and t.exception() is not None:
+                logger.warning("Tablo arka planda yenilenemedi (%s): %s", key, t.exception())
+
+        task.add_done_callback(done)
+
+    def stats(self) -> Dict[str, Any]:
+        """Depo durumunu getir"""
+        now = time.time()
+        return {
+            "frames": len(self._frames),
+            "derived": len(self._derived),
+            "hits": self._hits,
+            "loads": self._loads,
+            "snapshot_loads": self._snapshot_loads,
+            "fallbacks": self._fallbacks,
+            "evictions": self._evictions,
+            "max_frames": self.max_frames,
+            "failing": sum(1 for failed_at in self._failed_at.values() if now - failed_at < FBREF_FAILURE_BACKOFF),
+            "entries": [
+                {
+                    "league": key.league,
+                    "season": key.season,
+                    "table": key.table,
+                    "stat_type": key.stat_type,
+                    "rows": len(entry.frame),
+                    "source": entry.source,
+                    "pinned": self.is_pinned(key),
+                    "age_seconds": round(now - entry.loaded_at, 1),
+                }
+                for key, entry in self._frames.items()
+            ],
+        }
+
+
+frame_store = FrameStore(fbref_pool, snapshots=SnapshotStore() if SNAPSHOT_ENABLED else None)
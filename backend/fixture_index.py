@@ -0,0 +1,427 @@
+"""
+Sezon Fikstür İndeksi
+
+Takip edilen her ligin sezon fikstürü (`fixtures?league=&season=`) bir kez
+çekilip bellekte takım, tarih, hafta (round) ve durum bazında indekslenir.
+Bir ligin günün maçları ve fikstürü upstream'e gitmeden bu indeksten
+cevaplanır; ligsiz gün sorgusu tüm ligleri kapsadığından upstream'e gider.
+Takımın sonraki/son maçları yalnızca takımın sezondaki tüm turnuvaları
+(`leagues?team=`) takip ediliyorsa indeksten cevaplanır; takip edilmeyen bir
+kupa veya hazırlık maçı sonucu değiştirebileceğinden diğer takımlar
+upstream'e gider. Gün anahtarları ve "bugün" UTC'dir.
+
+İndeks küçük artımlı güncellemelerle taze tutulur:
+- Takip edilen bir maç oynanıyorsa (veya başlamak üzereyse) tek bir
+  `live=all` isteği tüm liglerin skor ve durumlarını günceller; canlı
+  listeden düşen maçların son hali tek bir `ids` isteğiyle alınır.
+- Maç günlerinde `date=` isteği saat değişikliklerini ve ertelemeleri yakalar.
+Tam sezon senkronu günde bir kez yapılır ve lig fikstürü zaten ön ısıtma
+işleriyle tazelendiğinden çoğunlukla cache'ten okunur.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from api_football import (
+    LEAGUE_IDS,
+    get_fixtures,
+    get_fixtures_by_ids,
+    get_live_matches,
+    get_team_leagues,
+    get_today_matches,
+    utc_today,
+)
+from apif_ttl import APIF_CURRENT_SEASON, FINISHED_STATUSES
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_INDEX_ENABLED = os.getenv("FIXTURE_INDEX_ENABLED", "true").lower() == "true"
+
+# Tam sezon senkronu aralığı; iki katı geçtiyse indeks bayat sayılır ve
+# endpoint'ler upstream'e döner (saniye)
+FIXTURE_SYNC_INTERVAL = int(os.getenv("FIXTURE_SYNC_INTERVAL", "86400"))
+FIXTURE_SYNC_DELAY = int(os.getenv("FIXTURE_SYNC_DELAY", "30"))
+
+# Artımlı güncelleme işinin aralığı ve maç günü `date=` senkronu aralığı (saniye)
+FIXTURE_UPDATE_INTERVAL = int(os.getenv("FIXTURE_UPDATE_INTERVAL", "60"))
+FIXTURE_DATE_INTERVAL = int(os.getenv("FIXTURE_DATE_INTERVAL", "3600"))
+
+# Başlama saatinden bu kadar önce / sonra maç "oynanıyor olabilir" sayılır (saniye)
+FIXTURE_PREMATCH_WINDOW = int(os.getenv("FIXTURE_PREMATCH_WINDOW", "300"))
+FIXTURE_MATCH_WINDOW = int(os.getenv("FIXTURE_MATCH_WINDOW", "10800"))
+
+# Henüz oynanmamış ve oynanmakta olan maç durumları
+UPCOMING_STATUSES = {"TBD", "NS"}
+LIVE_STATUSES = {"1H", "HT", "2H", "ET", "BT", "P", "SUSP", "INT", "LIVE"}
+
+LeagueSeason = Tuple[int, int]
+
+
+class IndexKeys(NamedTuple):
+    """Bir maçın bulunduğu indeks anahtarları (güncellemede eskisi silinir)"""
+    league: LeagueSeason
+    teams: Tuple[int, ...]
+    day: Optional[str]
+    round: Optional[str]
+    status: Optional[str]
+
+
+def _fixture_id(item: Dict[str, Any]) -> Optional[int]:
+    return (item.get("fixture") or {}).get("id")
+
+
+def _status(item: Dict[str, Any]) -> Optional[str]:
+    return ((item.get("fixture") or {}).get("status") or {}).get("short")
+
+
+def _timestamp(item: Dict[str, Any]) -> float:
+    return (item.get("fixture") or {}).get("timestamp") or 0
+
+
+def _progress(status: Optional[str]) -> int:
+    """Maç durumunun ilerleme sırası (oynanmamış < oynanıyor < bitmiş)"""
+    if status in FINISHED_STATUSES:
+        return 2
+    return 1 if status in LIVE_STATUSES else 0
+
+
+def _keys(item: Dict[str, Any]) -> IndexKeys:
+    league = item.get("league") or {}
+    teams = item.get("teams") or {}
+    team_ids = tuple(
+        team_id for team_id in (
+            (teams.get("home") or {}).get("id"),
+            (teams.get("away") or {}).get("id"),
+        ) if team_id is not None
+    )
+    # Gün anahtarı UTC (yanıt başka saat diliminde olsa da)
+    timestamp = _timestamp(item)
+    kickoff = (item.get("fixture") or {}).get("date")
+    if timestamp:
+        day = datetime.fromtimestamp(timestamp, timezone.utc).date().isoformat()
+    else:
+        day = kickoff[:10] if kickoff else None
+    return IndexKeys(
+        league=(league.get("id"), league.get("season")),
+        teams=team_ids,
+        day=day,
+        round=league.get("round"),
+        status=_status(item),
+    )
+
+
+class FixtureIndex:
+    """Takip edilen liglerin sezon fikstürleri üzerinde bellek içi sorgu indeksi"""
+
+    def __init__(self, leagues: Dict[str, int] = LEAGUE_IDS, season: int = APIF_CURRENT_SEASON):
+        self.leagues = leagues
+        self.season = season
+        self._fixtures: Dict[int, Dict[str, Any]] = {}
+        self._keys: Dict[int, IndexKeys] = {}
+        self._by_league: Dict[LeagueSeason, Set[int]] = {}
+        self._by_team: Dict[int, Set[int]] = {}
+        self._by_day: Dict[str, Set[int]] = {}
+        self._by_round: Dict[Tuple[int, int, str], Set[int]] = {}
+        self._by_status: Dict[str, Set[int]] = {}
+        self._synced: Dict[LeagueSeason, float] = {}
+        self._last_update: Optional[float] = None
+        self._last_date_sync = 0.0
+        self._counts = {
+            "full_syncs": 0, "live_updates": 0, "date_updates": 0, "ids_updates": 0,
+            "updated": 0, "removed": 0, "queries": 0, "untracked_teams": 0,
+        }
+
+    # ---- indeks bakımı ----
+
+    @staticmethod
+    def _add(index: Dict[Any, Set[int]], key: Any, fixture_id: int):
+        if key is not None:
+            index.setdefault(key, set()).add(fixture_id)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[int]], key: Any, fixture_id: int):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(fixture_id)
+            if not ids:
+                del index[key]
+
+    def _unindex(self, fixture_id: int):
+        keys = self._keys.pop(fixture_id, None)
+        if keys is None:
+            return
+        self._discard(self._by_league, keys.league, fixture_id)
+        for team_id in keys.teams:
+            self._discard(self._by_team, team_id, fixture_id)
+        self._discard(self._by_day, keys.day, fixture_id)
+        self._discard(self._by_round, (*keys.league, keys.round), fixture_id)
+        self._discard(self._by_status, keys.status, fixture_id)
+
+    def _index(self, fixture_id: int, item: Dict[str, Any]):
+        keys = _keys(item)
+        self._keys[fixture_id] = keys
+        self._fixtures[fixture_id] = item
+        self._add(self._by_league, keys.league, fixture_id)
+        for team_id in keys.teams:
+            self._add(self._by_team, team_id, fixture_id)
+        self._add(self._by_day, keys.day, fixture_id)
+        if keys.round is not None:
+            self._add(self._by_round, (*keys.league, keys.round), fixture_id)
+        self._add(self._by_status, keys.status, fixture_id)
+
+    def upsert(self, items: Iterable[Dict[str, Any]], forward_only: bool = False) -> Set[int]:
+        """
+        Maçları indekse ekle veya güncelle
+
+        Yalnızca senkronlanmış (lig, sezon) maçları alınır; `live`/`date`
+        yanıtları tüm dünyanın maçlarını içerir.
+
+        Args:
+            items: API-Football fikstür yanıtı öğeleri
+            forward_only: True ise durumu indekstekinden geride olan maç
+                (ör. cache'teki sezon listesinde hâlâ "NS" görünen canlı maç)
+                güncellenmez
+
+        Returns:
+            İndekse yazılan maç ID'leri
+        """
+        written = set()
+        for item in items:
+            fixture_id = _fixture_id(item)
+            if fixture_id is None:
+                continue
+            if _keys(item).league not in self._synced:
+                continue
+            # Canlı/tarih yanıtlarındaki olay ve kadro listeleri indekste tutulmaz
+            item = {key: value for key, value in item.items() if key not in ("events", "lineups", "statistics", "players")}
+            current = self._keys.get(fixture_id)
+            if forward_only and current is not None and _progress(current.status) > _progress(_status(item)):
+                written.add(fixture_id)
+                continue
+            if self._fixtures.get(fixture_id) != item:
+                self._unindex(fixture_id)
+                self._index(fixture_id, item)
+                self._counts["updated"] += 1
+            written.add(fixture_id)
+        return written
+
+    # ---- senkron ----
+
+    async def sync_season(self, league_id: int, season: Optional[int] = None) -> int:
+        """
+        Ligin sezon fikstürünü indekse yükle
+
+        Upstream yanıtında artık bulunmayan maçlar indeksten silinir.
+
+        Returns:
+            Ligdeki maç sayısı
+        """
+        season = season or self.season
+        data = await get_fixtures(league_id, season)
+        if "error" in data:
+            raise RuntimeError(data["error"])
+
+        league = (league_id, season)
+        self._synced[league] = time.time()
+        present = self.upsert(data.get("response") or [], forward_only=True)
+        for fixture_id in self._by_league.get(league, set()) - present:
+            self._unindex(fixture_id)
+            del self._fixtures[fixture_id]
+            self._counts["removed"] += 1
+        self._counts["full_syncs"] += 1
+        return len(present)
+
+    async def sync_all(self) -> str:
+        """Tüm takip edilen liglerin sezon fikstürünü senkronla (zamanlayıcı işi)"""
+        total, failed = 0, []
+        for league_key, league_id in self.leagues.items():
+            try:
+                total += await self.sync_season(league_id)
+            except Exception as e:
+                logger.warning("Fikstür senkronu başarısız (%s): %s", league_key, e)
+                failed.append(league_key)
+        if failed:
+            raise RuntimeError(f"{total} maç; başarısız: {', '.join(failed)}")
+        return f"{total} maç"
+
+    def _watching(self, now: float) -> List[int]:
+        """Şu an oynanıyor olabilecek takip edilen maçlar"""
+        watching = []
+        for status in UPCOMING_STATUSES | LIVE_STATUSES:
+            for fixture_id in self._by_status.get(status, ()):
+                kickoff = _timestamp(self._fixtures[fixture_id])
+                if kickoff - FIXTURE_PREMATCH_WINDOW <= now <= kickoff + FIXTURE_MATCH_WINDOW:
+                    watching.append(fixture_id)
+        return watching
+
+    async def update(self) -> str:
+        """
+        Artımlı güncelleme (zamanlayıcı işi)
+
+        Takip edilen maç oynanmıyorsa ve tarih senkronu taze ise upstream'e
+        hiç gidilmez.
+        """
+        if not self._synced:
+            return "skipped"
+        now = time.time()
+        done = []
+
+        # Önce tarih, sonra (daha taze) canlı yanıt uygulanır; tarih yanıtı
+        # cache'ten gelebileceğinden maç durumlarını geri almaz
+        today = utc_today()
+        if today in self._by_day and now - self._last_date_sync >= FIXTURE_DATE_INTERVAL:
+            data = await get_today_matches()
+            if "error" in data:
+                raise RuntimeError(data["error"])
+            self.upsert(data.get("response") or [], forward_only=True)
+            self._last_date_sync = now
+            self._counts["date_updates"] += 1
+            done.append("date")
+
+        if self._watching(now):
+            data = await get_live_matches()
+            if "error" in data:
+                raise RuntimeError(data["error"])
+            live = self.upsert(data.get("response") or [])
+            self._counts["live_updates"] += 1
+            done.append(f"live {len(live)}")
+
+            # İndekste canlı görünüp canlı listeden düşen maçlar bitmiş (veya
+            # ertelenmiş) olmalı; son halleri tek `ids` isteğiyle alınır
+            ended = [
+                fixture_id
+                for status in LIVE_STATUSES
+                for fixture_id in self._by_status.get(status, ())
+                if fixture_id not in live
+            ]
+            if ended:
+                data = await get_fixtures_by_ids(ended)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                self.upsert(data.get("response") or [])
+                self._counts["ids_updates"] += 1
+                done.append(f"ids {len(ended)}")
+
+        self._last_update = now
+        return ", ".join(done) or "idle"
+
+    # ---- sorgular ----
+
+    def covers(self, league_id: int, season: Optional[int] = None) -> bool:
+        """(lig, sezon) senkronlanmış ve bayat değil mi"""
+        synced_at = self._synced.get((league_id, season or self.season))
+        return synced_at is not None and time.time() - synced_at < 2 * FIXTURE_SYNC_INTERVAL
+
+    def covers_team(self, team_id: int) -> bool:
+        """Takımın maçı olan tüm (lig, sezon)'lar güncel mi"""
+        ids = self._by_team.get(team_id)
+        return bool(ids) and all(self.covers(*self._keys[fixture_id].league) for fixture_id in ids)
+
+    async def answers_team(self, team_id: int) -> bool:
+        """
+        Takımın sonraki/son maçları indeksten upstream'le aynı cevaplanır mı
+
+        Takımın sezonda oynadığı tüm turnuvalar (cache'li `leagues?team=`)
+        takip ediliyor ve güncel olmalı; bilinemiyorsa False.
+        """
+        if not self.covers_team(team_id):
+            return False
+        data = await get_team_leagues(team_id, self.season)
+        if "error" in data or data.get("errors"):
+            return False
+        competitions = {(item.get("league") or {}).get("id") for item in data.get("response") or []}
+        if not competitions or not all(self.covers(league_id) for league_id in competitions):
+            self._counts["untracked_teams"] += 1
+            return False
+        return True
+
+    def _sorted(self, ids: Iterable[int], reverse: bool = False) -> List[Dict[str, Any]]:
+        self._counts["queries"] += 1
+        fixtures = [self._fixtures[fixture_id] for fixture_id in ids]
+        fixtures.sort(key=_timestamp, reverse=reverse)
+        return fixtures
+
+    def team_next(self, team_id: int, count: int = 1) -> List[Dict[str, Any]]:
+        """Takımın oynanmamış ilk `count` maçı (yakından uzağa)"""
+        ids = [
+            fixture_id for fixture_id in self._by_team.get(team_id, ())
+            if self._keys[fixture_id].status in UPCOMING_STATUSES
+        ]
+        return self._sorted(ids)[:count]
+
+    def team_last(self, team_id: int, count: int = 5) -> List[Dict[str, Any]]:
+        """Takımın bitmiş son `count` maçı (yeniden eskiye)"""
+        ids = [
+            fixture_id for fixture_id in self._by_team.get(team_id, ())
+            if self._keys[fixture_id].status in FINISHED_STATUSES
+        ]
+        return self._sorted(ids, reverse=True)[:count]
+
+    def on_day(self, day: str, league_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Günün (YYYY-MM-DD) maçları; lig verilmezse tüm takip edilen ligler"""
+        ids = self._by_day.get(day, ())
+        if league_id is not None:
+            ids = [fixture_id for fixture_id in ids if self._keys[fixture_id].league[0] == league_id]
+        return self._sorted(ids)
+
+    def league_fixtures(
+        self,
+        league_id: int,
+        season: Optional[int] = None,
+        next_matches: Optional[int] = None,
+        last_matches: Optional[int] = None,
+        round_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Ligin sezon fikstürü
+
+        Args:
+            next_matches: Verilirse oynanmamış ilk N maç
+            last_matches: Verilirse bitmiş son N maç
+            round_name: Verilirse yalnızca o hafta (ör. "Regular Season - 5")
+        """
+        league = (league_id, season or self.season)
+        if round_name is not None:
+            ids = self._by_round.get((*league, round_name), set())
+        else:
+            ids = self._by_league.get(league, set())
+
+        if next_matches:
+            upcoming = [fixture_id for fixture_id in ids if self._keys[fixture_id].status in UPCOMING_STATUSES]
+            return self._sorted(upcoming)[:next_matches]
+        if last_matches:
+            finished = [fixture_id for fixture_id in ids if self._keys[fixture_id].status in FINISHED_STATUSES]
+            return self._sorted(finished, reverse=True)[:last_matches]
+        return self._sorted(ids)
+
+    def stats(self) -> Dict[str, Any]:
+        """İndeks boyutu, senkron zamanları ve güncelleme sayaçları"""
+        return {
+            "enabled": FIXTURE_INDEX_ENABLED,
+            "season": self.season,
+            "fixtures": len(self._fixtures),
+            "teams": len(self._by_team),
+            "days": len(self._by_day),
+            "by_status": {status: len(ids) for status, ids in sorted(self._by_status.items())},
+            "leagues": {
+                f"{league_id}:{season}": {
+                    "fixtures": len(self._by_league.get((league_id, season), ())),
+                    "synced_at": datetime.fromtimestamp(synced_at).isoformat(),
+                    "fresh": self.covers(league_id, season),
+                }
+                for (league_id, season), synced_at in self._synced.items()
+            },
+            "watching": len(self._watching(time.time())),
+            "last_update": datetime.fromtimestamp(self._last_update).isoformat() if self._last_update else None,
+            **self._counts,
+        }
+
+
+fixture_index = FixtureIndex()
@@ -0,0 +1,117 @@
+"""
+Tablo Sorgusu (alan seçimi, sıralama, sayfalama)
+
+Liste endpoint'leri `fields`, `sort`, `limit`, `offset`/`cursor`
+parametrelerini depodaki ortak tabloya kodlamadan önce uygular. Sütun
+isimleri JSON'daki düzleştirilmiş isimlerdir (örn. "team", "Pts",
+"Performance_Gls"). Aynı tablo her seçim için yeniden kullanılır.
+"""
+
+import base64
+from typing import List, NamedTuple, Optional
+
+import pandas as pd
+
+from serialization import flatten_columns
+
+
+class FrameQuery(NamedTuple):
+    fields: Optional[List[str]] = None      # None ise tüm sütunlar
+    sort: Optional[List[str]] = None        # "-" önekli sütun azalan sıralanır
+    limit: Optional[int] = None
+    offset: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.fields and not self.sort and self.limit is None and not self.offset
+
+    def cache_suffix(self) -> str:
+        """Cache anahtarına eklenecek kanonik gösterim (sorgusuz istekte boş)"""
+        if self.is_empty:
+            return ""
+        return f"_q:{','.join(self.fields or [])}|{','.join(self.sort or [])}|{self.limit}|{self.offset}"
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    return items or None
+
+
+def encode_cursor(offset: int) -> str:
+    """Sonraki sayfanın başlangıcını opak bir imlece çevir"""
+    return base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """İmleçten sayfa başlangıcını çöz (geçersizse ValueError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, offset = raw.split(":", 1)
+        if prefix != "o" or int(offset) < 0:
+            raise ValueError
+        return int(offset)
+    except Exception:
+        raise ValueError(f"Geçersiz imleç: {cursor}")
+
+
+def parse_query(
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    cursor: Optional[str] = None
+) -> FrameQuery:
+    """Query parametrelerinden FrameQuery oluştur (imleç offset'in yerine geçer)"""
+    if cursor:
+        offset = decode_cursor(cursor)
+    return FrameQuery(_split(fields), _split(sort), limit, offset)
+
+
+def apply_query(frame: pd.DataFrame, query: FrameQuery) -> pd.DataFrame:
+    """
+    Tabloya sıralama, sayfalama ve alan seçimini uygula
+
+    Args:
+        frame: Depodaki ham tablo (değiştirilmez)
+        query: Uygulanacak sorgu
+
+    Returns:
+        Düz sütunlu ve isimsiz indeksli sonuç tablosu. Bilinmeyen alanlar
+        yok sayılır; bilinmeyen sıralama sütununda ValueError.
+    """
+    if query.is_empty:
+        return frame
+
+    result = flatten_columns(frame.reset_index())
+    if result.columns.has_duplicates:
+        result = result.loc[:, ~result.columns.duplicated()]
+
+    if query.sort:
+        columns = [name.lstrip("-") for name in query.sort]
+        unknown = [name for name in columns if name not in result.columns]
+        if unknown:
+            raise ValueError(f"Sıralanamayan alan: {', '.join(unknown)}")
+        ascending = [not name.startswith("-") for name in query.sort]
+        result = result.sort_values(columns, ascending=ascending, kind="stable", na_position="last")
+
+    end = None if query.limit is None else query.offset + query.limit
+    if query.offset or end is not None:
+        result = result.iloc[query.offset:end]
+
+    if query.fields:
+        result = result[[name for name in dict.fromkeys(query.fields) if name in result.columns]]
+
+    return result.reset_index(drop=True)
+
+
+def page_info(total: int, query: FrameQuery) -> dict:
+    """Yanıta eklenecek sayfalama bilgisi"""
+    end = total if query.limit is None else min(total, query.offset + query.limit)
+    return {
+        "total": total,
+        "offset": query.offset,
+        "limit": query.limit,
+        "next_cursor": encode_cursor(end) if end < total else None,
+    }
@@ -0,0 +1,157 @@
+"""
+Head-to-Head İndeksi
+
+Her fikstür tablosu (lig, sezon) yenilendiğinde maçlar sırasız takım
+çiftine göre gruplanır ve özetler (G/B/M, goller, iç saha/deplasman)
+vektörel groupby ile bir kez hesaplanır. Sorgu, çift anahtarıyla O(1)
+erişim ve gerekirse sezonların birleştirilmesidir.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Özet sütunları ("a" çiftte alfabetik olarak ilk takım)
+SUMMARY_COLUMNS = [
+    "played", "a_wins", "b_wins", "draws", "a_goals", "b_goals",
+    "a_home_wins", "a_away_wins", "b_home_wins", "b_away_wins",
+]
+
+Pair = Tuple[str, str]
+
+
+def pair_key(team1: str, team2: str) -> Pair:
+    """Sırasız takım çifti anahtarı"""
+    return (team1, team2) if team1 <= team2 else (team2, team1)
+
+
+class SeasonH2H(NamedTuple):
+    matches: Dict[Pair, pd.DataFrame]       # çift -> maçlar (reset_index edilmiş)
+    summary: Dict[Pair, np.ndarray]         # çift -> SUMMARY_COLUMNS değerleri
+
+
+# soccerdata `score` sütunu: "2–1" (en dash); uzatma/penaltı notları yok sayılır
+_SCORE_PATTERN = r"(\d+)\s*[–—-]\s*(\d+)"
+
+
+def match_scores(matches: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """(ev sahibi, deplasman) golleri; oynanmamış maçlar NaN"""
+    if "score" in matches.columns:
+        parts = matches["score"].astype("string").str.extract(_SCORE_PATTERN)
+        return (
+            pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=float),
+            pd.to_numeric(parts[1], errors="coerce").to_numpy(dtype=float),
+        )
+    # Ayrı skor sütunlu tablolar (eski soccerdata sürümleri)
+    if "home_score" in matches.columns and "away_score" in matches.columns:
+        return (
+            pd.to_numeric(matches["home_score"], errors="coerce").to_numpy(dtype=float),
+            pd.to_numeric(matches["away_score"], errors="coerce").to_numpy(dtype=float),
+        )
+    missing = np.full(len(matches), np.nan)
+    return missing, missing.copy()
+
+
+def build_season(frame: pd.DataFrame) -> SeasonH2H:
+    """Tek sezonluk fikstürden çift indeksini ve özetleri hesapla"""
+    matches = frame.reset_index()
+    home = matches["home_team"].astype(str).to_numpy()
+    away = matches["away_team"].astype(str).to_numpy()
+
+    a_is_home = home <= away
+    team_a = np.where(a_is_home, home, away)
+    team_b = np.where(a_is_home, away, home)
+
+    pairs = pd.DataFrame({"a": team_a, "b": team_b}).groupby(["a", "b"]).indices
+    pair_matches = {pair: matches.iloc[positions] for pair, positions in pairs.items()}
+
+    home_score, away_score = match_scores(matches)
+    played = ~(np.isnan(home_score) | np.isnan(away_score))
+
+    home_win = played & (home_score > away_score)
+    away_win = played & (away_score > home_score)
+
+    stats = pd.DataFrame({
+        "a": team_a,
+        "b": team_b,
+        "played": played,
+        "a_wins": (home_win & a_is_home) | (away_win & ~a_is_home),
+        "b_wins": (home_win & ~a_is_home) | (away_win & a_is_home),
+        "draws": played & (home_score == away_score),
+        "a_goals": np.where(played, np.where(a_is_home, home_score, away_score), 0),
+        "b_goals": np.where(played, np.where(a_is_home, away_score, home_score), 0),
+        "a_home_wins": home_win & a_is_home,
+        "a_away_wins": away_win & ~a_is_home,
+        "b_home_wins": home_win & ~a_is_home,
+        "b_away_wins": away_win & a_is_home,
+    })
+    grouped = stats.groupby(["a", "b"])[SUMMARY_COLUMNS].sum()
+    summary = {pair: values for pair, values in zip(grouped.index, grouped.to_numpy(dtype=np.int64))}
+
+    return SeasonH2H(pair_matches, summary)
+
+
+class H2HIndex:
+    """(lig, sezon) bazlı head-to-head indeksi"""
+
+    def __init__(self):
+        self._seasons: Dict[Tuple[str, str], SeasonH2H] = {}
+
+    def index_schedule(self, league: str, season: str, frame: pd.DataFrame):
+        """Fikstür tablosunu indeksle (aynı lig/sezon yenilenirse değiştirilir)"""
+        self._seasons[(league, season)] = build_season(frame)
+
+    def lookup(self, team1: str, team2: str, league: str, seasons: List[str]) -> Optional[Dict]:
+        """
+        İki takımın maçlarını ve özetini getir
+
+        Args:
+            team1, team2: FBref takım isimleri (tam)
+            league: soccerdata lig adı
+            seasons: Birleştirilecek sezonlar
+
+        Returns:
+            {"matches": DataFrame, "summary": dict} (özet team1 açısından);
+            sezonlardan biri indekslenmemişse None
+        """
+        pair = pair_key(team1, team2)
+        team1_is_a = pair[0] == team1
+
+        totals = np.zeros(len(SUMMARY_COLUMNS), dtype=np.int64)
+        parts = []
+        for season in seasons:
+            season_h2h = self._seasons.get((league, season))
+            if season_h2h is None:
+                return None
+            if pair in season_h2h.summary:
+                totals += season_h2h.summary[pair]
+            if pair in season_h2h.matches:
+                parts.append(season_h2h.matches[pair])
+
+        if not parts:
+            matches = pd.DataFrame()
+        elif len(parts) == 1:
+            matches = parts[0]
+        else:
+            matches = pd.concat(parts)
+        values = dict(zip(SUMMARY_COLUMNS, (int(v) for v in totals)))
+
+        first, second = ("a", "b") if team1_is_a else ("b", "a")
+        summary = {
+            "total_matches": len(matches),
+            "played": values["played"],
+            "team1_wins": values[f"{first}_wins"],
+            "team2_wins": values[f"{second}_wins"],
+            "draws": values["draws"],
+            "team1_goals": values[f"{first}_goals"],
+            "team2_goals": values[f"{second}_goals"],
+            "team1_home_wins": values[f"{first}_home_wins"],
+            "team1_away_wins": values[f"{first}_away_wins"],
+            "team2_home_wins": values[f"{second}_home_wins"],
+            "team2_away_wins": values[f"{second}_away_wins"],
+        }
+        return {"matches": matches, "summary": summary}
+
+
+h2h_index = H2HIndex()
@@ -0,0 +1,170 @@
+"""
+Paylaşılan HTTP İstemcileri
+
+API-Football ve Grok için her istekte yeni bir httpx.AsyncClient (ve yeni
+TCP/TLS el sıkışması) açmak yerine host başına tek bir bağlantı havuzu
+kullanılır. İstemciler FastAPI lifespan'ında açılır ve kapanışta kapatılır.
+Havuz kullanımı ve bağlantı bekleme süreleri /health'te raporlanır.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # h2 yoksa HTTP/1.1 kullanılır
+    HTTP2_AVAILABLE = False
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Host başına bağlantı havuzu
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# HTTP/2 (h2 paketi kuruluysa)
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() == "true"
+
+
+class PooledClient:
+    """
+    Tek bir upstream host için paylaşılan, ölçümlü httpx istemcisi
+
+    İstekler havuz boyutunda bir semafordan geçer; böylece havuzda boş
+    bağlantı beklenen süre ölçülebilir.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: httpx.Timeout,
+        max_connections: int = HTTP_MAX_CONNECTIONS,
+        max_keepalive: int = HTTP_MAX_KEEPALIVE,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        http2: bool = HTTP2_ENABLED
+    ):
+        self.name = name
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_keepalive, max_connections),
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("%s: HTTP/2 istendi ama h2 paketi yok, HTTP/1.1 kullanılıyor", name)
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots = asyncio.Semaphore(max_connections)
+        self._in_flight = 0
+        self._waiting = 0
+        self._requests = 0
+        self._errors = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._latency_total = 0.0
+
+    def start(self):
+        """İstemciyi oluştur (lifespan açılışında; ilk istekte de otomatik)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+
+    async def aclose(self):
+        """Havuzdaki bağlantıları kapat"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """İsteği paylaşılan havuz üzerinden gönder"""
+        self.start()
+        queued = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        started = time.perf_counter()
+        wait = started - queued
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        self._in_flight += 1
+        self._requests += 1
+        try:
+            return await self._client.request(method, url, **kwargs)
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._latency_total += time.perf_counter() - started
+            self._slots.release()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    def _connections(self) -> Dict[str, int]:
+        # httpcore havuzunun bağlantıları (iç API; bulunamazsa boş)
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return {}
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"open": len(connections), "idle": idle}
+
+    def stats(self) -> Dict[str, Any]:
+        """Havuz kullanımı, bekleme ve gecikme ölçümleri"""
+        return {
+            "started": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive": self.limits.max_keepalive_connections,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "requests": self._requests,
+            "errors": self._errors,
+            "avg_wait_ms": round(1000 * self._wait_total / self._requests, 2) if self._requests else 0.0,
+            "max_wait_ms": round(1000 * self._wait_max, 2),
+            "avg_latency_ms": round(1000 * self._latency_total / self._requests, 2) if self._requests else 0.0,
+            **self._connections(),
+        }
+
+
+class ClientRegistry:
+    """Uygulamanın paylaşılan HTTP istemcileri"""
+
+    def __init__(self):
+        self._clients: Dict[str, PooledClient] = {}
+
+    def client(self, name: str, timeout: httpx.Timeout, **kwargs) -> PooledClient:
+        """İsimli istemci oluştur (aynı isimle tekrar çağrılırsa mevcut istemci döner)"""
+        if name not in self._clients:
+            self._clients[name] = PooledClient(name, timeout, **kwargs)
+        return self._clients[name]
+
+    def start(self):
+        """Tüm istemcileri aç"""
+        for client in self._clients.values():
+            client.start()
+
+    async def aclose(self):
+        """Tüm istemcileri kapat"""
+        await asyncio.gather(*[client.aclose() for client in self._clients.values()])
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: client.stats() for name, client in self._clients.items()}
+
+
+http_clients = ClientRegistry()
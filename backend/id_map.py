@@ -0,0 +1,276 @@
+"""
+FBref <-> API-Football ID Eşleme Tablosu
+
+FBref takım/oyuncu isimlerini API-Football ID'lerine çözer. Tablo lig
+takım listelerinden toplu kurulur, bulunamayan isimler bir kez aranıp
+öğrenilir ve diske (JSON) yazılır. Kararlı durumda isim çözümü upstream
+çağrısı yapmaz.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from api_football import TURKISH_TEAMS, get_league_teams, search_player, search_team
+from name_index import fold
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+ID_MAP_PATH = os.getenv("ID_MAP_PATH", "data/id_map.json")
+
+# Upstream'de bulunamayan isim bu süre boyunca tekrar aranmaz (saniye)
+ID_MAP_MISS_TTL = int(os.getenv("ID_MAP_MISS_TTL", "86400"))
+
+# Açılışta toplu kurulum için bekleme (FBref tablolarının ısınması için, saniye)
+ID_MAP_BUILD_DELAY = int(os.getenv("ID_MAP_BUILD_DELAY", "300"))
+
+# FBref ismini lig takımlarıyla eşlerken gereken en düşük benzerlik
+LINK_MIN_SCORE = 0.5
+
+# Diske yazılan tablolar
+TABLE_FIELDS = ("teams", "team_aliases", "player_aliases", "misses")
+
+
+def _read_table(path: str) -> Dict[str, Dict[str, Any]]:
+    """Diskteki tabloyu oku (yoksa veya bozuksa boş)"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning("ID tablosu okunamadı: %s", e)
+        return {}
+
+
+def _write_table(path: str, mine: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Tabloyu diskteki kayıtlarla (diğer worker'lar) birleştirip atomik yaz
+
+    Thread'de çalışır; yalnızca verilen kopyalarla çalışır.
+
+    Returns:
+        Birleştirilmiş tablo
+    """
+    disk = _read_table(path)
+    merged = {field: {**disk.get(field, {}), **mine[field]} for field in TABLE_FIELDS}
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "updated_at": time.time(), **merged}, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return merged
+
+
+def _similarity(a: str, b: str) -> float:
+    """İki sadeleştirilmiş isim arasındaki benzerlik (0-1)"""
+    if a == b:
+        return 1.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if tokens_a and tokens_b and (tokens_a <= tokens_b or tokens_b <= tokens_a):
+        return 0.9
+    grams_a = {a[i:i + 3] for i in range(len(a) - 2)}
+    grams_b = {b[i:i + 3] for i in range(len(b) - 2)}
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+class IdMap:
+    """Kalıcı isim -> API-Football ID tablosu"""
+
+    def __init__(self, path: str = ID_MAP_PATH):
+        self.path = path
+        self.teams: Dict[str, Dict[str, Any]] = {}          # team_id -> {name, league}
+        self.team_aliases: Dict[str, int] = {}              # sadeleştirilmiş isim -> team_id
+        self.player_aliases: Dict[str, int] = {}            # sadeleştirilmiş isim -> player_id
+        self.misses: Dict[str, float] = {}                  # "team:isim" -> son arama zamanı
+        self._lock = asyncio.Lock()
+        self._save_lock = asyncio.Lock()
+        self._upstream_lookups = 0
+
+        for key, team_id in TURKISH_TEAMS.items():
+            self.team_aliases[fold(key.replace("_", " "))] = team_id
+        self.load()
+
+    def load(self):
+        """Diskteki tabloyu oku (bellekteki kayıtlarla birleştirir)"""
+        data = _read_table(self.path)
+        for field in TABLE_FIELDS:
+            getattr(self, field).update(data.get(field, {}))
+
+    async def save(self):
+        """Tabloyu diske yaz; diğer worker'ların kayıtları da belleğe alınır"""
+        # Kopyalar event loop'ta alınır; yazma sırasında tablolar değişebilir
+        mine = {field: dict(getattr(self, field)) for field in TABLE_FIELDS}
+        async with self._save_lock:
+            merged = await asyncio.to_thread(_write_table, self.path, mine)
+        for field in TABLE_FIELDS:
+            table = getattr(self, field)
+            for key, value in merged[field].items():
+                table.setdefault(key, value)
+
+    # ---- Takımlar ----
+
+    def team_id(self, name: str) -> Optional[int]:
+        """Takım ID'sini yalnızca tablodan bul (upstream çağrısı yok)"""
+        return self.team_aliases.get(fold(name))
+
+    def learn_team(self, name: str, team_id: int, api_name: Optional[str] = None, league_id: Optional[int] = None):
+        """Takım ismini ID ile eşle"""
+        self.team_aliases[fold(name)] = team_id
+        info = self.teams.setdefault(str(team_id), {})
+        if api_name:
+            info["name"] = api_name
+            self.team_aliases.setdefault(fold(api_name), team_id)
+        if league_id:
+            info["league"] = league_id
+
+    def learn_teams(self, response: List[Dict[str, Any]], league_id: Optional[int] = None):
+        """API-Football /teams yanıtındaki tüm takımları öğren"""
+        for item in response:
+            team = item.get("team", {})
+            if team.get("id") and team.get("name"):
+                self.learn_team(team["name"], team["id"], team["name"], league_id)
+
+    def link_fbref_teams(self, league_id: int, fbref_names: List[str]) -> int:
+        """
+        FBref takım isimlerini aynı ligdeki API-Football takımlarıyla eşle
+
+        Returns:
+            Yeni eşlenen isim sayısı
+        """
+        candidates = [
+            (int(team_id), fold(info["name"]))
+            for team_id, info in self.teams.items()
+            if info.get("league") == league_id and info.get("name")
+        ]
+        linked = 0
+        for name in fbref_names:
+            folded = fold(name)
+            if folded in self.team_aliases or not candidates:
+                continue
+            score, team_id = max((_similarity(folded, api_name), team_id) for team_id, api_name in candidates)
+            if score >= LINK_MIN_SCORE:
+                self.team_aliases[folded] = team_id
+                linked += 1
+        return linked
+
+    def _recently_missed(self, key: str) -> bool:
+        return time.time() - self.misses.get(key, 0) < ID_MAP_MISS_TTL
+
+    async def resolve_team_id(self, name: str) -> Optional[int]:
+        """Takım ID'sini çöz; tabloda yoksa bir kez arayıp öğren"""
+        team_id = self.team_id(name)
+        if team_id or self._recently_missed(f"team:{fold(name)}"):
+            return team_id
+
+        async with self._lock:
+            team_id = self.team_id(name)
+            if team_id:
+                return team_id
+
+            self._upstream_lookups += 1
+            data = await search_team(name)
+            if data.get("response"):
+                team = data["response"][0]["team"]
+                self.learn_team(name, team["id"], team.get("name"))
+                team_id = team["id"]
+            elif "error" not in data:
+                self.misses[f"team:{fold(name)}"] = time.time()
+            await self.save()
+            return team_id
+
+    # ---- Oyuncular ----
+
+    def player_id(self, name: str) -> Optional[int]:
+        """Oyuncu ID'sini yalnızca tablodan bul (upstream çağrısı yok)"""
+        return self.player_aliases.get(fold(name))
+
+    def learn_players(self, response: List[Dict[str, Any]]):
+        """API-Football /players yanıtındaki oyuncuları öğren"""
+        for item in response:
+            player = item.get("player", {})
+            if not player.get("id"):
+                continue
+            if player.get("name"):
+                self.player_aliases[fold(player["name"])] = player["id"]
+            if player.get("firstname") and player.get("lastname"):
+                self.player_aliases[fold(f"{player['firstname']} {player['lastname']}")] = player["id"]
+
+    async def resolve_player_id(self, name: str) -> Optional[int]:
+        """Oyuncu ID'sini çöz; tabloda yoksa bir kez arayıp öğren"""
+        player_id = self.player_id(name)
+        if player_id or self._recently_missed(f"player:{fold(name)}"):
+            return player_id
+
+        async with self._lock:
+            player_id = self.player_id(name)
+            if player_id:
+                return player_id
+
+            self._upstream_lookups += 1
+            data = await search_player(name)
+            if data.get("response"):
+                self.learn_players(data["response"])
+                self.player_aliases.setdefault(fold(name), data["response"][0]["player"]["id"])
+            elif "error" not in data:
+                self.misses[f"player:{fold(name)}"] = time.time()
+            await self.save()
+            return self.player_id(name)
+
+    # ---- Toplu kurulum ----
+
+    async def build(
+        self,
+        league_map: Dict[int, Optional[str]],
+        fbref_teams: Callable[[str], List[str]],
+        season: int = 2024
+    ) -> Dict[str, int]:
+        """
+        Lig takım listelerinden tabloyu toplu kur
+
+        Args:
+            league_map: API-Football lig ID -> soccerdata lig adı (FBref'te yoksa None)
+            fbref_teams: soccerdata lig adından FBref takım isimlerini veren fonksiyon
+            season: API-Football sezonu
+
+        Returns:
+            Öğrenilen takım ve eşlenen FBref isim sayıları
+        """
+        learned = linked = 0
+        for league_id, fbref_league in league_map.items():
+            data = await get_league_teams(league_id, season)
+            if "error" in data:
+                logger.warning("Lig takımları alınamadı (%s): %s", league_id, data["error"])
+                continue
+            self.learn_teams(data.get("response", []), league_id)
+            learned += len(data.get("response", []))
+            if fbref_league:
+                linked += self.link_fbref_teams(league_id, fbref_teams(fbref_league))
+
+        await self.save()
+        return {"teams": learned, "linked": linked}
+
+    def stats(self) -> Dict[str, int]:
+        """Tablo büyüklüğü ve upstream arama sayısı"""
+        return {
+            "teams": len(self.teams),
+            "team_aliases": len(self.team_aliases),
+            "player_aliases": len(self.player_aliases),
+            "misses": len(self.misses),
+            "upstream_lookups": self._upstream_lookups,
+        }
+
+
+id_map = IdMap()
@@ -0,0 +1,62 @@
+"""
+Fikstürden Puan Durumu
+
+soccerdata'nın FBref okuyucusunda lig tablosu yoktur (`read_league_table`
+bulunmaz). Puan durumu sezon fikstüründeki (`read_schedule`) oynanmış
+maç skorlarından hesaplanır: galibiyet 3, beraberlik 1 puan. Puan
+silme cezaları fikstürde görünmediğinden tabloya yansımaz.
+"""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from h2h_index import match_scores
+
+# Sütun sırası (FBref lig tablosuyla aynı isimler)
+COLUMNS = ["Rk", "MP", "W", "D", "L", "GF", "GA", "GD", "Pts"]
+
+
+def build_league_table(schedule: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fikstürden (lig, sezon, takım) indeksli puan durumu
+
+    Sıralama puan, averaj, atılan gol ve takım adına göredir; henüz maçı
+    oynanmamış takımlar 0 maçla yer alır.
+    """
+    matches = schedule.reset_index()
+    home_goals, away_goals = match_scores(matches)
+    groups: List[str] = [name for name in ("league", "season") if name in matches.columns]
+
+    sides = []
+    for team_column, scored, conceded in (
+        ("home_team", home_goals, away_goals),
+        ("away_team", away_goals, home_goals),
+    ):
+        side = matches[groups].copy()
+        side["team"] = matches[team_column].to_numpy()
+        side["GF"] = scored
+        side["GA"] = conceded
+        sides.append(side)
+    rows = pd.concat(sides, ignore_index=True).dropna(subset=["team"])
+
+    played = rows["GF"].notna() & rows["GA"].notna()
+    rows["MP"] = played.astype(int)
+    rows["W"] = (played & (rows["GF"] > rows["GA"])).astype(int)
+    rows["D"] = (played & (rows["GF"] == rows["GA"])).astype(int)
+    rows["L"] = (played & (rows["GF"] < rows["GA"])).astype(int)
+    rows[["GF", "GA"]] = rows[["GF", "GA"]].fillna(0)
+
+    keys = [*groups, "team"]
+    table = rows.groupby(keys, sort=False)[["MP", "W", "D", "L", "GF", "GA"]].sum().astype(int)
+    table["GD"] = table["GF"] - table["GA"]
+    table["Pts"] = 3 * table["W"] + table["D"]
+
+    table = table.reset_index().sort_values(
+        [*groups, "Pts", "GD", "GF", "team"],
+        ascending=[True] * len(groups) + [False, False, False, True],
+        kind="stable",
+    )
+    table["Rk"] = table.groupby(groups).cumcount() + 1 if groups else np.arange(1, len(table) + 1)
+    return table.set_index(keys)[COLUMNS]
@@ -0,0 +1,248 @@
+"""
+Canlı Maç Durum Deposu
+
+Her canlı maçın özeti (skor, dakika, durum) ve görülen olayları tutulur.
+Her yoklamada önceki durumla karşılaştırılıp değişiklikler artan bir
+sürüm numarasıyla kayda geçer. İstemci `/live/matches?since=<sürüm>` ile
+yalnızca o sürümden sonraki değişiklikleri alır; yanıt boyutu maç
+sayısıyla değil değişiklik sayısıyla orantılıdır.
+
+Skor veya durum değiştiğinde canlı yanıtta olay listesi yoksa
+`get_fixture_events` ile yeni olaylar çekilir.
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from api_football import get_fixture_events, get_live_matches
+from apif_quota import Priority
+
+load_dotenv()
+
+# Saklanan en fazla değişiklik kaydı; daha eski sürüm soranlara tam liste döner
+LIVE_CHANGE_LOG_SIZE = int(os.getenv("LIVE_CHANGE_LOG_SIZE", "2000"))
+
+EventKey = Tuple[Any, ...]
+
+
+def _summary(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Canlı yanıttaki maçın karşılaştırılan özeti (kadro/olay hariç)"""
+    fixture = item.get("fixture") or {}
+    status = fixture.get("status") or {}
+    teams = item.get("teams") or {}
+    league = item.get("league") or {}
+    return {
+        "fixture_id": fixture.get("id"),
+        "league": league.get("id"),
+        "home": (teams.get("home") or {}).get("name"),
+        "away": (teams.get("away") or {}).get("name"),
+        "score": dict(item.get("goals") or {}),
+        "minute": status.get("elapsed"),
+        "status": status.get("short"),
+    }
+
+
+def _event_key(event: Dict[str, Any]) -> EventKey:
+    time_info = event.get("time") or {}
+    return (
+        time_info.get("elapsed"),
+        time_info.get("extra"),
+        (event.get("team") or {}).get("id"),
+        (event.get("player") or {}).get("id"),
+        event.get("type"),
+        event.get("detail"),
+    )
+
+
+class FixtureState:
+    """Tek bir canlı maçın son bilinen durumu"""
+
+    def __init__(self, summary: Dict[str, Any], version: int):
+        self.summary = summary
+        self.version = version
+        self.seen_events: Set[EventKey] = set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.summary, "version": self.version}
+
+
+class LiveStateStore:
+    """Sürümlü canlı maç durumu ve değişiklik günlüğü"""
+
+    def __init__(self, log_size: int = LIVE_CHANGE_LOG_SIZE):
+        self.version = 0
+        self.fixtures: Dict[int, FixtureState] = {}
+        self._log: Deque[Dict[str, Any]] = deque(maxlen=log_size)
+        self._lock = asyncio.Lock()
+        self._last_applied: Dict[Optional[int], Dict[str, Any]] = {}
+        self._applies = 0
+        self._event_fetches = 0
+
+    def _record(self, change: Dict[str, Any]) -> int:
+        self.version += 1
+        change["version"] = self.version
+        self._log.append(change)
+        return self.version
+
+    def _needs_events(self, item: Dict[str, Any]) -> Optional[int]:
+        """Skor/durumu değişmiş ve canlı yanıtta olayları olmayan maçın ID'si"""
+        if item.get("events") is not None:
+            return None
+        summary = _summary(item)
+        state = self.fixtures.get(summary["fixture_id"])
+        if state is None:
+            return None
+        if summary["score"] == state.summary["score"] and summary["status"] == state.summary["status"]:
+            return None
+        return summary["fixture_id"]
+
+    async def _fetch_events(self, fixture_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Maçların olaylarını eşzamanlı çek (başarısız olanlar atlanır)"""
+        self._event_fetches += len(fixture_ids)
+        responses = await asyncio.gather(*[get_fixture_events(fixture_id) for fixture_id in fixture_ids])
+        return {
+            fixture_id: data.get("response") or []
+            for fixture_id, data in zip(fixture_ids, responses)
+            if "error" not in data and not data.get("errors")
+        }
+
+    @staticmethod
+    def _new_events(state: FixtureState, events: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        new = []
+        for event in events or []:
+            key = _event_key(event)
+            if key not in state.seen_events:
+                state.seen_events.add(key)
+                new.append(event)
+        return new
+
+    async def apply(self, league_id: Optional[int], data: Dict[str, Any]):
+        """
+        Canlı maç yanıtını depoya işle
+
+        Eksik olaylar kilit alınmadan önce çekilir; kilit içinde upstream'e
+        gidilmez.
+
+        Args:
+            league_id: Yanıtın kapsadığı lig (None ise tüm ligler); bu
+                kapsamda yanıtta olmayan maçlar bitmiş sayılır
+            data: get_live_matches yanıtı
+        """
+        # Hatalı yanıtın boş listesi maçları "bitmiş" gösterir; işlenmez
+        if "error" in data or data.get("errors"):
+            return
+        # Cache'ten gelen aynı yanıt tekrar işlenmez
+        if self._last_applied.get(league_id) is data:
+            return
+
+        items = data.get("response") or []
+        fetched = await self._fetch_events([
+            fixture_id for fixture_id in map(self._needs_events, items) if fixture_id is not None
+        ])
+
+        async with self._lock:
+            if self._last_applied.get(league_id) is data:
+                return
+            self._last_applied[league_id] = data
+            self._applies += 1
+
+            present = set()
+            for item in items:
+                summary = _summary(item)
+                fixture_id = summary["fixture_id"]
+                if fixture_id is None:
+                    continue
+                present.add(fixture_id)
+                state = self.fixtures.get(fixture_id)
+                events = item.get("events")
+
+                if state is None:
+                    state = FixtureState(summary, 0)
+                    self.fixtures[fixture_id] = state
+                    state.version = self._record({
+                        "type": "added", "fixture_id": fixture_id, "league": summary["league"],
+                        "match": summary, "new_events": self._new_events(state, events),
+                    })
+                    continue
+
+                changes = {
+                    field: summary[field]
+                    for field in ("score", "minute", "status")
+                    if summary[field] != state.summary[field]
+                }
+                if not changes:
+                    continue
+                if events is None and ("score" in changes or "status" in changes):
+                    events = fetched.get(fixture_id)
+                state.summary = summary
+                state.version = self._record({
+                    "type": "updated", "fixture_id": fixture_id, "league": summary["league"],
+                    "changes": changes, "new_events": self._new_events(state, events),
+                })
+
+            for fixture_id, state in list(self.fixtures.items()):
+                in_scope = league_id is None or state.summary["league"] == league_id
+                if in_scope and fixture_id not in present:
+                    del self.fixtures[fixture_id]
+                    self._record({
+                        "type": "removed", "fixture_id": fixture_id, "league": state.summary["league"],
+                        "last": state.summary,
+                    })
+
+    async def refresh(
+        self,
+        league_id: Optional[int] = None,
+        refresh: bool = False,
+        priority: Optional[Priority] = None
+    ) -> Dict[str, Any]:
+        """Canlı maçları çek (cache üzerinden) ve depoya işle"""
+        data = await get_live_matches(league_id, refresh=refresh, priority=priority)
+        await self.apply(league_id, data)
+        return data
+
+    def since(self, version: int, league_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Verilen sürümden sonraki değişiklikler
+
+        Returns:
+            version, changes ve reset. Sürüm günlükte artık yoksa (veya
+            gelecekteyse) reset=True ile güncel maç listesi döner.
+        """
+        oldest = self._log[0]["version"] if self._log else self.version + 1
+        if version > self.version or version < oldest - 1:
+            return {
+                "version": self.version,
+                "since": version,
+                "reset": True,
+                "matches": self.snapshot(league_id),
+                "changes": [],
+            }
+        changes = [
+            change for change in self._log
+            if change["version"] > version and (league_id is None or change["league"] == league_id)
+        ]
+        return {"version": self.version, "since": version, "reset": False, "changes": changes}
+
+    def snapshot(self, league_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Depodaki maçların güncel özetleri"""
+        return [
+            state.to_dict() for state in self.fixtures.values()
+            if league_id is None or state.summary["league"] == league_id
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "fixtures": len(self.fixtures),
+            "log_size": len(self._log),
+            "oldest_version": self._log[0]["version"] if self._log else None,
+            "applies": self._applies,
+            "event_fetches": self._event_fetches,
+        }
+
+
+live_state = LiveStateStore()
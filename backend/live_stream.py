@@ -0,0 +1,219 @@
+"""
+Canlı Skor Yayını (Server-Sent Events)
+
+Her lig için tek bir arka plan poller'ı API-Football'dan canlı maçları
+sabit aralıklarla çeker ve değişen sonucu bağlı tüm istemcilere
+süreç içi kuyruklar üzerinden iletir. Upstream çağrı sayısı izleyici
+sayısından bağımsızdır: lig başına aralık başına en fazla bir istek.
+
+Yoklama cache üzerinden ve normal öncelikle yapılır; canlı kayıt
+bayatsa arka planda tek bir yenileme başlar ve sonucu bir sonraki
+yoklamada yayınlanır. Günlük kota düşük öncelik rezervine inince
+yoklama seyrekleşir, normal öncelik rezervine inince durur (abonelere
+son durum ve heartbeat gitmeye devam eder).
+
+Poller ilk abone geldiğinde başlar, son abone ayrıldıktan sonra durur.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+from dotenv import load_dotenv
+
+from apif_quota import Priority, quota
+from apif_ttl import APIF_LIVE_TTL
+from live_state import live_state
+from serialization import encode
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Upstream yoklama aralığı (saniye)
+LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", str(APIF_LIVE_TTL)))
+
+# Günlük kota düşük öncelik rezervine indiğinde yoklama aralığı (saniye)
+LIVE_RESERVE_POLL_INTERVAL = float(os.getenv("LIVE_RESERVE_POLL_INTERVAL", "300"))
+
+# Değişiklik olmadığında bağlantıyı canlı tutan yorum satırı aralığı (saniye)
+LIVE_HEARTBEAT_INTERVAL = float(os.getenv("LIVE_HEARTBEAT_INTERVAL", "20"))
+
+# Abone başına bekleyen olay sayısı (dolarsa en eski olay atılır)
+LIVE_SUBSCRIBER_QUEUE = int(os.getenv("LIVE_SUBSCRIBER_QUEUE", "8"))
+
+# Tarayıcının bağlantı koptuğunda yeniden bağlanma gecikmesi (ms)
+LIVE_RETRY_MS = int(os.getenv("LIVE_RETRY_MS", "5000"))
+
+
+def format_event(event: str, data: bytes, event_id: Optional[str] = None) -> bytes:
+    """SSE olay çerçevesi (data tek satır JSON)"""
+    head = f"event: {event}\n"
+    if event_id:
+        head += f"id: {event_id}\n"
+    return head.encode() + b"data: " + data + b"\n\n"
+
+
+class LeaguePoller:
+    """Tek bir lig (veya tüm ligler) için canlı maç yoklayıcısı ve abone listesi"""
+
+    def __init__(self, league_id: Optional[int], interval: float = LIVE_POLL_INTERVAL):
+        self.league_id = league_id
+        self.interval = interval
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.last_event: Optional[bytes] = None
+        self.last_version: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._polls = 0
+        self._skipped = 0
+        self._errors = 0
+        self._broadcasts = 0
+        self._dropped = 0
+        self._last_poll: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if not self.running:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def current_interval(self) -> float:
+        """Kota rezervine göre şu anki yoklama aralığı"""
+        if quota.in_reserve(Priority.LOW):
+            return max(self.interval, LIVE_RESERVE_POLL_INTERVAL)
+        return self.interval
+
+    async def _run(self):
+        while self.subscribers:
+            started = time.monotonic()
+            await self.poll()
+            await asyncio.sleep(max(0.0, self.current_interval() - (time.monotonic() - started)))
+
+    async def poll(self):
+        """Upstream'i bir kez yokla; sonuç değiştiyse abonelere yayınla"""
+        if quota.in_reserve(Priority.NORMAL):
+            # Kalan kota kullanıcı isteklerine bırakılır
+            self._skipped += 1
+            return
+
+        self._polls += 1
+        self._last_poll = time.time()
+        try:
+            # /live/matches ve durum deposuyla aynı cache kaydını kullanır
+            data = await live_state.refresh(self.league_id, priority=Priority.NORMAL)
+        except Exception as e:
+            data = {"error": str(e)}
+
+        if "error" in data:
+            self._errors += 1
+            self.publish(format_event("error", encode({"detail": data["error"]}).body))
+            return
+
+        body = encode({
+            "league": self.league_id,
+            "matches": data.get("response", []),
+            "count": data.get("results", 0),
+            "timestamp": datetime.now().isoformat(),
+        })
+        if body.version == self.last_version:
+            return
+        self.last_version = body.version
+        self.last_event = format_event("matches", body.body, body.version)
+        self._broadcasts += 1
+        self.publish(self.last_event)
+
+    def publish(self, event: bytes):
+        """Olayı tüm abonelerin kuyruğuna koy (dolu kuyrukta en eskiyi at)"""
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self._dropped += 1
+            queue.put_nowait(event)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "subscribers": len(self.subscribers),
+            "interval": self.current_interval(),
+            "polls": self._polls,
+            "skipped": self._skipped,
+            "errors": self._errors,
+            "broadcasts": self._broadcasts,
+            "dropped_events": self._dropped,
+            "last_poll": datetime.fromtimestamp(self._last_poll).isoformat() if self._last_poll else None,
+            "version": self.last_version,
+        }
+
+
+class LiveHub:
+    """Lig başına poller'ları yönetir ve abonelikleri dağıtır"""
+
+    def __init__(self):
+        self._pollers: Dict[Optional[int], LeaguePoller] = {}
+
+    def _poller(self, league_id: Optional[int]) -> LeaguePoller:
+        if league_id not in self._pollers:
+            self._pollers[league_id] = LeaguePoller(league_id)
+        return self._pollers[league_id]
+
+    async def subscribe(
+        self,
+        league_id: Optional[int],
+        last_event_id: Optional[str] = None,
+        heartbeat: float = LIVE_HEARTBEAT_INTERVAL
+    ) -> AsyncIterator[bytes]:
+        """
+        Ligin canlı maç olaylarını SSE çerçeveleri olarak üret
+
+        Args:
+            league_id: API-Football lig ID'si (None ise tüm canlı maçlar)
+            last_event_id: İstemcinin son aldığı sürüm; aynıysa son durum
+                tekrar gönderilmez
+            heartbeat: Olay yokken yorum satırı gönderme aralığı
+        """
+        poller = self._poller(league_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=LIVE_SUBSCRIBER_QUEUE)
+        poller.subscribers.add(queue)
+        poller.start()
+        try:
+            yield f"retry: {LIVE_RETRY_MS}\n\n".encode()
+            if poller.last_event is not None and poller.last_version != last_event_id:
+                yield poller.last_event
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+        finally:
+            poller.subscribers.discard(queue)
+
+    async def shutdown(self):
+        """Tüm poller'ları durdur (lifespan kapanışında)"""
+        await asyncio.gather(*[poller.stop() for poller in self._pollers.values()])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "poll_interval": LIVE_POLL_INTERVAL,
+            "subscribers": sum(len(poller.subscribers) for poller in self._pollers.values()),
+            "leagues": {
+                str(league_id if league_id is not None else "all"): poller.stats()
+                for league_id, poller in self._pollers.items()
+            },
+        }
+
+
+live_hub = LiveHub()
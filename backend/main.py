@@ -3,14 +3,15 @@ Futbol AI Asistan - Python Backend
 soccerdata entegrasyonu ile futbol verileri API'si
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
-import soccerdata as sd
+from typing import Optional, List, Dict, Awaitable, Callable
+from contextlib import asynccontextmanager
+import asyncio
 import pandas as pd
-from datetime import datetime, timedelta
-from cachetools import TTLCache
+from datetime import datetime
 import os
 from dotenv import load_dotenv
 
@@ -25,28 +26,74 @@ from ai_assistant import (
 
 # API-Football modülü
 from api_football import (
-    get_live_matches,
     get_standings as apif_get_standings,
     get_fixtures as apif_get_fixtures,
     get_head_to_head as apif_get_h2h,
     get_team_statistics,
+    get_player_statistics,
     get_top_scorers as apif_get_scorers,
     get_top_assists,
     get_today_matches,
     get_team_next_match,
     get_team_last_matches,
-    get_fixture_statistics,
-    get_fixture_lineups,
-    get_fixture_events,
     get_predictions,
     search_team,
     search_player,
     LEAGUE_IDS,
-    TURKISH_TEAMS,
+    API_FOOTBALL_KEY,
     get_league_id,
-    get_team_id,
+    utc_today,
 )
 
+# Stale-while-revalidate cache
+from cache import cache_registry, record_version, CacheStatusMiddleware, CACHE_HEADERS
+
+# DataFrame -> JSON bayt dönüşümü
+from serialization import encode, EncodedBody, flatten_columns, frame_records, JSONBytesResponse
+
+# Liste endpoint'lerinde alan seçimi ve sayfalama
+from frame_query import FrameQuery, apply_query, page_info, parse_query
+
+# FBref iş havuzu ve DataFrame deposu
+from fbref_pool import fbref_pool, FBrefBusyError
+from fbref_store import frame_store, CURRENT_SEASON
+
+# Oyuncu/takım isim indeksi ve API-Football ID eşlemesi
+from name_index import name_index
+from id_map import id_map, ID_MAP_BUILD_DELAY
+
+# Takım çifti bazlı head-to-head indeksi
+from h2h_index import h2h_index
+
+# API-Football cache süre tablosu, kota zamanlayıcısı ve sorgu ölçümleri
+from apif_ttl import ttl_policy
+from apif_quota import quota
+from apif_keys import request_metrics
+from apif_store import response_store
+
+# Paylaşılan HTTP istemcileri (API-Football, Grok) ve upstream devre kesicileri
+from http_clients import http_clients
+from resilience import CircuitOpenError, breakers
+
+# Maç merkezi paketi (/match)
+from match_bundle import get_match_bundle, get_match_bundles
+
+# Sürümlü canlı maç durumu ve canlı skor yayını (lig başına tek poller)
+from live_state import live_state
+from live_stream import live_hub
+
+# Sezon fikstür indeksi (takım/tarih/hafta/durum sorguları kotasız cevaplanır)
+from fixture_index import (
+    fixture_index,
+    FIXTURE_INDEX_ENABLED,
+    FIXTURE_SYNC_INTERVAL,
+    FIXTURE_SYNC_DELAY,
+    FIXTURE_UPDATE_INTERVAL,
+)
+
+# Arka plan ön ısıtma
+from scheduler import PrewarmScheduler, SCHEDULER_ENABLED
+
 load_dotenv()
 
 
@@ -75,10 +122,25 @@ class MatchPredictionRequest(BaseModel):
     away_team: str
     league: str = "super_lig"
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Uygulama açılış/kapanış işlemleri"""
+    http_clients.start()
+    if SCHEDULER_ENABLED:
+        prewarm.start()
+    yield
+    prewarm.shutdown()
+    await live_hub.shutdown()
+    await http_clients.aclose()
+    response_store.close()
+    fbref_pool.shutdown()
+
+
 app = FastAPI(
     title="Futbol AI Asistan API",
     description="Süper Lig, Şampiyonlar Ligi ve Avrupa Ligi verileri",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS ayarları
@@ -88,10 +150,58 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=CACHE_HEADERS,
 )
 
-# Cache (1 saat TTL)
-cache = TTLCache(maxsize=100, ttl=3600)
+# Cache (1 saat sonra bayat, 6 saat sonra geçersiz)
+CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))
+CACHE_HARD_TTL = int(os.getenv("CACHE_HARD_TTL", "21600"))
+
+# Tarayıcı/CDN cache süreleri (saniye)
+HTTP_MAX_AGE_FBREF = int(os.getenv("HTTP_MAX_AGE_FBREF", "300"))
+HTTP_MAX_AGE_LIVE = int(os.getenv("HTTP_MAX_AGE_LIVE", "60"))
+HTTP_MAX_AGE_LIVE_MATCHES = int(os.getenv("HTTP_MAX_AGE_LIVE_MATCHES", "15"))
+HTTP_MAX_AGE_STATIC = int(os.getenv("HTTP_MAX_AGE_STATIC", "86400"))
+
+# /match?ids= ile tek istekte istenebilecek en fazla maç
+MATCH_BATCH_MAX_IDS = int(os.getenv("MATCH_BATCH_MAX_IDS", "100"))
+
+# Endpoint ailesi (yol öneki) -> Cache-Control (ilk eşleşen uygulanır)
+CACHE_CONTROL = [
+    ("/live/matches", f"public, max-age={HTTP_MAX_AGE_LIVE_MATCHES}"),
+    ("/live/stream", "no-store"),
+    ("/match", f"public, max-age={HTTP_MAX_AGE_LIVE_MATCHES}"),
+    ("/live/", f"public, max-age={HTTP_MAX_AGE_LIVE}, stale-while-revalidate={HTTP_MAX_AGE_LIVE}"),
+    ("/leagues", f"public, max-age={HTTP_MAX_AGE_STATIC}"),
+    ("/health", "no-store"),
+    ("/scheduler", "no-store"),
+    ("/debug/", "no-store"),
+    ("/autocomplete", f"public, max-age={HTTP_MAX_AGE_FBREF}"),
+    ("/search/", f"public, max-age={HTTP_MAX_AGE_FBREF}"),
+    *[
+        (prefix, f"public, max-age={HTTP_MAX_AGE_FBREF}, stale-while-revalidate={CACHE_TTL}")
+        for prefix in ("/standings/", "/fixtures/", "/team/", "/player/", "/head-to-head", "/top-scorers/")
+    ],
+]
+
+# Yanıtlara X-Cache / Age, ETag / Last-Modified ve Cache-Control başlıklarını ekle
+app.add_middleware(CacheStatusMiddleware, cache_control=CACHE_CONTROL)
+
+# Endpoint ailesi -> cache alanı (soft TTL, hard TTL, bellek bütçesi payı)
+# Anlık oyuncu aramaları puan durumlarını veya fikstürleri cache'ten atamaz
+CACHE_NAMESPACES = {
+    "standings": (CACHE_TTL, CACHE_HARD_TTL, 0.05),
+    "fixtures": (CACHE_TTL, CACHE_HARD_TTL, 0.15),
+    "team": (CACHE_TTL, CACHE_HARD_TTL, 0.1),
+    "players": (CACHE_TTL, CACHE_HARD_TTL, 0.15),
+    "player": (CACHE_TTL, 2 * CACHE_TTL, 0.1),
+    "h2h": (6 * CACHE_TTL, 4 * CACHE_HARD_TTL, 0.1),
+    "scorers": (CACHE_TTL, CACHE_HARD_TTL, 0.05),
+}
+caches = {
+    name: cache_registry.namespace(name, soft_ttl, hard_ttl, share)
+    for name, (soft_ttl, hard_ttl, share) in CACHE_NAMESPACES.items()
+}
 
 # Desteklenen ligler
 LEAGUES = {
@@ -105,15 +215,123 @@ LEAGUES = {
     "europa_league": "INT-Europa League",
 }
 
-# Mevcut sezon
-CURRENT_SEASON = "2425"
+# soccerdata lig adı -> lig id
+LEAGUE_KEYS = {name: key for key, name in LEAGUES.items()}
+
+# Depoya giren her tablodaki takım/oyuncu isimleri indekslenir
+frame_store.add_listener(lambda key, frame: name_index.index_frame(key, key.league, frame))
+
+
+def _index_schedule(key, frame: pd.DataFrame):
+    if key.table == "schedule":
+        h2h_index.index_schedule(key.league, key.season, frame)
+
+
+# Fikstür tabloları her yenilendiğinde head-to-head indeksi yeniden kurulur
+frame_store.add_listener(_index_schedule)
+
+
+async def build_id_map():
+    """FBref takım isimlerini API-Football ID'leriyle toplu eşle"""
+    league_map = {league_id: LEAGUES.get(key) for key, league_id in LEAGUE_IDS.items()}
+    result = await id_map.build(league_map, name_index.teams)
+    return f"{result['teams']} takım, {result['linked']} FBref ismi"
 
 
-def get_fbref_scraper(leagues: List[str], seasons: List[str] = None):
-    """FBref scraper oluştur"""
-    if seasons is None:
-        seasons = [CURRENT_SEASON]
-    return sd.FBref(leagues=leagues, seasons=seasons)
+# Geçmiş sezonlar (head-to-head ve tahminlerde kullanılır, tabloları değişmez)
+HISTORY_SEASONS = os.getenv("FBREF_HISTORY_SEASONS", "2324,2223").split(",")
+H2H_SEASONS = [CURRENT_SEASON] + HISTORY_SEASONS
+
+# Tablo ve API-Football verilerini arka planda yenileyen zamanlayıcı
+prewarm = PrewarmScheduler(frame_store, LEAGUES, CURRENT_SEASON)
+
+# ID eşleme tablosu FBref tabloları ısındıktan sonra kurulur, günlük yenilenir
+if API_FOOTBALL_KEY:
+    prewarm.add_task("idmap:teams", build_id_map, interval=86400, delay=ID_MAP_BUILD_DELAY)
+
+# Sezon fikstürü günlük senkronlanır, oynanan maçlar artımlı güncellenir
+if API_FOOTBALL_KEY and FIXTURE_INDEX_ENABLED:
+    prewarm.add_task("fixtures:sync", fixture_index.sync_all, interval=FIXTURE_SYNC_INTERVAL, delay=FIXTURE_SYNC_DELAY)
+    prewarm.add_task("fixtures:update", fixture_index.update, interval=FIXTURE_UPDATE_INTERVAL, delay=FIXTURE_SYNC_DELAY + FIXTURE_UPDATE_INTERVAL)
+
+
+async def read_frame(
+    leagues: List[str],
+    seasons: List[str],
+    table: str,
+    stat_type: Optional[str] = None
+) -> pd.DataFrame:
+    """Ham FBref tablosunu ortak depodan getir (scrape iş havuzunda çalışır)"""
+    try:
+        return await frame_store.get_many(leagues, seasons, table, stat_type)
+    except FBrefBusyError:
+        raise HTTPException(status_code=503, detail="FBref iş kuyruğu dolu, lütfen tekrar deneyin")
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(int(e.retry_after) + 1)})
+
+
+def filter_by_name(frame: pd.DataFrame, level: str, query: str) -> pd.DataFrame:
+    """Tabloyu isim indeksinde eşleşen takım/oyuncu satırlarına indir (aksan duyarsız)"""
+    names = name_index.names(query, level)
+    values = frame.index.get_level_values(level) if level in frame.index.names else frame[level]
+    return frame[values.isin(names)]
+
+
+def find_head_to_head(team1: str, team2: str, league: str, seasons: List[str]) -> Optional[Dict]:
+    """İsimleri indeksten çözüp head-to-head indeksinden maçları ve özeti getir"""
+    team1_name = name_index.best(team1, "team", league)
+    team2_name = name_index.best(team2, "team", league)
+    if not team1_name or not team2_name:
+        return None
+
+    h2h = h2h_index.lookup(team1_name, team2_name, league, seasons)
+    if h2h is None:
+        return None
+    return {"team1_name": team1_name, "team2_name": team2_name, **h2h}
+
+
+def list_query(
+    fields: Optional[str] = Query(default=None, description="Virgülle ayrılmış alanlar (örn. team,MP,Pts)"),
+    sort: Optional[str] = Query(default=None, description="Sıralama alanları, azalan için '-' (örn. -Pts,team)"),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="Önceki yanıttaki next_cursor"),
+) -> FrameQuery:
+    """Liste endpoint'leri için ortak alan seçimi/sayfalama parametreleri"""
+    try:
+        return parse_query(fields, sort, limit, offset, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+class QueryError(HTTPException):
+    """Geçersiz liste sorgusu (400)"""
+
+    # İstemci hatası: cache'te upstream hatası olarak tutulmaz
+    negative_cacheable = False
+
+
+def query_frame(frame: pd.DataFrame, query: FrameQuery) -> pd.DataFrame:
+    """Sorguyu tabloya uygula (geçersiz sıralama alanında 400)"""
+    try:
+        return apply_query(frame, query)
+    except ValueError as e:
+        raise QueryError(status_code=400, detail=str(e))
+
+
+async def cached(namespace: str, cache_key: str, fetch: Callable[[], Awaitable[Dict]]) -> JSONBytesResponse:
+    """
+    Cache alanından getir; yoksa veriyi tek bir çağrıyla çek ve cache'le
+
+    Eşzamanlı miss'ler aynı çağrıyı bekler. Hatalar tüm bekleyenlere
+    iletilir ve cache'lenmez. Bayat kayıt hemen döner ve arka planda yenilenir.
+    Cache'te JSON baytları ve veri sürümü (ETag için) tutulur; fetch'in
+    döndürdüğü DataFrame'ler bir kez kodlanır.
+    """
+    async def fetch_encoded() -> EncodedBody:
+        return encode(await fetch())
+
+    return JSONBytesResponse(await caches[namespace].get_or_fetch(cache_key, fetch_encoded))
 
 
 @app.get("/")
@@ -128,7 +346,7 @@ async def root():
             "/standings/{league}",
             "/fixtures/{league}",
             "/team/{team_name}/stats",
-            "/match/{match_id}",
+            "/match/{fixture_id}",
             "/player/{player_name}/stats",
             "/head-to-head",
         ]
@@ -153,66 +371,55 @@ async def get_leagues():
 
 
 @app.get("/standings/{league}")
-async def get_standings(league: str, season: str = CURRENT_SEASON):
+async def get_standings(league: str, season: str = CURRENT_SEASON, query: FrameQuery = Depends(list_query)):
     """Lig puan durumunu getir"""
-    cache_key = f"standings_{league}_{season}"
-
-    if cache_key in cache:
-        return cache[cache_key]
+    cache_key = f"standings_{league}_{season}{query.cache_suffix()}"
 
     if league not in LEAGUES:
         raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
 
-    try:
-        fbref = get_fbref_scraper([LEAGUES[league]], [season])
-        standings = fbref.read_league_table()
-
-        # DataFrame'i JSON'a çevir
-        result = standings.reset_index().to_dict(orient="records")
+    async def fetch():
+        standings = await read_frame([LEAGUES[league]], [season], "league_table")
 
-        response = {
+        return {
             "league": league,
             "season": season,
-            "standings": result,
+            "standings": query_frame(standings, query),
+            **page_info(len(standings), query),
             "updated_at": datetime.now().isoformat()
         }
 
-        cache[cache_key] = response
-        return response
-
+    try:
+        return await cached("standings", cache_key, fetch)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/fixtures/{league}")
-async def get_fixtures(league: str, season: str = CURRENT_SEASON):
+async def get_fixtures(league: str, season: str = CURRENT_SEASON, query: FrameQuery = Depends(list_query)):
     """Lig fikstürünü getir"""
-    cache_key = f"fixtures_{league}_{season}"
-
-    if cache_key in cache:
-        return cache[cache_key]
+    cache_key = f"fixtures_{league}_{season}{query.cache_suffix()}"
 
     if league not in LEAGUES:
         raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
 
-    try:
-        fbref = get_fbref_scraper([LEAGUES[league]], [season])
-        schedule = fbref.read_schedule()
-
-        # DataFrame'i JSON'a çevir
-        schedule_reset = schedule.reset_index()
-        result = schedule_reset.to_dict(orient="records")
+    async def fetch():
+        schedule = await read_frame([LEAGUES[league]], [season], "schedule")
 
-        response = {
+        return {
             "league": league,
             "season": season,
-            "fixtures": result,
+            "fixtures": query_frame(schedule, query),
+            **page_info(len(schedule), query),
             "updated_at": datetime.now().isoformat()
         }
 
-        cache[cache_key] = response
-        return response
-
+    try:
+        return await cached("fixtures", cache_key, fetch)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -227,38 +434,30 @@ async def get_team_stats(
     """Takım istatistiklerini getir"""
     cache_key = f"team_{team_name}_{league}_{season}_{stat_type}"
 
-    if cache_key in cache:
-        return cache[cache_key]
-
     if league not in LEAGUES:
         raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
 
-    try:
-        fbref = get_fbref_scraper([LEAGUES[league]], [season])
-
+    async def fetch():
         # Takım sezon istatistikleri
-        team_stats = fbref.read_team_season_stats(stat_type=stat_type)
+        team_stats = await read_frame([LEAGUES[league]], [season], "team_season_stats", stat_type)
 
         # Belirli takımı filtrele
-        team_data = team_stats[team_stats.index.get_level_values('team').str.contains(team_name, case=False)]
+        team_data = filter_by_name(team_stats, "team", team_name)
 
         if team_data.empty:
             raise HTTPException(status_code=404, detail=f"Takım bulunamadı: {team_name}")
 
-        result = team_data.reset_index().to_dict(orient="records")
-
-        response = {
+        return {
             "team": team_name,
             "league": league,
             "season": season,
             "stat_type": stat_type,
-            "stats": result,
+            "stats": team_data,
             "updated_at": datetime.now().isoformat()
         }
 
-        cache[cache_key] = response
-        return response
-
+    try:
+        return await cached("team", cache_key, fetch)
     except HTTPException:
         raise
     except Exception as e:
@@ -269,42 +468,36 @@ async def get_team_stats(
 async def get_team_players(
     team_name: str,
     league: str = Query(default="super_lig"),
-    season: str = Query(default=CURRENT_SEASON)
+    season: str = Query(default=CURRENT_SEASON),
+    query: FrameQuery = Depends(list_query)
 ):
     """Takım kadrosunu ve oyuncu istatistiklerini getir"""
-    cache_key = f"players_{team_name}_{league}_{season}"
-
-    if cache_key in cache:
-        return cache[cache_key]
+    cache_key = f"players_{team_name}_{league}_{season}{query.cache_suffix()}"
 
     if league not in LEAGUES:
         raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
 
-    try:
-        fbref = get_fbref_scraper([LEAGUES[league]], [season])
-
+    async def fetch():
         # Oyuncu istatistikleri
-        player_stats = fbref.read_player_season_stats(stat_type="standard")
+        player_stats = await read_frame([LEAGUES[league]], [season], "player_season_stats", "standard")
 
         # Takıma göre filtrele
-        team_players = player_stats[
-            player_stats.index.get_level_values('team').str.contains(team_name, case=False)
-        ]
-
-        result = team_players.reset_index().to_dict(orient="records")
+        team_players = filter_by_name(player_stats, "team", team_name)
 
-        response = {
+        return {
             "team": team_name,
             "league": league,
             "season": season,
-            "players": result,
-            "player_count": len(result),
+            "players": query_frame(team_players, query),
+            "player_count": len(team_players),
+            **page_info(len(team_players), query),
             "updated_at": datetime.now().isoformat()
         }
 
-        cache[cache_key] = response
-        return response
-
+    try:
+        return await cached("players", cache_key, fetch)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -318,36 +511,27 @@ async def get_player_stats(
     """Oyuncu istatistiklerini getir"""
     cache_key = f"player_{player_name}_{league}_{season}"
 
-    if cache_key in cache:
-        return cache[cache_key]
-
-    try:
+    async def fetch():
         leagues_to_search = [LEAGUES[league]] if league and league in LEAGUES else list(LEAGUES.values())[:5]
-        fbref = get_fbref_scraper(leagues_to_search, [season])
 
         # Oyuncu istatistikleri
-        player_stats = fbref.read_player_season_stats(stat_type="standard")
+        player_stats = await read_frame(leagues_to_search, [season], "player_season_stats", "standard")
 
         # Oyuncuyu bul
-        player_data = player_stats[
-            player_stats.index.get_level_values('player').str.contains(player_name, case=False)
-        ]
+        player_data = filter_by_name(player_stats, "player", player_name)
 
         if player_data.empty:
             raise HTTPException(status_code=404, detail=f"Oyuncu bulunamadı: {player_name}")
 
-        result = player_data.reset_index().to_dict(orient="records")
-
-        response = {
+        return {
             "player": player_name,
             "season": season,
-            "stats": result,
+            "stats": player_data,
             "updated_at": datetime.now().isoformat()
         }
 
-        cache[cache_key] = response
-        return response
-
+    try:
+        return await cached("player", cache_key, fetch)
     except HTTPException:
         raise
     except Exception as e:
@@ -359,74 +543,38 @@ async def get_head_to_head(
     team1: str = Query(..., description="Birinci takım"),
     team2: str = Query(..., description="İkinci takım"),
     league: str = Query(default="super_lig"),
-    seasons: str = Query(default="2425,2324,2223", description="Virgülle ayrılmış sezonlar")
+    seasons: str = Query(default=",".join(H2H_SEASONS), description="Virgülle ayrılmış sezonlar")
 ):
     """İki takım arasındaki geçmiş maçları getir"""
     cache_key = f"h2h_{team1}_{team2}_{league}_{seasons}"
 
-    if cache_key in cache:
-        return cache[cache_key]
-
     if league not in LEAGUES:
         raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
 
-    try:
+    async def fetch():
         season_list = seasons.split(",")
-        fbref = get_fbref_scraper([LEAGUES[league]], season_list)
-
-        # Tüm maçları al
-        schedule = fbref.read_schedule()
-        schedule_reset = schedule.reset_index()
-
-        # İki takım arasındaki maçları filtrele
-        h2h_matches = schedule_reset[
-            ((schedule_reset['home_team'].str.contains(team1, case=False)) &
-             (schedule_reset['away_team'].str.contains(team2, case=False))) |
-            ((schedule_reset['home_team'].str.contains(team2, case=False)) &
-             (schedule_reset['away_team'].str.contains(team1, case=False)))
-        ]
 
-        result = h2h_matches.to_dict(orient="records")
-
-        # İstatistik özeti
-        team1_wins = 0
-        team2_wins = 0
-        draws = 0
-
-        for match in result:
-            home_score = match.get('home_score', 0) or 0
-            away_score = match.get('away_score', 0) or 0
-            home_team = match.get('home_team', '')
-
-            if home_score > away_score:
-                if team1.lower() in home_team.lower():
-                    team1_wins += 1
-                else:
-                    team2_wins += 1
-            elif away_score > home_score:
-                if team1.lower() in home_team.lower():
-                    team2_wins += 1
-                else:
-                    team1_wins += 1
-            else:
-                draws += 1
-
-        response = {
+        # Fikstürler yüklenince çift indeksi de hazırdır
+        await read_frame([LEAGUES[league]], season_list, "schedule")
+
+        h2h = find_head_to_head(team1, team2, LEAGUES[league], season_list)
+        if h2h is None:
+            raise HTTPException(status_code=404, detail="Takımlardan biri bulunamadı")
+
+        return {
             "team1": team1,
             "team2": team2,
-            "matches": result,
-            "summary": {
-                "total_matches": len(result),
-                "team1_wins": team1_wins,
-                "team2_wins": team2_wins,
-                "draws": draws
-            },
+            "team1_name": h2h["team1_name"],
+            "team2_name": h2h["team2_name"],
+            "matches": h2h["matches"],
+            "summary": h2h["summary"],
             "updated_at": datetime.now().isoformat()
         }
 
-        cache[cache_key] = response
-        return response
-
+    try:
+        return await cached("h2h", cache_key, fetch)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -440,45 +588,68 @@ async def get_top_scorers(
     """Gol krallığı listesi"""
     cache_key = f"scorers_{league}_{season}"
 
-    if cache_key in cache:
-        return cache[cache_key]
-
     if league not in LEAGUES:
         raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
 
-    try:
-        fbref = get_fbref_scraper([LEAGUES[league]], [season])
-
+    async def fetch():
         # Oyuncu istatistikleri
-        player_stats = fbref.read_player_season_stats(stat_type="standard")
-        player_stats_reset = player_stats.reset_index()
+        player_stats = await read_frame([LEAGUES[league]], [season], "player_season_stats", "standard")
+        player_stats_reset = flatten_columns(player_stats.reset_index())
 
         # Gole göre sırala
-        if 'Gls' in player_stats_reset.columns:
+        if 'Performance_Gls' in player_stats_reset.columns:
+            top_scorers = player_stats_reset.nlargest(limit, 'Performance_Gls')
+        elif 'Gls' in player_stats_reset.columns:
             top_scorers = player_stats_reset.nlargest(limit, 'Gls')
         elif 'goals' in player_stats_reset.columns:
             top_scorers = player_stats_reset.nlargest(limit, 'goals')
         else:
             raise HTTPException(status_code=500, detail="Gol kolonu bulunamadı")
 
-        result = top_scorers.to_dict(orient="records")
-
-        response = {
+        return {
             "league": league,
             "season": season,
-            "top_scorers": result,
+            "top_scorers": top_scorers,
             "updated_at": datetime.now().isoformat()
         }
 
-        cache[cache_key] = response
-        return response
-
+    try:
+        return await cached("scorers", cache_key, fetch)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/autocomplete")
+async def autocomplete(
+    q: str = Query(..., min_length=1, description="Aranan isim veya parçası"),
+    type: Optional[str] = Query(default=None, description="player veya team"),
+    league: Optional[str] = Query(default=None),
+    limit: int = Query(default=10, ge=1, le=50)
+):
+    """Oyuncu ve takım isim önerileri (aksan duyarsız)"""
+    if league is not None and league not in LEAGUES:
+        raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
+
+    matches = name_index.search(q, kind=type, league=LEAGUES.get(league), limit=limit)
+
+    return {
+        "query": q,
+        "results": [
+            {
+                "type": entry.kind,
+                "name": entry.name,
+                "team": entry.team,
+                "league": LEAGUE_KEYS.get(entry.league, entry.league),
+                "api_football_id": id_map.team_id(entry.name) if entry.kind == "team" else id_map.player_id(entry.name),
+            }
+            for entry in matches
+        ],
+        "count": len(matches)
+    }
+
+
 # ============================================
 # AI ASİSTAN ENDPOİNT'LERİ
 # ============================================
@@ -507,17 +678,11 @@ async def ai_analyze_match(request: MatchAnalysisRequest):
         team_stats = None
         if request.include_stats:
             try:
-                fbref = get_fbref_scraper(list(LEAGUES.values())[:3], [CURRENT_SEASON])
-                stats = fbref.read_team_season_stats(stat_type="standard")
-                stats_reset = stats.reset_index()
+                stats = await read_frame(list(LEAGUES.values())[:3], [CURRENT_SEASON], "team_season_stats", "standard")
 
-                home_stats = stats_reset[
-                    stats_reset['team'].str.contains(request.home_team, case=False)
-                ].to_dict(orient="records")
+                home_stats = frame_records(filter_by_name(stats, "team", request.home_team))
 
-                away_stats = stats_reset[
-                    stats_reset['team'].str.contains(request.away_team, case=False)
-                ].to_dict(orient="records")
+                away_stats = frame_records(filter_by_name(stats, "team", request.away_team))
 
                 team_stats = {
                     "home": home_stats,
@@ -553,21 +718,15 @@ async def ai_compare_players(request: PlayerCompareRequest):
 
         try:
             leagues = [LEAGUES[request.league]] if request.league and request.league in LEAGUES else list(LEAGUES.values())[:3]
-            fbref = get_fbref_scraper(leagues, [CURRENT_SEASON])
-            stats = fbref.read_player_season_stats(stat_type="standard")
-            stats_reset = stats.reset_index()
+            stats = await read_frame(leagues, [CURRENT_SEASON], "player_season_stats", "standard")
 
-            p1_data = stats_reset[
-                stats_reset['player'].str.contains(request.player1, case=False)
-            ]
+            p1_data = filter_by_name(stats, "player", request.player1)
             if not p1_data.empty:
-                player1_stats = p1_data.to_dict(orient="records")
+                player1_stats = frame_records(p1_data)
 
-            p2_data = stats_reset[
-                stats_reset['player'].str.contains(request.player2, case=False)
-            ]
+            p2_data = filter_by_name(stats, "player", request.player2)
             if not p2_data.empty:
-                player2_stats = p2_data.to_dict(orient="records")
+                player2_stats = frame_records(p2_data)
         except:
             pass
 
@@ -618,19 +777,11 @@ async def ai_predict_match(request: MatchPredictionRequest):
         h2h_data = None
         try:
             if request.league in LEAGUES:
-                fbref = get_fbref_scraper([LEAGUES[request.league]], ["2425", "2324", "2223"])
-                schedule = fbref.read_schedule()
-                schedule_reset = schedule.reset_index()
-
-                h2h = schedule_reset[
-                    ((schedule_reset['home_team'].str.contains(request.home_team, case=False)) &
-                     (schedule_reset['away_team'].str.contains(request.away_team, case=False))) |
-                    ((schedule_reset['home_team'].str.contains(request.away_team, case=False)) &
-                     (schedule_reset['away_team'].str.contains(request.home_team, case=False)))
-                ]
-
-                if not h2h.empty:
-                    h2h_data = h2h.to_dict(orient="records")
+                await read_frame([LEAGUES[request.league]], H2H_SEASONS, "schedule")
+                h2h = find_head_to_head(request.home_team, request.away_team, LEAGUES[request.league], H2H_SEASONS)
+
+                if h2h is not None and not h2h["matches"].empty:
+                    h2h_data = frame_records(h2h["matches"])
         except:
             pass
 
@@ -656,18 +807,31 @@ async def ai_predict_match(request: MatchPredictionRequest):
 # ============================================
 
 @app.get("/live/matches")
-async def live_matches(league: Optional[str] = None):
-    """Canlı maçları getir"""
+async def live_matches(league: Optional[str] = None, since: Optional[int] = Query(None, ge=0)):
+    """
+    Canlı maçları getir
+
+    since verilirse tam liste yerine o durum sürümünden sonraki değişiklikler
+    (skor, dakika, durum, yeni olaylar) döner; yanıttaki version bir sonraki
+    isteğin since değeridir.
+    """
     try:
         league_id = get_league_id(league) if league else None
-        data = await get_live_matches(league_id)
+        data = await live_state.refresh(league_id)
 
         if "error" in data:
             raise HTTPException(status_code=500, detail=data["error"])
 
+        # Yanıt durum deposunun sürümüne de bağlı (ETag buna göre değişir)
+        record_version(f"live-state:{live_state.version}")
+
+        if since is not None:
+            return {**live_state.since(since, league_id), "timestamp": datetime.now().isoformat()}
+
         return {
             "matches": data.get("response", []),
             "count": data.get("results", 0),
+            "version": live_state.version,
             "timestamp": datetime.now().isoformat()
         }
     except HTTPException:
@@ -676,6 +840,25 @@ async def live_matches(league: Optional[str] = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/live/stream")
+async def live_stream(league: Optional[str] = None, last_event_id: Optional[str] = Header(None)):
+    """
+    Canlı maçları Server-Sent Events olarak yayınla
+
+    Lig başına tek bir poller API-Football'u yoklar; sonuç değiştiğinde
+    "matches" olayı tüm bağlı istemcilere gönderilir.
+    """
+    league_id = get_league_id(league) if league else None
+    if league and not league_id:
+        raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
+
+    return StreamingResponse(
+        live_hub.subscribe(league_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/live/standings/{league}")
 async def live_standings(league: str, season: int = 2024):
     """API-Football'dan canlı puan durumu"""
@@ -712,24 +895,35 @@ async def live_fixtures(
     league: str,
     season: int = 2024,
     next: Optional[int] = None,
-    last: Optional[int] = None
+    last: Optional[int] = None,
+    round: Optional[str] = None
 ):
-    """API-Football'dan fikstür"""
+    """API-Football'dan fikstür (senkronlanmış sezonlar yerel indeksten)"""
     try:
         league_id = get_league_id(league)
         if not league_id:
             raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
 
-        data = await apif_get_fixtures(league_id, season, next, last)
+        if fixture_index.covers(league_id, season):
+            fixtures = fixture_index.league_fixtures(league_id, season, next, last, round)
+            source = "index"
+        else:
+            data = await apif_get_fixtures(league_id, season, None if round else next, None if round else last)
 
-        if "error" in data:
-            raise HTTPException(status_code=500, detail=data["error"])
+            if "error" in data:
+                raise HTTPException(status_code=500, detail=data["error"])
+
+            fixtures = data.get("response", [])
+            if round:
+                fixtures = [item for item in fixtures if (item.get("league") or {}).get("round") == round]
+            source = "api"
 
         return {
             "league": league,
             "season": season,
-            "fixtures": data.get("response", []),
-            "count": data.get("results", 0),
+            "fixtures": fixtures,
+            "count": len(fixtures),
+            "source": source,
             "timestamp": datetime.now().isoformat()
         }
     except HTTPException:
@@ -740,18 +934,29 @@ async def live_fixtures(
 
 @app.get("/live/today")
 async def today_matches(league: Optional[str] = None):
-    """Bugünün maçlarını getir"""
+    """Bugünün (UTC) maçlarını getir (lig verilmezse tüm liglerin maçları upstream'den)"""
     try:
         league_id = get_league_id(league) if league else None
-        data = await get_today_matches(league_id)
+        today = utc_today()
 
-        if "error" in data:
-            raise HTTPException(status_code=500, detail=data["error"])
+        # İndeks yalnızca takip edilen ligleri tutar; tüm günün listesi için kullanılmaz
+        if league_id and fixture_index.covers(league_id):
+            matches = fixture_index.on_day(today, league_id)
+            source = "index"
+        else:
+            data = await get_today_matches(league_id)
+
+            if "error" in data:
+                raise HTTPException(status_code=500, detail=data["error"])
+
+            matches = data.get("response", [])
+            source = "api"
 
         return {
-            "matches": data.get("response", []),
-            "count": data.get("results", 0),
-            "date": datetime.now().strftime("%Y-%m-%d"),
+            "matches": matches,
+            "count": len(matches),
+            "date": today,
+            "source": source,
             "timestamp": datetime.now().isoformat()
         }
     except HTTPException:
@@ -764,16 +969,12 @@ async def today_matches(league: Optional[str] = None):
 async def live_team_stats(team_name: str, league: str = "super_lig", season: int = 2024):
     """Takım istatistiklerini getir (API-Football)"""
     try:
-        team_id = get_team_id(team_name)
         league_id = get_league_id(league)
 
+        # Takım ID'si eşleme tablosundan (yoksa bir kez aranıp öğrenilir)
+        team_id = await id_map.resolve_team_id(team_name)
         if not team_id:
-            # Takım bulunamadıysa arama yap
-            search_result = await search_team(team_name)
-            if search_result.get("response"):
-                team_id = search_result["response"][0]["team"]["id"]
-            else:
-                raise HTTPException(status_code=404, detail=f"Takım bulunamadı: {team_name}")
+            raise HTTPException(status_code=404, detail=f"Takım bulunamadı: {team_name}")
 
         if not league_id:
             raise HTTPException(status_code=404, detail=f"Lig bulunamadı: {league}")
@@ -796,27 +997,57 @@ async def live_team_stats(team_name: str, league: str = "super_lig", season: int
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/live/player/{player_name}/stats")
+async def live_player_stats(player_name: str, season: int = 2024):
+    """Oyuncu sezon istatistiklerini getir (API-Football)"""
+    try:
+        # Oyuncu ID'si eşleme tablosundan (yoksa bir kez aranıp öğrenilir)
+        player_id = await id_map.resolve_player_id(player_name)
+        if not player_id:
+            raise HTTPException(status_code=404, detail=f"Oyuncu bulunamadı: {player_name}")
+
+        data = await get_player_statistics(player_id=player_id, season=season)
+
+        if "error" in data:
+            raise HTTPException(status_code=500, detail=data["error"])
+
+        return {
+            "player": player_name,
+            "player_id": player_id,
+            "season": season,
+            "statistics": data.get("response", []),
+            "timestamp": datetime.now().isoformat()
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/live/team/{team_name}/next")
 async def team_next_match(team_name: str):
     """Takımın bir sonraki maçını getir"""
     try:
-        team_id = get_team_id(team_name)
-
+        team_id = await id_map.resolve_team_id(team_name)
         if not team_id:
-            search_result = await search_team(team_name)
-            if search_result.get("response"):
-                team_id = search_result["response"][0]["team"]["id"]
-            else:
-                raise HTTPException(status_code=404, detail=f"Takım bulunamadı: {team_name}")
+            raise HTTPException(status_code=404, detail=f"Takım bulunamadı: {team_name}")
 
-        data = await get_team_next_match(team_id)
+        if await fixture_index.answers_team(team_id):
+            upcoming = fixture_index.team_next(team_id, 1)
+            source = "index"
+        else:
+            data = await get_team_next_match(team_id)
 
-        if "error" in data:
-            raise HTTPException(status_code=500, detail=data["error"])
+            if "error" in data:
+                raise HTTPException(status_code=500, detail=data["error"])
+
+            upcoming = data.get("response", [])
+            source = "api"
 
         return {
             "team": team_name,
-            "next_match": data.get("response", [{}])[0] if data.get("response") else None,
+            "next_match": upcoming[0] if upcoming else None,
+            "source": source,
             "timestamp": datetime.now().isoformat()
         }
     except HTTPException:
@@ -829,24 +1060,27 @@ async def team_next_match(team_name: str):
 async def team_last_matches(team_name: str, count: int = 5):
     """Takımın son maçlarını getir"""
     try:
-        team_id = get_team_id(team_name)
-
+        team_id = await id_map.resolve_team_id(team_name)
         if not team_id:
-            search_result = await search_team(team_name)
-            if search_result.get("response"):
-                team_id = search_result["response"][0]["team"]["id"]
-            else:
-                raise HTTPException(status_code=404, detail=f"Takım bulunamadı: {team_name}")
+            raise HTTPException(status_code=404, detail=f"Takım bulunamadı: {team_name}")
 
-        data = await get_team_last_matches(team_id, count)
+        if await fixture_index.answers_team(team_id):
+            matches = fixture_index.team_last(team_id, count)
+            source = "index"
+        else:
+            data = await get_team_last_matches(team_id, count)
 
-        if "error" in data:
-            raise HTTPException(status_code=500, detail=data["error"])
+            if "error" in data:
+                raise HTTPException(status_code=500, detail=data["error"])
+
+            matches = data.get("response", [])
+            source = "api"
 
         return {
             "team": team_name,
-            "matches": data.get("response", []),
-            "count": len(data.get("response", [])),
+            "matches": matches,
+            "count": len(matches),
+            "source": source,
             "timestamp": datetime.now().isoformat()
         }
     except HTTPException:
@@ -863,18 +1097,8 @@ async def live_head_to_head(
 ):
     """İki takım arasındaki son maçlar (API-Football)"""
     try:
-        team1_id = get_team_id(team1)
-        team2_id = get_team_id(team2)
-
-        if not team1_id:
-            search_result = await search_team(team1)
-            if search_result.get("response"):
-                team1_id = search_result["response"][0]["team"]["id"]
-
-        if not team2_id:
-            search_result = await search_team(team2)
-            if search_result.get("response"):
-                team2_id = search_result["response"][0]["team"]["id"]
+        team1_id = await id_map.resolve_team_id(team1)
+        team2_id = await id_map.resolve_team_id(team2)
 
         if not team1_id or not team2_id:
             raise HTTPException(status_code=404, detail="Takımlardan biri bulunamadı")
@@ -967,6 +1191,46 @@ async def live_predictions(fixture_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/match/{fixture_id}")
+async def match_centre(fixture_id: int):
+    """
+    Maç merkezi: maç, istatistik, kadrolar, olaylar ve tahmin tek yanıtta
+
+    Parçalar eşzamanlı çekilir; her parçanın cache durumu ve hatası
+    parts altında döner.
+    """
+    bundle = await get_match_bundle(fixture_id)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail=f"Maç bulunamadı: {fixture_id}")
+    if all("error" in status for status in bundle["parts"].values()):
+        raise HTTPException(status_code=500, detail=bundle["parts"]["fixture"]["error"])
+
+    return {**bundle, "timestamp": datetime.now().isoformat()}
+
+
+@app.get("/match")
+async def match_centre_batch(ids: str, predictions: bool = False):
+    """
+    Birden çok maçın paketi (ids=1,2,3; API-Football'a 20'şerli toplu istek)
+
+    predictions=true ise her maçın tahmini de eklenir (maç başına bir istek).
+    """
+    try:
+        fixture_ids = list(dict.fromkeys(int(value) for value in ids.replace("-", ",").split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Geçersiz maç ID listesi: {ids}")
+    if not fixture_ids:
+        raise HTTPException(status_code=400, detail="En az bir maç ID'si gerekli")
+    if len(fixture_ids) > MATCH_BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"En fazla {MATCH_BATCH_MAX_IDS} maç istenebilir")
+
+    result = await get_match_bundles(fixture_ids, predictions=predictions)
+    if not result["matches"] and "error" in result["batch"]:
+        raise HTTPException(status_code=500, detail=result["batch"]["error"])
+
+    return {**result, "count": len(result["matches"]), "timestamp": datetime.now().isoformat()}
+
+
 @app.get("/search/team")
 async def api_search_team(name: str):
     """Takım ara"""
@@ -976,6 +1240,9 @@ async def api_search_team(name: str):
         if "error" in data:
             raise HTTPException(status_code=500, detail=data["error"])
 
+        id_map.learn_teams(data.get("response", []))
+        await id_map.save()
+
         return {
             "query": name,
             "results": data.get("response", []),
@@ -997,6 +1264,9 @@ async def api_search_player(name: str):
         if "error" in data:
             raise HTTPException(status_code=500, detail=data["error"])
 
+        id_map.learn_players(data.get("response", []))
+        await id_map.save()
+
         return {
             "query": name,
             "results": data.get("response", []),
@@ -1009,6 +1279,57 @@ async def api_search_player(name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/scheduler/jobs")
+async def scheduler_jobs():
+    """Ön ısıtma işlerinin durumunu getir"""
+    jobs = prewarm.jobs()
+    return {
+        "enabled": SCHEDULER_ENABLED,
+        "running": prewarm.scheduler.running,
+        "jobs": jobs,
+        "count": len(jobs),
+        "apif_budget": prewarm.apif_budget(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/debug/cache")
+async def debug_cache(
+    namespace: Optional[str] = Query(default=None, description="Yalnızca bu cache alanı"),
+    entries: bool = Query(default=False, description="Kayıtları da listele")
+):
+    """Cache alanlarının durumu (kayıt, bayt, hit/miss/eviction sayıları, yaşlar) ve kalıcı API-Football deposu"""
+    stats = cache_registry.stats(entries)
+    if namespace is not None:
+        if namespace not in stats["namespaces"]:
+            raise HTTPException(status_code=404, detail=f"Cache alanı bulunamadı: {namespace}")
+        stats["namespaces"] = {namespace: stats["namespaces"][namespace]}
+    return {
+        **stats,
+        "apif_ttl": ttl_policy.stats(),
+        "apif_store": await asyncio.to_thread(response_store.stats),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+@app.get("/debug/quota")
+async def debug_quota():
+    """API-Football kota kullanımı (dakikalık/günlük), kuyruk, erteleme ve sorgu başına istek sayıları"""
+    return {**quota.stats(), "requests": request_metrics.stats(), "timestamp": datetime.now().isoformat()}
+
+
+@app.get("/debug/live")
+async def debug_live():
+    """Canlı yayın poller'ları, abone sayıları, yoklama sayaçları ve durum deposu"""
+    return {**live_hub.stats(), "state": live_state.stats(), "timestamp": datetime.now().isoformat()}
+
+
+@app.get("/debug/fixtures")
+async def debug_fixtures():
+    """Sezon fikstür indeksi: boyut, senkron zamanları ve güncelleme sayaçları"""
+    return {**fixture_index.stats(), "timestamp": datetime.now().isoformat()}
+
+
 # Sağlık kontrolü
 @app.get("/health")
 async def health_check():
@@ -1020,7 +1341,12 @@ async def health_check():
             "soccerdata": "active",
             "api_football": "active",
             "grok_ai": "active"
-        }
+        },
+        "fbref_pool": fbref_pool.stats(),
+        "frame_store": frame_store.stats(),
+        "http_clients": http_clients.stats(),
+        "circuit_breakers": breakers.stats(),
+        "id_map": id_map.stats()
     }
 
 
@@ -0,0 +1,135 @@
+"""
+Maç Merkezi Paketi
+
+Bir maç kartı için gereken beş parça (maç, istatistik, kadrolar, olaylar,
+tahmin) sırayla değil eşzamanlı çekilip tek belgede birleştirilir. Her
+parçanın cache durumu (hit/stale/miss) ve hatası ayrı raporlanır.
+
+Birden çok maç için API-Football'un `ids` sorgusu kullanılır: olaylar,
+kadrolar ve istatistikler maç yanıtına gömülü gelir, 20 maç tek istekte.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+
+from api_football import (
+    get_fixture_by_id,
+    get_fixture_events,
+    get_fixture_lineups,
+    get_fixture_statistics,
+    get_fixtures_by_ids,
+    get_predictions,
+)
+from cache import track_cache_state
+
+# `ids` yanıtında maçla birlikte gelen alt kaynaklar
+EMBEDDED_PARTS = ("statistics", "lineups", "events")
+
+
+async def _part(awaitable: Awaitable[Dict]) -> Tuple[Optional[Dict], Dict[str, Any]]:
+    """Parçayı çek; (yanıt, durum) döner, hata durumda yanıt None"""
+    try:
+        data, status = await track_cache_state(awaitable)
+    except Exception as e:
+        return None, {"error": str(e)}
+    if "error" in data:
+        return None, {**status, "error": data["error"]}
+    return data, status
+
+
+def _response(data: Optional[Dict]) -> Optional[List[Dict]]:
+    return (data.get("response") or []) if data is not None else None
+
+
+def _first(data: Optional[Dict]) -> Optional[Dict]:
+    response = (data or {}).get("response") or []
+    return response[0] if response else None
+
+
+def _split_fixture(item: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """`ids` yanıtındaki maçı (maç bilgisi, gömülü alt kaynaklar) olarak ayır"""
+    fixture = {key: value for key, value in item.items() if key not in EMBEDDED_PARTS and key != "players"}
+    return fixture, {part: item.get(part) or [] for part in EMBEDDED_PARTS}
+
+
+async def get_match_bundle(fixture_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Tek maçın paketini getir
+
+    Returns:
+        fixture, statistics, lineups, events, predictions ve parça başına
+        durum (parts). Maç bulunamazsa None.
+    """
+    (fixture, fixture_status), (stats, stats_status), (lineups, lineups_status), \
+        (events, events_status), (predictions, predictions_status) = await asyncio.gather(
+            _part(get_fixture_by_id(fixture_id)),
+            _part(get_fixture_statistics(fixture_id)),
+            _part(get_fixture_lineups(fixture_id)),
+            _part(get_fixture_events(fixture_id)),
+            _part(get_predictions(fixture_id)),
+        )
+
+    if fixture is not None and _first(fixture) is None:
+        return None
+
+    return {
+        "fixture_id": fixture_id,
+        "fixture": _first(fixture),
+        "statistics": _response(stats),
+        "lineups": _response(lineups),
+        "events": _response(events),
+        "predictions": _first(predictions),
+        "parts": {
+            "fixture": fixture_status,
+            "statistics": stats_status,
+            "lineups": lineups_status,
+            "events": events_status,
+            "predictions": predictions_status,
+        },
+    }
+
+
+async def get_match_bundles(fixture_ids: List[int], predictions: bool = False) -> Dict[str, Any]:
+    """
+    Birden çok maçın paketini `ids` toplu sorgusuyla getir
+
+    Args:
+        fixture_ids: Maç ID'leri
+        predictions: True ise her maçın tahmini de (maç başına bir istek)
+            eşzamanlı çekilir
+
+    Returns:
+        matches (istenen sırada, bulunanlar), missing ve parça durumları
+    """
+    tasks = [_part(get_fixtures_by_ids(fixture_ids))]
+    if predictions:
+        tasks += [_part(get_predictions(fixture_id)) for fixture_id in fixture_ids]
+    results = await asyncio.gather(*tasks)
+    (batch, batch_status), prediction_results = results[0], results[1:]
+
+    items = {
+        (item.get("fixture") or {}).get("id"): item
+        for item in (batch or {}).get("response", [])
+    }
+    predicted = dict(zip(fixture_ids, prediction_results)) if predictions else {}
+
+    matches = []
+    for fixture_id in fixture_ids:
+        item = items.get(fixture_id)
+        if item is None:
+            continue
+        fixture, parts = _split_fixture(item)
+        parts_status = {name: batch_status for name in ("fixture", *EMBEDDED_PARTS)}
+        bundle = {"fixture_id": fixture_id, "fixture": fixture, **parts}
+        if predictions:
+            data, status = predicted[fixture_id]
+            bundle["predictions"] = _first(data)
+            parts_status["predictions"] = status
+        bundle["parts"] = parts_status
+        matches.append(bundle)
+
+    return {
+        "matches": matches,
+        "missing": [fixture_id for fixture_id in fixture_ids if fixture_id not in items],
+        "batch": batch_status,
+    }
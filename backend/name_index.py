@@ -0,0 +1,202 @@
+"""
+Oyuncu ve Takım İsim İndeksi
+
+İsimler aksan/Türkçe karakterlerden arındırılıp (Džeko -> dzeko,
+Beşiktaş -> besiktas) token öneki ve trigram ile indekslenir. Hem
+/autocomplete hem de oyuncu/takım aramaları bu indeksi kullanır.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+
+# NFKD ile ayrışmayan özel harfler
+_SPECIAL_CHARS = str.maketrans({
+    "ı": "i", "İ": "i", "ø": "o", "Ø": "o", "đ": "d", "Đ": "d", "ł": "l", "Ł": "l",
+    "ß": "ss", "æ": "ae", "Æ": "ae", "œ": "oe", "Œ": "oe", "þ": "th", "ð": "d",
+})
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """İsmi karşılaştırma için sadeleştir (küçük harf, aksansız, tek boşluk)"""
+    text = str(text).translate(_SPECIAL_CHARS)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameEntry(NamedTuple):
+    kind: str                   # player | team
+    name: str
+    league: str
+    team: Optional[str]
+    folded: str
+
+
+def _level_or_column(frame: pd.DataFrame, name: str) -> Optional[pd.Index]:
+    if name in (frame.index.names or []):
+        return frame.index.get_level_values(name)
+    if name in frame.columns:
+        return pd.Index(frame[name])
+    return None
+
+
+class NameIndex:
+    """Önek + trigram tabanlı isim indeksi"""
+
+    def __init__(self):
+        self._sources: Dict[Hashable, List[NameEntry]] = {}
+        self._entries: List[NameEntry] = []
+        self._tokens: List[Tuple[str, int]] = []
+        self._trigram_index: Dict[str, Set[int]] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        self._ensure_built()
+        return len(self._entries)
+
+    def index_frame(self, source: Hashable, league: str, frame: pd.DataFrame):
+        """FBref tablosundaki takım ve oyuncuları indekse ekle (aynı kaynak yenilenirse değiştirilir)"""
+        teams = _level_or_column(frame, "team")
+        players = _level_or_column(frame, "player")
+
+        entries: Dict[Tuple[str, str, Optional[str]], NameEntry] = {}
+        team_names = [teams] if teams is not None else []
+        # Fikstür tablolarında takımlar ev sahibi/deplasman sütunlarındadır
+        for column in ("home_team", "away_team"):
+            values = _level_or_column(frame, column)
+            if values is not None:
+                team_names.append(values)
+        for values in team_names:
+            for team in values.dropna().unique():
+                entries[("team", team, None)] = NameEntry("team", team, league, None, fold(team))
+        if players is not None:
+            team_values = teams if teams is not None else [None] * len(players)
+            for player, team in zip(players, team_values):
+                if isinstance(player, str) and ("player", player, team) not in entries:
+                    entries[("player", player, team)] = NameEntry("player", player, league, team, fold(player))
+
+        self._sources[source] = list(entries.values())
+        self._dirty = True
+
+    def _ensure_built(self):
+        if not self._dirty:
+            return
+
+        seen = set()
+        self._entries = []
+        for entries in self._sources.values():
+            for entry in entries:
+                identity = (entry.kind, entry.name, entry.league, entry.team)
+                if identity not in seen:
+                    seen.add(identity)
+                    self._entries.append(entry)
+
+        tokens = []
+        trigram_index: Dict[str, Set[int]] = {}
+        for entry_id, entry in enumerate(self._entries):
+            for token in entry.folded.split():
+                tokens.append((token, entry_id))
+            for trigram in _trigrams(entry.folded):
+                trigram_index.setdefault(trigram, set()).add(entry_id)
+
+        tokens.sort()
+        self._tokens = tokens
+        self._trigram_index = trigram_index
+        self._dirty = False
+
+    def _prefix_ids(self, prefix: str) -> Set[int]:
+        ids = set()
+        position = bisect_left(self._tokens, (prefix, -1))
+        while position < len(self._tokens) and self._tokens[position][0].startswith(prefix):
+            ids.add(self._tokens[position][1])
+            position += 1
+        return ids
+
+    def _substring_ids(self, query: str) -> Set[int]:
+        trigrams = _trigrams(query)
+        postings = sorted((self._trigram_index.get(t, set()) for t in trigrams), key=len)
+        if not postings or not postings[0]:
+            return set()
+        candidates = set.intersection(*postings)
+        return {i for i in candidates if query in self._entries[i].folded}
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        league: Optional[str] = None,
+        limit: Optional[int] = 10
+    ) -> List[NameEntry]:
+        """
+        İsim ara (büyük/küçük harf ve aksan duyarsız)
+
+        Args:
+            query: Aranan isim veya parçası
+            kind: "player" veya "team" (None ise ikisi de)
+            league: soccerdata lig adı filtresi
+            limit: En fazla sonuç (None ise hepsi)
+
+        Returns:
+            Tam eşleşme, isim öneki, kelime öneki, ara eşleşme sırasıyla sonuçlar
+        """
+        folded = fold(query)
+        if not folded:
+            return []
+        self._ensure_built()
+
+        query_tokens = folded.split()
+        ids = self._prefix_ids(query_tokens[0])
+        if len(query_tokens) > 1:
+            ids = {
+                i for i in ids
+                if all(any(t.startswith(q) for t in self._entries[i].folded.split()) for q in query_tokens)
+            }
+        if len(folded) >= 3:
+            ids |= self._substring_ids(folded)
+
+        results = [
+            self._entries[i] for i in ids
+            if (kind is None or self._entries[i].kind == kind)
+            and (league is None or self._entries[i].league == league)
+        ]
+
+        def rank(entry: NameEntry):
+            if entry.folded == folded:
+                score = 0
+            elif entry.folded.startswith(folded):
+                score = 1
+            elif any(t.startswith(query_tokens[0]) for t in entry.folded.split()):
+                score = 2
+            else:
+                score = 3
+            return score, len(entry.folded), entry.name
+
+        results.sort(key=rank)
+        return results if limit is None else results[:limit]
+
+    def teams(self, league: str) -> List[str]:
+        """Ligdeki indekslenmiş takım isimleri"""
+        self._ensure_built()
+        return sorted({e.name for e in self._entries if e.kind == "team" and e.league == league})
+
+    def best(self, query: str, kind: str, league: Optional[str] = None) -> Optional[str]:
+        """Sorguyla en iyi eşleşen isim"""
+        matches = self.search(query, kind, league, limit=1)
+        return matches[0].name if matches else None
+
+    def names(self, query: str, kind: str, league: Optional[str] = None) -> List[str]:
+        """Sorguyla eşleşen tüm benzersiz isimler (DataFrame filtrelemek için)"""
+        return list(dict.fromkeys(entry.name for entry in self.search(query, kind, league, limit=None)))
+
+
+name_index = NameIndex()
@@ -0,0 +1,190 @@
+"""
+Upstream Dayanıklılığı (yeniden deneme, devre kesici)
+
+- Idempotent GET'ler geçici hatalarda (bağlantı, zaman aşımı, 5xx) sınırlı
+  sayıda, üstel ve rastgele dağıtılmış (jitter) beklemelerle yeniden denenir.
+- Her upstream'in (API-Football, FBref, Grok) bir devre kesicisi vardır:
+  art arda hatalardan sonra devre açılır ve istekler upstream'i beklemeden
+  CircuitOpenError ile hemen döner. Süre dolunca tek bir deneme isteği
+  geçirilir; başarılıysa devre kapanır.
+
+Hataların kısa süreli cache'lenmesi ve son sağlam değere geri dönüş
+cache.SWRCache'tedir.
+"""
+
+import asyncio
+import os
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Devre kesici: art arda bu kadar hatada açılır, bu kadar saniye açık kalır
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+# Yeniden deneme: ilk denemeye ek en fazla deneme ve bekleme sınırları (saniye)
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "2"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "5"))
+
+
+class CircuitOpenError(Exception):
+    """Upstream devre kesicisi açık, istek gönderilmedi"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} geçici olarak kullanılamıyor ({int(retry_after) + 1} sn sonra tekrar denenecek)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Kapalı / açık / yarı açık durumlu devre kesici"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._counts = {"successes": 0, "failures": 0, "rejected": 0, "opened": 0}
+
+    def check(self):
+        """Devre açıksa CircuitOpenError fırlat (yarı açık deneme hakkı almadan)"""
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0:
+                self._counts["rejected"] += 1
+                raise CircuitOpenError(self.name, remaining)
+
+    def before(self):
+        """İstekten önce çağrılır; devre açıksa CircuitOpenError fırlatır"""
+        if self.state == "closed":
+            return
+        now = time.monotonic()
+        if self.state == "open":
+            remaining = self._opened_at + self.reset_timeout - now
+            if remaining > 0:
+                self._counts["rejected"] += 1
+                raise CircuitOpenError(self.name, remaining)
+            self.state = "half_open"
+
+        # Yarı açık: aynı anda tek deneme isteği (takılan deneme süre sonunda bırakılır)
+        if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+            self._counts["rejected"] += 1
+            raise CircuitOpenError(self.name, self._probe_started + self.reset_timeout - now)
+        self._probe_started = now
+
+    def success(self):
+        self._counts["successes"] += 1
+        self._failures = 0
+        self._probe_started = None
+        self.state = "closed"
+
+    def failure(self):
+        self._counts["failures"] += 1
+        self._failures += 1
+        self._probe_started = None
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            if self.state != "open":
+                self._counts["opened"] += 1
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release(self):
+        """Sonucu upstream'in sağlığını göstermeyen istek (ör. iptal) bitti"""
+        self._probe_started = None
+
+    @contextmanager
+    def protect(self, failures: Tuple[Type[BaseException], ...] = (Exception,)):
+        """
+        Bloğu devre kesiciyle koru
+
+        Args:
+            failures: Upstream hatası sayılan istisnalar; diğerleri devreyi
+                etkilemez
+        """
+        self.before()
+        try:
+            yield
+        except failures:
+            self.failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            self.success()
+
+    def stats(self) -> Dict[str, Any]:
+        state = self.state
+        if state == "open" and time.monotonic() >= self._opened_at + self.reset_timeout:
+            state = "half_open"
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            **self._counts,
+        }
+
+
+class BreakerRegistry:
+    """Upstream başına devre kesiciler"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, name: str, **kwargs) -> CircuitBreaker:
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(name, **kwargs)
+        return self._breakers[name]
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: breaker.stats() for name, breaker in self._breakers.items()}
+
+
+def backoff_delay(attempt: int, base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY) -> float:
+    """attempt. yeniden deneme öncesi bekleme (full jitter: 0..base*2^attempt)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable[Any]],
+    retry_on: Tuple[Type[BaseException], ...],
+    attempts: int = RETRY_ATTEMPTS,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY
+) -> Any:
+    """
+    fn'i geçici hatalarda yeniden dene (yalnızca idempotent istekler için)
+
+    Args:
+        fn: Her denemede çağrılan coroutine fonksiyonu
+        retry_on: Yeniden denenecek istisnalar
+        attempts: İlk denemeye ek en fazla deneme
+
+    Returns:
+        Başarılı denemenin sonucu; denemeler biterse son hata fırlatılır
+    """
+    for attempt in range(attempts + 1):
+        try:
+            return await fn()
+        except retry_on:
+            if attempt >= attempts:
+                raise
+            await asyncio.sleep(backoff_delay(attempt, base_delay, max_delay))
+
+
+breakers = BreakerRegistry()
@@ -0,0 +1,259 @@
+"""
+Arka Plan Ön Isıtma Zamanlayıcısı (APScheduler)
+
+FBref tablolarını ve API-Football puan durumu/fikstürlerini düzenli
+aralıklarla yeniler; kullanıcı istekleri hep sıcak veriye denk gelir.
+
+API-Football'da yalnızca o gün maçı olan ligler yenilenir. Maç günleri
+günde bir kez, lig filtresiz tek bir `fixtures?date=` isteğiyle belirlenir;
+yenilemeler günlük ön ısıtma bütçesini (APIF_PREWARM_BUDGET) aşmayacak
+aralıklarla yapılır.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from dotenv import load_dotenv
+
+from api_football import (
+    API_FOOTBALL_KEY,
+    LEAGUE_IDS,
+    get_fixtures,
+    get_standings,
+    get_today_matches,
+    utc_today,
+)
+from apif_quota import APIF_DAILY_LIMIT
+from fbref_store import FrameStore
+from singleflight import SingleFlight
+
+load_dotenv()
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+
+# FBref tablo yenileme aralıkları (saniye) - FBREF_FRAME_TTL'den kısa olmalı
+# (puan durumu fikstürden türetildiğinden ayrıca yenilenmez)
+FBREF_REFRESH_INTERVALS = {
+    "schedule": int(os.getenv("PREWARM_SCHEDULE_INTERVAL", "1800")),
+    "team_season_stats": int(os.getenv("PREWARM_TEAM_STATS_INTERVAL", "2700")),
+    "player_season_stats": int(os.getenv("PREWARM_PLAYER_STATS_INTERVAL", "2700")),
+}
+
+# İstatistik tablolarında ön ısıtılan stat_type
+PREWARM_STAT_TYPE = "standard"
+
+# İlk çalıştırmalar arasındaki gecikme (iş havuzunu boğmamak için)
+PREWARM_STAGGER = int(os.getenv("PREWARM_STAGGER", "5"))
+
+# API-Football: maçı olan ligleri en sık bu aralıkla yenile (saniye)
+APIF_MATCHDAY_INTERVAL = int(os.getenv("APIF_MATCHDAY_INTERVAL", "300"))
+
+# Ön ısıtmanın günde harcayabileceği en fazla API-Football isteği (maç günü
+# sorgusu dahil); varsayılan günlük kotanın dörtte biri
+APIF_PREWARM_BUDGET = int(os.getenv("APIF_PREWARM_BUDGET", str(APIF_DAILY_LIMIT // 4)))
+
+# Bir lig yenilemesinin istek sayısı (puan durumu + fikstür)
+APIF_REFRESH_COST = 2
+
+
+class JobStatus:
+    """Tek bir zamanlanmış işin son çalışma bilgisi"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.runs = 0
+        self.failures = 0
+        self.last_run: Optional[datetime] = None
+        self.last_status: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.last_duration: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "last_duration": self.last_duration,
+        }
+
+
+class PrewarmScheduler:
+    """FBref ve API-Football verilerini arka planda ısıtan zamanlayıcı"""
+
+    def __init__(self, store: FrameStore, leagues: Dict[str, str], season: str):
+        self.store = store
+        self.leagues = leagues
+        self.season = season
+        self.scheduler = AsyncIOScheduler()
+        self._status: Dict[str, JobStatus] = {}
+        self._apif_last_refresh: Dict[int, float] = {}
+        self._matchdays: Optional[Tuple[str, Set[int]]] = None
+        self._matchday_lookups = SingleFlight()
+        self._apif_spent: Tuple[str, int] = ("", 0)
+        self._tasks: List[Tuple[str, Callable[[], Awaitable[Optional[str]]], int, int]] = []
+
+    def add_task(self, job_id: str, func: Callable[[], Awaitable[Optional[str]]], interval: int, delay: int = 0):
+        """Zamanlayıcı başlarken eklenecek ek bir periyodik iş kaydet"""
+        self._tasks.append((job_id, func, interval, delay))
+
+    def _add_job(self, job_id: str, func: Callable[[], Awaitable[Optional[str]]], interval: int, delay: int):
+        status = JobStatus(job_id)
+        self._status[job_id] = status
+
+        async def run():
+            started = time.perf_counter()
+            status.last_run = datetime.now()
+            status.runs += 1
+            try:
+                status.last_status = await func() or "ok"
+                status.last_error = None
+            except Exception as e:
+                status.failures += 1
+                status.last_status = "error"
+                status.last_error = str(e)
+            status.last_duration = round(time.perf_counter() - started, 3)
+
+        self.scheduler.add_job(
+            run,
+            "interval",
+            seconds=interval,
+            id=job_id,
+            next_run_time=datetime.now() + timedelta(seconds=delay),
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=interval,
+        )
+
+    def _fbref_job(self, league: str, table: str) -> Callable[[], Awaitable[Optional[str]]]:
+        stat_type = PREWARM_STAT_TYPE if table in ("team_season_stats", "player_season_stats") else None
+        first_run = True
+
+        async def refresh():
+            nonlocal first_run
+            if first_run:
+                # Açılışta diskteki güncel anlık görüntü yeterli; yoksa scrape edilir
+                first_run = False
+                await self.store.get(league, self.season, table, stat_type)
+                return "warm"
+            await self.store.refresh(league, self.season, table, stat_type)
+
+        return refresh
+
+    def _apif_budget(self, today: str) -> int:
+        """Bugün ön ısıtma için kalan API-Football isteği"""
+        day, spent = self._apif_spent
+        return APIF_PREWARM_BUDGET - (spent if day == today else 0)
+
+    def _spend(self, today: str, requests: int):
+        day, spent = self._apif_spent
+        self._apif_spent = (today, (spent if day == today else 0) + requests)
+
+    async def _playing_leagues(self, today: str) -> Set[int]:
+        """Bugün maçı olan takip edilen ligler (günde tek `date=` isteği)"""
+        if self._matchdays is None or self._matchdays[0] != today:
+            # Yeni günün ilk işleri aynı anda çalışırsa tek isteği beklerler
+            await self._matchday_lookups.do(today, lambda: self._load_matchdays(today))
+        if self._matchdays is None or self._matchdays[0] != today:
+            return set()
+        return self._matchdays[1]
+
+    async def _load_matchdays(self, today: str):
+        if self._matchdays is not None and self._matchdays[0] == today:
+            return
+        if self._apif_budget(today) < 1:
+            return
+        self._spend(today, 1)
+        data = await get_today_matches()
+        if "error" in data:
+            raise RuntimeError(data["error"])
+        tracked = set(LEAGUE_IDS.values())
+        self._matchdays = (today, {
+            (item.get("league") or {}).get("id") for item in data.get("response") or []
+        } & tracked)
+
+    def _matchday_interval(self, today: str, playing: int) -> float:
+        """Kalan bütçe günün geri kalanına yetecek yenileme aralığı"""
+        # Günlük kota UTC gece yarısı sıfırlanır
+        now = datetime.now(timezone.utc)
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+        seconds_left = (midnight - now).total_seconds()
+        remaining = self._apif_budget(today)
+        if remaining < APIF_REFRESH_COST:
+            return float("inf")
+        return max(APIF_MATCHDAY_INTERVAL, seconds_left * APIF_REFRESH_COST * playing / remaining)
+
+    def _apif_job(self, league_id: int) -> Callable[[], Awaitable[str]]:
+        async def refresh():
+            today = utc_today()
+            playing = await self._playing_leagues(today)
+            if league_id not in playing:
+                return "idle"
+
+            last = self._apif_last_refresh.get(league_id, 0)
+            if time.time() - last < self._matchday_interval(today, len(playing)):
+                return "skipped"
+
+            self._spend(today, APIF_REFRESH_COST)
+            for data in (
+                await get_standings(league_id, refresh=True),
+                await get_fixtures(league_id, refresh=True),
+            ):
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+
+            self._apif_last_refresh[league_id] = time.time()
+            return "matchday"
+
+        return refresh
+
+    def start(self):
+        """İşleri oluştur ve zamanlayıcıyı başlat"""
+        delay = 0
+        for league_key, league in self.leagues.items():
+            for table, interval in FBREF_REFRESH_INTERVALS.items():
+                self._add_job(f"fbref:{league_key}:{table}", self._fbref_job(league, table), interval, delay)
+                delay += PREWARM_STAGGER
+
+        if API_FOOTBALL_KEY:
+            for league_key, league_id in LEAGUE_IDS.items():
+                self._add_job(f"apif:{league_key}", self._apif_job(league_id), APIF_MATCHDAY_INTERVAL, delay)
+                delay += PREWARM_STAGGER
+
+        for job_id, func, interval, task_delay in self._tasks:
+            self._add_job(job_id, func, interval, task_delay)
+
+        self.scheduler.start()
+
+    def shutdown(self):
+        """Zamanlayıcıyı durdur"""
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+    def apif_budget(self) -> Dict[str, Any]:
+        """Günlük ön ısıtma bütçesi ve bugün maçı olan ligler"""
+        today = utc_today()
+        matchdays = self._matchdays if self._matchdays and self._matchdays[0] == today else None
+        return {
+            "date": today,
+            "budget": APIF_PREWARM_BUDGET,
+            "remaining": self._apif_budget(today),
+            "playing_leagues": sorted(matchdays[1]) if matchdays else None,
+        }
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        """İşlerin durumunu listele"""
+        result = []
+        for job in self.scheduler.get_jobs():
+            status = self._status.get(job.id)
+            result.append({
+                "id": job.id,
+                "interval_seconds": int(job.trigger.interval.total_seconds()),
+                "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
+                **(status.to_dict() if status else {}),
+            })
+        return result
@@ -0,0 +1,160 @@
+"""
+DataFrame -> JSON Bayt Dönüşümü
+
+FBref tabloları satır başına Python dict'i oluşturulmadan doğrudan JSON
+baytlarına çevrilir (pandas'ın C kodlayıcısı). Yanıt zarfı orjson ile
+yazılır ve tablo baytları zarfa eklenir. NaN/NaT değerleri null olur,
+çok seviyeli sütun isimleri "Performance_Gls" biçiminde düzleştirilir.
+
+Cache'te bu baytlar tutulur; hit durumunda yeniden kodlama yapılmaz.
+"""
+
+import hashlib
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson yoksa standart json kullanılır (daha yavaş)
+    orjson = None
+
+# Çok seviyeli sütun isimlerini birleştiren ayraç
+COLUMN_SEPARATOR = "_"
+
+
+def flatten_columns(frame: pd.DataFrame) -> pd.DataFrame:
+    """Çok seviyeli sütunları tek seviyeye indir (boş ve "Unnamed" seviyeler atlanır)"""
+    if not isinstance(frame.columns, pd.MultiIndex):
+        return frame
+
+    columns = []
+    for parts in frame.columns:
+        names = [
+            str(part) for part in parts
+            if part is not None and str(part) and not str(part).startswith("Unnamed")
+        ]
+        columns.append(COLUMN_SEPARATOR.join(names))
+
+    flat = frame.copy(deep=False)
+    flat.columns = columns
+    return flat
+
+
+def frame_to_json(frame: pd.DataFrame) -> bytes:
+    """
+    DataFrame'i kayıt listesi olarak JSON baytlarına çevir
+
+    İsimli indeks seviyeleri sütunlara açılır. Tarihler ISO formatında,
+    NaN/NaT null yazılır.
+    """
+    if any(name is not None for name in frame.index.names):
+        frame = frame.reset_index()
+    frame = flatten_columns(frame)
+    if frame.columns.has_duplicates:
+        frame = frame.loc[:, ~frame.columns.duplicated()]
+    return frame.to_json(
+        orient="records",
+        date_format="iso",
+        date_unit="s",
+        force_ascii=False,
+        default_handler=str,
+    ).encode("utf-8")
+
+
+def frame_records(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """DataFrame'i JSON uyumlu kayıt listesine çevir (AI istemleri gibi dict gereken yerler için)"""
+    return _loads(frame_to_json(frame))
+
+
+def _loads(body: bytes) -> Any:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _default(value: Any) -> Any:
+    """orjson/json'un tanımadığı pandas ve numpy tipleri"""
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+        return None if isinstance(value, float) and value != value else value
+    if isinstance(value, pd.Series):
+        return value.tolist()
+    raise TypeError(f"JSON'a çevrilemeyen tip: {type(value).__name__}")
+
+
+def _dumps(value: Any, default) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(value, default=default, ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Yanıtı JSON baytlarına çevir
+
+    İçindeki DataFrame'ler frame_to_json ile ayrı kodlanıp zarftaki
+    yerlerine eklenir.
+    """
+    frames: List[pd.DataFrame] = []
+    marker = f"@@frame-{os.urandom(6).hex()}-"
+
+    def default(value: Any) -> Any:
+        if isinstance(value, pd.DataFrame):
+            frames.append(value)
+            return f"{marker}{len(frames) - 1}@@"
+        return _default(value)
+
+    body = _dumps(payload, default)
+    for i, frame in enumerate(frames):
+        body = body.replace(f'"{marker}{i}@@"'.encode("utf-8"), frame_to_json(frame), 1)
+    return body
+
+
+def content_version(body: bytes) -> str:
+    """JSON baytlarının kısa içerik özeti (ETag için)"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+class EncodedBody(NamedTuple):
+    body: bytes
+    version: str                # zaman damgaları hariç içerik özeti
+
+
+def encode(payload: Dict[str, Any], volatile: Iterable[str] = ("updated_at", "timestamp")) -> EncodedBody:
+    """
+    Yanıtı kodla ve veri sürümünü hesapla
+
+    Her çağrıda değişen alanlar (updated_at, timestamp) özete katılmaz ve
+    gövdenin sonuna eklenir; veri değişmedikçe sürüm aynı kalır.
+    """
+    volatile = [key for key in volatile if key in payload]
+    stable = {key: value for key, value in payload.items() if key not in volatile}
+    body = dumps(stable)
+    version = content_version(body)
+    if volatile:
+        extra = dumps({key: payload[key] for key in volatile})
+        body = body[:-1] + (b"," if stable else b"") + extra[1:]
+    return EncodedBody(body, version)
+
+
+class JSONBytesResponse(Response):
+    """Önceden kodlanmış JSON baytlarını (veya DataFrame içeren yanıtı) döndürür"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, EncodedBody):
+            return content.body
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
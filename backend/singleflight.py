@@ -0,0 +1,56 @@
+"""
+Single-flight İstek Birleştirme
+
+Aynı anahtar için eşzamanlı gelen cache miss'lerde yalnızca ilk çağrı
+veriyi çeker; diğerleri aynı sonucu (veya hatayı) bekler.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Anahtar bazlı eşzamanlı çağrı birleştirici"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._leaders = 0
+        self._shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Anahtar için çalışan bir çağrı varsa onu bekle, yoksa başlat
+
+        Args:
+            key: Birleştirme anahtarı (genelde cache anahtarı)
+            fn: Veriyi çeken coroutine fonksiyonu
+
+        Returns:
+            fn sonucu; fn hata verirse tüm bekleyenlere aynı hata fırlatılır
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self._leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self._shared += 1
+
+        # Bir bekleyenin iptali diğerlerinin çağrısını iptal etmesin
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Tüm bekleyenler iptal edildiyse "exception was never retrieved" uyarısını önle
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """Birleştirme istatistikleri"""
+        return {
+            "inflight": len(self._inflight),
+            "leaders": self._leaders,
+            "shared": self._shared,
+        }
@@ -0,0 +1,115 @@
+"""
+FBref Tablo Anlık Görüntüleri (Parquet)
+
+Scrape edilen ham tablolar diske Parquet olarak yazılır. Yeniden başlayan
+bir worker tabloları ilk ihtiyaçta diskten (memory-map ile) okuyarak
+saniyeler içinde sıcak veri sunar.
+"""
+
+import json
+import logging
+import os
+import re
+import unicodedata
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+from dotenv import load_dotenv
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow yoksa anlık görüntüler devre dışı
+    pa = pq = None
+
+try:
+    import soccerdata
+    SOCCERDATA_VERSION = getattr(soccerdata, "__version__", "unknown")
+except ImportError:
+    SOCCERDATA_VERSION = "unknown"
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ENABLED = os.getenv("FBREF_SNAPSHOT_ENABLED", "true").lower() == "true" and pq is not None
+SNAPSHOT_DIR = os.getenv("FBREF_SNAPSHOT_DIR", "data/fbref")
+
+# Dosya formatı değişirse artırılır; eski sürümdeki dosyalar yok sayılır
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Parquet şema metadata anahtarı
+_META_KEY = b"fbref_snapshot"
+
+
+def _slug(value: Optional[str]) -> str:
+    """Dosya adı için güvenli parça"""
+    if value is None:
+        return "none"
+    ascii_value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+    return re.sub(r"[^A-Za-z0-9]+", "_", ascii_value).strip("_")
+
+
+class SnapshotStore:
+    """Ham FBref tablolarını Parquet dosyalarında saklar"""
+
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        self.directory = directory
+
+    def path(self, key: Tuple) -> str:
+        league, season, table, stat_type = key
+        name = "__".join([_slug(league), _slug(season), table, _slug(stat_type)])
+        return os.path.join(self.directory, f"{name}.parquet")
+
+    def save(self, key: Tuple, frame: pd.DataFrame, loaded_at: float):
+        """Tabloyu atomik olarak diske yaz (önce geçici dosya, sonra rename)"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        meta = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "soccerdata_version": SOCCERDATA_VERSION,
+            "saved_at": loaded_at,
+            "key": list(key),
+            "rows": len(frame),
+        }
+
+        table = pa.Table.from_pandas(frame)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _META_KEY: json.dumps(meta).encode(),
+        })
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    def read_meta(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Dosyanın metadata'sını oku (veri okunmaz)"""
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        schema_meta = pq.read_schema(path).metadata or {}
+        if _META_KEY not in schema_meta:
+            return None
+        return json.loads(schema_meta[_META_KEY])
+
+    def load(self, key: Tuple) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        Tabloyu diskten oku
+
+        Returns:
+            (DataFrame, metadata) ya da dosya yoksa/format uyumsuzsa None
+        """
+        try:
+            meta = self.read_meta(key)
+            if meta is None or meta.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+                return None
+            frame = pq.read_table(self.path(key), memory_map=True).to_pandas()
+            return frame, meta
+        except Exception as e:
+            logger.warning("Anlık görüntü okunamadı (%s): %s", key, e)
+            return None
+
+    def is_outdated(self, meta: Dict[str, Any]) -> bool:
+        """Farklı soccerdata sürümüyle yazılmış dosyalar yenilenmeli"""
+        return meta.get("soccerdata_version") != SOCCERDATA_VERSION
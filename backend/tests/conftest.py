@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Backend modülleri düz import edilir (uvicorn main:app ile aynı)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+import api_football
+from apif_quota import QuotaScheduler
+from apif_store import ResponseStore
+from apif_ttl import PERMANENT, TTLPolicy
+from cache import SWRCache
+from resilience import CircuitBreaker
+
+
+def upstream(statuses):
+    """Sırayla verilen kodları dönen sahte API-Football"""
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        return httpx.Response(status, json={"errors": [], "response": []}, headers={"retry-after": "0"})
+
+    return calls, handler
+
+
+@pytest.fixture
+def fetch(monkeypatch):
+    def make(statuses):
+        calls, handler = upstream(statuses)
+        quota = QuotaScheduler(per_minute=100, daily_limit=100)
+        monkeypatch.setattr(api_football, "quota", quota)
+        monkeypatch.setattr(api_football, "breaker", CircuitBreaker("apif-test"))
+        monkeypatch.setattr("resilience.backoff_delay", lambda *args: 0)
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                monkeypatch.setattr(api_football, "client", client)
+                return await api_football._fetch("fixtures", {"id": 1})
+
+        return calls, quota, run
+    return make
+
+
+def test_transient_retries_share_one_quota_token(fetch):
+    calls, quota, run = fetch([503, 200])
+    assert asyncio.run(run()) == {"errors": [], "response": []}
+    assert len(calls) == 2
+    assert quota.stats()["granted"] == 1
+
+
+def test_throttled_request_requeues_for_a_new_token(fetch, monkeypatch):
+    calls, quota, run = fetch([429, 200])
+    monkeypatch.setattr(quota, "throttled", lambda retry_after=None: None)
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert quota.stats()["granted"] == 2
+
+
+def test_stale_fallback_holds_off_upstream_for_negative_ttl(tmp_path, monkeypatch):
+    store = ResponseStore(str(tmp_path / "apif.sqlite3"))
+    monkeypatch.setattr(api_football, "API_FOOTBALL_KEY", "test")
+    monkeypatch.setattr(api_football, "response_store", store)
+    monkeypatch.setattr(api_football, "cache", SWRCache(None, 60, 120, name="apif-test"))
+    calls = []
+
+    async def failing_fetch(endpoint, params, priority=None):
+        calls.append(endpoint)
+        raise api_football.APIFootballUnavailable("API Hatası: 503")
+
+    monkeypatch.setattr(api_football, "_fetch", failing_fetch)
+
+    async def run():
+        await store.put("standings?league=203&season=2024", "standings", {"response": ["eski"]}, (0.0, 0.0))
+        results = []
+        for _ in range(5):
+            results.append(await api_football.api_request("standings", {"league": 203, "season": 2024}))
+            await asyncio.sleep(0.01)
+        return results
+
+    results = asyncio.run(run())
+    store.close()
+    assert all(result == {"response": ["eski"]} for result in results)
+    assert len(calls) == 1
+
+
+def test_fixture_details_learn_finished_status_from_shared_store(tmp_path, monkeypatch):
+    store = ResponseStore(str(tmp_path / "apif.sqlite3"))
+    policy = TTLPolicy()                        # yeni başlamış worker: bitmiş maç bilinmiyor
+    monkeypatch.setattr(api_football, "API_FOOTBALL_KEY", "test")
+    monkeypatch.setattr(api_football, "response_store", store)
+    monkeypatch.setattr(api_football, "ttl_policy", policy)
+    monkeypatch.setattr(api_football, "cache", SWRCache(None, 60, 120, name="apif-test"))
+
+    async def fetch(endpoint, params, priority=None):
+        return {"errors": [], "response": [{"type": "Goal"}]}
+
+    monkeypatch.setattr(api_football, "_fetch", fetch)
+
+    async def run():
+        finished = {"response": [{"fixture": {"id": 7, "status": {"short": "FT"}}}]}
+        await store.put("fixtures?id=7", "fixtures", finished, PERMANENT)
+        await api_football.api_request("fixtures/events", {"fixture": 7})
+        await api_football.api_request("fixtures/events", {"fixture": 8})
+        return await store.get("fixtures/events?fixture=7"), await store.get("fixtures/events?fixture=8")
+
+    finished_events, other_events = asyncio.run(run())
+    store.close()
+    assert finished_events.immutable
+    assert not other_events.immutable
+    assert api_football.cache.peek("fixtures/events?fixture=7").hard_ttl == float("inf")
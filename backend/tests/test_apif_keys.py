@@ -0,0 +1,33 @@
+from apif_keys import RequestMetrics, canonical_params, request_fingerprint
+
+
+def test_fingerprint_ignores_order_types_and_none():
+    a = request_fingerprint("fixtures", {"season": 2024, "league": "203", "next": None})
+    b = request_fingerprint("/fixtures/", {"league": 203, "season": 2024.0})
+    assert a == b == "fixtures?league=203&season=2024"
+
+
+def test_fingerprint_without_params_is_endpoint():
+    assert request_fingerprint("status") == request_fingerprint("status", {"x": None}) == "status"
+
+
+def test_canonical_params_match_httpx_encoding():
+    assert canonical_params({"live": True, "search": " Icardi ", "ids": "1-2"}) == {
+        "ids": "1-2", "live": "true", "search": "Icardi",
+    }
+
+
+def test_fingerprint_escapes_values():
+    assert request_fingerprint("teams", {"search": "Beşiktaş JK"}) == "teams?search=Be%C5%9Fikta%C5%9F+JK"
+
+
+def test_metrics_count_deduplicated_requests_and_bound_fingerprints():
+    metrics = RequestMetrics(max_tracked=2)
+    for fingerprint in ("a", "b", "a", "c"):      # b en eski, düşer
+        metrics.request("fixtures", fingerprint)
+    metrics.upstream("fixtures", "a")
+
+    stats = metrics.stats()
+    assert (stats["requests"], stats["upstream"], stats["deduplicated"]) == (4, 1, 3)
+    assert stats["tracked_fingerprints"] == 2
+    assert [item["fingerprint"] for item in stats["top"]] == ["a", "c"]
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+import apif_quota
+from apif_quota import Priority, QuotaDeferredError, QuotaScheduler, priority_for
+
+
+def test_priority_for():
+    assert priority_for("fixtures", {"live": "all"}) is Priority.HIGH
+    assert priority_for("fixtures/events", {"fixture": 1}) is Priority.HIGH
+    assert priority_for("fixtures", {"date": "2024-08-10"}) is Priority.NORMAL
+    assert priority_for("standings", {"league": 203}) is Priority.NORMAL
+    assert priority_for("fixtures", {"league": 203, "season": 2024}) is Priority.LOW
+    assert priority_for("players", {"search": "icardi"}) is Priority.LOW
+
+
+def test_daily_reserve_defers_low_priority_only():
+    quota = QuotaScheduler(per_minute=100, daily_limit=100)
+    quota.update({"x-ratelimit-requests-limit": "100", "x-ratelimit-requests-remaining": "10"})
+
+    async def acquire(priority):
+        await quota.acquire(priority)
+
+    with pytest.raises(QuotaDeferredError):
+        asyncio.run(acquire(Priority.LOW))
+    asyncio.run(acquire(Priority.NORMAL))
+    asyncio.run(acquire(Priority.HIGH))
+
+    stats = quota.stats()
+    assert stats["daily"]["used"] == 90
+    assert stats["by_priority"]["low"]["deferred"] == 1
+    assert stats["granted"] == 2
+
+
+def test_queued_requests_are_granted_by_priority():
+    quota = QuotaScheduler(per_minute=600, daily_limit=1000)
+    quota.tokens = 0.0
+    order = []
+
+    async def request(priority):
+        await quota.acquire(priority)
+        order.append(priority)
+
+    async def run():
+        low = asyncio.ensure_future(request(Priority.LOW))
+        normal = asyncio.ensure_future(request(Priority.NORMAL))
+        high = asyncio.ensure_future(request(Priority.HIGH))
+        await asyncio.gather(low, normal, high)
+
+    asyncio.run(run())
+    assert order == [Priority.HIGH, Priority.NORMAL, Priority.LOW]
+    assert quota.stats()["queued"] == 3
+
+
+def test_request_deferred_when_wait_exceeds_limit(monkeypatch):
+    monkeypatch.setitem(apif_quota.MAX_WAIT, Priority.LOW, 0.05)
+    quota = QuotaScheduler(per_minute=1, daily_limit=1000)
+    quota.tokens = 0.0
+
+    with pytest.raises(QuotaDeferredError):
+        asyncio.run(quota.acquire(Priority.LOW))
+    assert quota.stats()["deferred"] == 1
+
+
+def test_headers_shrink_bucket_and_throttle_pauses():
+    quota = QuotaScheduler(per_minute=10, daily_limit=100)
+    quota.update({"x-ratelimit-limit": "30", "x-ratelimit-remaining": "2"})
+    stats = quota.stats()["per_minute"]
+    assert stats["limit"] == 30
+    assert stats["tokens"] <= 2.1
+
+    quota.throttled(5)
+    stats = quota.stats()
+    assert stats["per_minute"]["tokens"] < 1
+    assert 0 < stats["per_minute"]["paused_seconds"] <= 5
+    assert stats["throttled"] == 1
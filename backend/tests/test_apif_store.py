@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+import pytest
+
+import apif_store
+from apif_store import ResponseStore
+
+KEY = "standings?league=203&season=2024"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResponseStore(str(tmp_path / "apif.sqlite3"))
+    yield store
+    store.close()
+
+
+def test_put_then_get_round_trips_the_body(store):
+    body = {"response": [{"league": {"id": 203, "name": "Süper Lig"}}], "results": 1}
+    asyncio.run(store.put(KEY, "standings", body, (60, 600)))
+
+    stored = asyncio.run(store.get(KEY))
+    assert stored.value == body
+    assert stored.is_fresh and not stored.immutable
+    assert stored.expires_at - stored.stored_at == pytest.approx(600)
+    assert asyncio.run(store.get("standings?league=39&season=2024")) is None
+    assert store.stats()["rows"] == 1
+
+
+def test_expired_entries_are_returned_stale(store, monkeypatch):
+    asyncio.run(store.put(KEY, "standings", {"response": []}, (60, 600)))
+    later = time.time() + 120
+    monkeypatch.setattr(apif_store.time, "time", lambda: later)
+
+    stored = asyncio.run(store.get(KEY))
+    assert stored is not None and not stored.is_fresh
+    assert store.stats()["stale_reads"] == 1
+
+
+def test_immutable_entries_stay_fresh_and_survive_pruning(store, monkeypatch):
+    asyncio.run(store.put("fixtures?id=1", "fixtures", {"response": [1]}, (float("inf"), float("inf"))))
+    asyncio.run(store.put(KEY, "standings", {"response": []}, (0, 0)))
+
+    monkeypatch.setattr(apif_store, "CACHE_STALE_IF_ERROR", -1)
+    with store._lock:
+        store._prune(store._connect())
+
+    assert asyncio.run(store.get(KEY)) is None
+    stored = asyncio.run(store.get("fixtures?id=1"))
+    assert stored.immutable and stored.is_fresh
+    assert store.stats()["pruned"] == 1
+
+
+def test_store_is_shared_between_instances(store):
+    asyncio.run(store.put(KEY, "standings", {"response": ["paylaşılan"]}, (60, 600)))
+    other = ResponseStore(store.path)
+    try:
+        assert asyncio.run(other.get(KEY)).value == {"response": ["paylaşılan"]}
+    finally:
+        other.close()
+
+
+def test_disabled_or_broken_store_never_raises(tmp_path):
+    disabled = ResponseStore(str(tmp_path / "off.sqlite3"), enabled=False)
+    asyncio.run(disabled.put(KEY, "standings", {"response": []}, (60, 600)))
+    assert asyncio.run(disabled.get(KEY)) is None
+
+    broken_path = tmp_path / "broken.sqlite3"
+    broken_path.write_bytes(b"sqlite degil")
+    broken = ResponseStore(str(broken_path))
+    assert asyncio.run(broken.get(KEY)) is None
+    asyncio.run(broken.put(KEY, "standings", {"response": []}, (60, 600)))
+    assert broken.stats()["errors"] == 2
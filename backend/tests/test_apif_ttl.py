@@ -0,0 +1,55 @@
+from apif_ttl import APIF_ERROR_TTL, APIF_LIVE_TTL, PERMANENT, TTLPolicy
+
+
+def fixture(fixture_id, status):
+    return {"fixture": {"id": fixture_id, "status": {"short": status}}}
+
+
+def test_most_specific_rule_wins():
+    policy = TTLPolicy()
+    assert policy.ttl("fixtures", {"live": "all", "league": 203}, {"response": []}) == (APIF_LIVE_TTL, 4 * APIF_LIVE_TTL)
+    assert policy.rule_for("fixtures", {"league": 203, "season": 2024}).params == {"league", "season"}
+    assert policy.rule_for("unknown", {}) is None
+    assert policy.ttl("unknown", {}, {"response": []}) == policy.default
+
+
+def test_error_bodies_are_short_lived():
+    policy = TTLPolicy()
+    assert policy.ttl("standings", {"league": 203, "season": 2024}, {"errors": {"rateLimit": "x"}}) == APIF_ERROR_TTL
+
+
+def test_past_seasons_are_permanent():
+    policy = TTLPolicy(current_season=2024)
+    assert policy.ttl("standings", {"league": 203, "season": "2023"}, {"response": []}) == PERMANENT
+    assert policy.ttl("standings", {"league": 203, "season": 2024}, {"response": []}) != PERMANENT
+
+
+def test_finished_fixtures_are_permanent():
+    policy = TTLPolicy()
+    assert policy.ttl("fixtures", {"id": 1}, {"response": [fixture(1, "FT")]}) == PERMANENT
+    assert policy.ttl("fixtures", {"id": 2}, {"response": [fixture(2, "2H")]}) != PERMANENT
+    assert policy.ttl("fixtures", {"id": 3}, {"response": []}) != PERMANENT
+
+
+def test_fixture_details_become_permanent_once_match_is_known_finished():
+    policy = TTLPolicy()
+    assert policy.ttl("fixtures/events", {"fixture": 7}, {"response": []}) != PERMANENT
+    policy.ttl("fixtures", {"date": "2024-08-10"}, {"response": [fixture(7, "PEN")]})
+    assert policy.ttl("fixtures/events", {"fixture": "7"}, {"response": []}) == PERMANENT
+    assert policy.stats()["finished_fixtures"] == 1
+
+
+def test_finished_status_in_payload_wins_without_prior_knowledge():
+    policy = TTLPolicy()
+    finished = {"response": [{**fixture(9, "AET"), "statistics": []}]}
+    assert policy.ttl("fixtures/statistics", {"fixture": 9}, finished) == PERMANENT
+    assert policy.ttl("fixtures", {"ids": "9-10"}, {"response": [fixture(9, "FT"), fixture(10, "NS")]}) != PERMANENT
+    assert policy.ttl("fixtures", {"id": 11}, {"response": [{"fixture": {"id": 11, "status": None}}]}) != PERMANENT
+
+
+def test_needs_fixture_status_only_for_unknown_fixture_details():
+    policy = TTLPolicy()
+    assert policy.needs_fixture_status("fixtures/events", {"fixture": "7"}) == 7
+    assert policy.needs_fixture_status("fixtures/headtohead", {"h2h": "645-611"}) is None
+    policy.learn("fixtures", {"response": [fixture(7, "FT")]})
+    assert policy.needs_fixture_status("fixtures/events", {"fixture": "7"}) is None
@@ -0,0 +1,284 @@
+import asyncio
+
+import pytest
+
+import cache
+from cache import SWRCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+def loader(values):
+    """Her çağrıda sıradaki değeri dönen fetch ve çağrı sayacı"""
+    calls = []
+
+    async def fetch():
+        calls.append(len(calls))
+        await asyncio.sleep(0)
+        return values[min(len(calls), len(values)) - 1]
+
+    return calls, fetch
+
+
+def test_soft_and_hard_ttl_transitions(clock):
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60)
+    calls, fetch = loader(["v1", "v2", "v3"])
+
+    async def run():
+        results = [await swr.get_or_fetch("k", fetch)]           # miss
+        clock.now += 5
+        results.append(await swr.get_or_fetch("k", fetch))       # hit
+        clock.now += 10
+        results.append(await swr.get_or_fetch("k", fetch))       # stale: eski değer döner
+        await asyncio.sleep(0.01)                                # arka plan yenileme
+        results.append(await swr.get_or_fetch("k", fetch))       # yenilenmiş değer
+        clock.now += 61
+        results.append(await swr.get_or_fetch("k", fetch))       # hard TTL sonrası bekler
+        return results
+
+    assert asyncio.run(run()) == ["v1", "v1", "v1", "v2", "v3"]
+    assert len(calls) == 3
+    stats = swr.stats()
+    assert (stats["misses"], stats["hits"], stats["stale"]) == (2, 2, 1)
+
+
+def test_stale_reads_start_a_single_revalidation(clock):
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60)
+    calls, fetch = loader(["v1", "v2"])
+
+    async def run():
+        await swr.get_or_fetch("k", fetch)
+        clock.now += 20
+        stale = await asyncio.gather(*[swr.get_or_fetch("k", fetch) for _ in range(5)])
+        await asyncio.sleep(0.01)
+        return stale, await swr.get_or_fetch("k", fetch)
+
+    stale, fresh = asyncio.run(run())
+    assert stale == ["v1"] * 5 and fresh == "v2"
+    assert len(calls) == 2
+
+
+def test_concurrent_misses_share_one_fetch(clock):
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60)
+    calls, fetch = loader(["v1"])
+
+    async def run():
+        return await asyncio.gather(*[swr.get_or_fetch("k", fetch) for _ in range(10)])
+
+    assert asyncio.run(run()) == ["v1"] * 10
+    assert len(calls) == 1
+    assert swr.stats()["misses"] == 10
+
+
+def test_refresh_bypasses_fresh_entry(clock):
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60)
+    calls, fetch = loader(["v1", "v2"])
+
+    async def run():
+        await swr.get_or_fetch("k", fetch)
+        return await swr.get_or_fetch("k", fetch, refresh=True)
+
+    assert asyncio.run(run()) == "v2"
+    assert len(calls) == 2
+
+
+@pytest.fixture
+def client():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from cache import CacheStatusMiddleware
+
+    app = FastAPI()
+    app.add_middleware(CacheStatusMiddleware, cache_control=[
+        ("/live/stream", "no-store"),
+        ("/live/", "public, max-age=60"),
+        ("/standings/", "public, max-age=300"),
+    ])
+    swr = SWRCache(None, soft_ttl=60, hard_ttl=600)
+    data = {"value": "v1"}
+
+    async def fetch():
+        return dict(data)
+
+    @app.get("/standings/{league}")
+    async def standings(league: str):
+        return await swr.get_or_fetch(league, fetch)
+
+    @app.get("/live/today")
+    async def today():
+        return await swr.get_or_fetch("today", fetch)
+
+    @app.get("/live/stream")
+    async def stream():
+        return {}
+
+    @app.post("/standings/{league}")
+    async def post_standings(league: str):
+        return await swr.get_or_fetch(league, fetch)
+
+    client = TestClient(app)
+    client.data = data
+    client.swr = swr
+    return client
+
+
+def test_etag_and_conditional_get(client):
+    first = client.get("/standings/super_lig")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["x-cache"] == "miss"
+    assert first.headers["age"] == "0"
+    assert "last-modified" in first.headers
+
+    again = client.get("/standings/super_lig", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert again.headers["x-cache"] == "hit"
+
+    since = client.get("/standings/super_lig", headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert since.status_code == 304
+
+    # Aynı veri farklı sorgu parametresiyle farklı ETag alır
+    assert client.get("/standings/super_lig?page=2").headers["etag"] != etag
+
+
+def test_etag_changes_with_data_version(client):
+    etag = client.get("/standings/super_lig").headers["etag"]
+    client.data["value"] = "v2"
+    client.swr.set("super_lig", dict(client.data))
+
+    changed = client.get("/standings/super_lig", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json() == {"value": "v2"}
+    assert changed.headers["etag"] != etag
+
+
+def test_cache_control_by_path_prefix(client):
+    assert client.get("/standings/super_lig").headers["cache-control"] == "public, max-age=300"
+    assert client.get("/live/today").headers["cache-control"] == "public, max-age=60"
+    stream = client.get("/live/stream")
+    assert stream.headers["cache-control"] == "no-store"
+    # Cache'e dokunmayan yanıt ETag ve cache durumu almaz
+    assert "etag" not in stream.headers and "x-cache" not in stream.headers
+
+
+def test_non_get_requests_get_no_http_cache_headers(client):
+    response = client.post("/standings/super_lig")
+    assert response.headers["x-cache"] == "miss"
+    assert "etag" not in response.headers and "cache-control" not in response.headers
+
+
+def sized(value):
+    return None, len(value)
+
+
+def test_byte_budget_evicts_least_recently_used(clock):
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60, max_bytes=10, info=sized)
+    swr.set("a", "xxxx")
+    swr.set("b", "xxxx")
+    assert "a" in swr                                            # a son kullanılan olur
+    swr.set("c", "xxxx")
+
+    assert "b" not in swr and "a" in swr and "c" in swr
+    assert swr.bytes == 8
+    assert swr.stats()["evictions"] == 1
+
+
+def test_oversized_entry_is_rejected_without_evicting_others(clock):
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60, max_bytes=10, info=sized)
+    swr.set("a", "xxxx")
+    swr.set("big", "x" * 11)
+
+    assert "big" not in swr and "a" in swr
+    assert swr.stats()["rejected"] == 1
+    assert swr.stats()["evictions"] == 0
+
+
+def test_registry_budget_evicts_from_namespace_most_over_its_share(clock):
+    registry = cache.CacheRegistry(budget=20)
+    live = registry.namespace("live", 10, 60, share=0.75)
+    fbref = registry.namespace("fbref", 10, 60, share=0.75)
+    live.info = fbref.info = sized
+
+    fbref.set("f1", "x" * 8)
+    fbref.set("f2", "x" * 7)        # fbref payının tamamı (15 bayt)
+    live.set("l1", "x" * 4)         # toplam 19: bütçe içinde
+    live.set("l2", "x" * 4)         # toplam 23: payına göre en dolu alan fbref
+
+    assert registry.bytes <= 20
+    assert "f1" not in fbref and "f2" in fbref
+    assert "l1" in live and "l2" in live
+
+
+def test_failures_are_negatively_cached(clock):
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60, negative_ttl=15)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        raise RuntimeError("upstream down")
+
+    async def attempt():
+        with pytest.raises(RuntimeError):
+            await swr.get_or_fetch("k", fetch)
+
+    asyncio.run(attempt())
+    clock.now += 10
+    asyncio.run(attempt())
+    assert len(calls) == 1
+    assert swr.stats()["negative_hits"] == 1
+    assert swr.stats()["failing_keys"] == 1
+
+    clock.now += 6
+    asyncio.run(attempt())
+    assert len(calls) == 2
+
+
+def test_errors_marked_not_negative_cacheable_are_retried(clock):
+    class Deferred(Exception):
+        negative_cacheable = False
+
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        raise Deferred("kota")
+
+    for _ in range(3):
+        with pytest.raises(Deferred):
+            asyncio.run(swr.get_or_fetch("k", fetch))
+    assert len(calls) == 3
+    assert swr.stats()["failures"] == 0
+
+
+def test_failed_reload_serves_expired_entry_within_stale_if_error(clock):
+    swr = SWRCache(None, soft_ttl=10, hard_ttl=60, stale_if_error=100)
+    swr.set("k", "v1")
+    fallbacks = []
+
+    async def fetch():
+        raise RuntimeError("upstream down")
+
+    clock.now += 70
+    assert asyncio.run(swr.get_or_fetch("k", fetch, on_fallback=fallbacks.append)) == "v1"
+    assert len(fallbacks) == 1 and swr.stats()["fallbacks"] == 1
+
+    clock.now += 100
+    with pytest.raises(RuntimeError):
+        asyncio.run(swr.get_or_fetch("k", fetch))
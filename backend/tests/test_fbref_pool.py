@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import fbref_pool
+from fbref_pool import FBrefBusyError, FBrefPool
+from resilience import CircuitBreaker
+
+
+class Scraper:
+    """read_schedule çağrılarını sayan ve eşzamanlılığı ölçen sahte FBref"""
+
+    def __init__(self, errors=(), delay=0.0, gate=None):
+        self.errors = list(errors)
+        self.delay = delay
+        self.gate = gate
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def read_schedule(self):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            error = self.errors.pop(0) if self.errors else None
+        try:
+            if self.gate is not None:
+                self.gate.wait(5)
+            time.sleep(self.delay)
+            if error is not None:
+                raise error
+            return pd.DataFrame({"home_team": ["Galatasaray"]})
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    pools = []
+
+    def make(scraper, workers=2, queue_size=4):
+        monkeypatch.setattr(fbref_pool, "get_fbref_scraper", lambda leagues, seasons: scraper)
+        monkeypatch.setattr(fbref_pool, "FBREF_RETRIES", 1)
+        monkeypatch.setattr("resilience.backoff_delay", lambda *args: 0)
+        pool = FBrefPool(mode="thread", workers=workers, queue_size=queue_size)
+        pool.breaker = CircuitBreaker("fbref-test", failure_threshold=2, reset_timeout=60)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_full_queue_rejects_new_reads(make_pool):
+    gate = threading.Event()
+    pool = make_pool(Scraper(gate=gate), workers=1, queue_size=1)
+
+    async def run():
+        first = asyncio.ensure_future(pool.run(["TUR-Süper Lig"], ["2425"], "read_schedule"))
+        second = asyncio.ensure_future(pool.run(["ENG-Premier League"], ["2425"], "read_schedule"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(FBrefBusyError):
+            await pool.run(["ESP-La Liga"], ["2425"], "read_schedule")
+        gate.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(run())
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["completed"] == 2
+
+
+def test_reads_of_the_same_league_are_serialized(make_pool):
+    scraper = Scraper(delay=0.05)
+    pool = make_pool(scraper, workers=4)
+
+    async def run(leagues):
+        await asyncio.gather(*[pool.run([league], ["2425"], "read_schedule") for league in leagues])
+
+    asyncio.run(run(["TUR-Süper Lig"] * 3))
+    assert scraper.max_running == 1
+
+    asyncio.run(run(["TUR-Süper Lig", "ENG-Premier League", "ESP-La Liga"]))
+    assert scraper.max_running > 1
+
+
+def test_os_errors_are_retried_and_counted_by_breaker(make_pool):
+    scraper = Scraper(errors=[ConnectionResetError("reset")])
+    pool = make_pool(scraper)
+
+    frame = asyncio.run(pool.run(["TUR-Süper Lig"], ["2425"], "read_schedule"))
+    assert len(frame) == 1
+    assert scraper.calls == 2
+
+    # Denemeleri tükenen her okuma devreye bir hata sayılır
+    scraper.errors = [OSError("down")] * 4
+    for _ in range(2):
+        with pytest.raises(OSError):
+            asyncio.run(pool.run(["TUR-Süper Lig"], ["2425"], "read_schedule"))
+    assert scraper.calls == 6
+    assert pool.breaker.state == "open"
+
+
+def test_value_errors_are_not_retried(make_pool):
+    scraper = Scraper(errors=[ValueError("geçersiz sezon")] * 3)
+    pool = make_pool(scraper)
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            asyncio.run(pool.run(["TUR-Süper Lig"], ["1899"], "read_schedule"))
+    assert scraper.calls == 3
+    assert pool.breaker.state == "closed"
@@ -0,0 +1,55 @@
+import asyncio
+
+import pandas as pd
+
+from fbref_store import FrameKey, FrameStore
+
+
+class CountingPool:
+    def __init__(self):
+        self.reads = []
+
+    async def run(self, leagues, seasons, method, **kwargs):
+        self.reads.append((leagues[0], seasons[0], method))
+        return pd.DataFrame({"team": ["Galatasaray"], "home_team": ["Galatasaray"], "away_team": ["Fenerbahçe"], "score": ["1–0"]})
+
+
+def test_frames_are_bounded_and_evict_current_season_first():
+    pool = CountingPool()
+    store = FrameStore(pool, max_frames=2, current_season="2425")
+
+    async def read():
+        await store.get("TUR-Süper Lig", "2324", "schedule")    # tamamlanmış sezon
+        await store.get("TUR-Süper Lig", "2425", "schedule")
+        await store.get("ENG-Premier League", "2425", "schedule")
+
+    asyncio.run(read())
+    keys = {(key.league, key.season) for key in store._frames}
+    assert keys == {("TUR-Süper Lig", "2324"), ("ENG-Premier League", "2425")}
+    assert store.stats()["evictions"] == 1
+
+
+def test_recently_used_frames_survive_eviction():
+    pool = CountingPool()
+    store = FrameStore(pool, max_frames=2, current_season="2425")
+
+    async def read():
+        await store.get("A", "2425", "schedule")
+        await store.get("B", "2425", "schedule")
+        await store.get("A", "2425", "schedule")                # A yeniden kullanıldı
+        await store.get("C", "2425", "schedule")
+
+    asyncio.run(read())
+    assert set(store._frames) == {FrameKey("A", "2425", "schedule"), FrameKey("C", "2425", "schedule")}
+
+
+def test_evicting_source_drops_derived_table():
+    pool = CountingPool()
+    store = FrameStore(pool, max_frames=1, current_season="2425")
+
+    async def read():
+        await store.get("A", "2425", "league_table")
+        await store.get("B", "2425", "schedule")
+
+    asyncio.run(read())
+    assert store.stats()["derived"] == 0
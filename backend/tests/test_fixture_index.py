@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+import fixture_index as fixture_index_module
+from fixture_index import FixtureIndex
+
+GS, FB = 645, 611
+
+
+def fixture(fixture_id, home, away, timestamp, status="NS", league_id=203):
+    return {
+        "fixture": {"id": fixture_id, "timestamp": timestamp, "date": "ignored", "status": {"short": status}},
+        "league": {"id": league_id, "season": 2024, "round": "Regular Season - 1"},
+        "teams": {"home": {"id": home}, "away": {"id": away}},
+    }
+
+
+# 2024-08-10 23:30 UTC (Türkiye saatiyle ertesi gün)
+LATE_KICKOFF = 1723332600
+
+
+@pytest.fixture
+def index(monkeypatch):
+    competitions = {GS: [203], FB: [203, 206]}     # 206: takip edilmeyen kupa
+
+    async def fixtures(league_id, season):
+        return {"response": [
+            fixture(1, GS, FB, LATE_KICKOFF, "FT"),
+            fixture(2, FB, GS, LATE_KICKOFF + 7 * 86400),
+        ]}
+
+    async def team_leagues(team_id, season):
+        return {"response": [{"league": {"id": league_id}} for league_id in competitions[team_id]]}
+
+    monkeypatch.setattr(fixture_index_module, "get_fixtures", fixtures)
+    monkeypatch.setattr(fixture_index_module, "get_team_leagues", team_leagues)
+    index = FixtureIndex({"super_lig": 203}, 2024)
+    asyncio.run(index.sync_season(203))
+    return index
+
+
+def test_day_buckets_are_utc(index):
+    assert [item["fixture"]["id"] for item in index.on_day("2024-08-10")] == [1]
+    assert index.on_day("2024-08-11") == []
+
+
+def test_team_queries(index):
+    assert [item["fixture"]["id"] for item in index.team_next(GS)] == [2]
+    assert [item["fixture"]["id"] for item in index.team_last(GS)] == [1]
+
+
+def test_answers_team_only_when_all_competitions_tracked(index):
+    assert asyncio.run(index.answers_team(GS)) is True
+    assert asyncio.run(index.answers_team(FB)) is False
+    assert index.stats()["untracked_teams"] == 1
+
+
+def test_answers_team_false_when_competitions_unknown(index, monkeypatch):
+    async def failing(team_id, season):
+        return {"error": "kota"}
+
+    monkeypatch.setattr(fixture_index_module, "get_team_leagues", failing)
+    assert asyncio.run(index.answers_team(GS)) is False
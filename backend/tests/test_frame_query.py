@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from frame_query import FrameQuery, apply_query, decode_cursor, encode_cursor, page_info, parse_query
+
+
+def players():
+    frame = pd.DataFrame({
+        "league": "TUR-Süper Lig",
+        "season": "2425",
+        "team": ["Galatasaray", "Galatasaray", "Fenerbahçe", "Beşiktaş"],
+        "player": ["Mauro Icardi", "Dries Mertens", "Edin Džeko", "Ciro Immobile"],
+        "Gls": [20, 5, 18, 15],
+        "Ast": [4, 10, 6, 3],
+    }).set_index(["league", "season", "team", "player"])
+    frame.columns = pd.MultiIndex.from_tuples([("Performance", "Gls"), ("Performance", "Ast")])
+    return frame
+
+
+def test_empty_query_returns_same_frame():
+    frame = players()
+    query = parse_query()
+    assert query.is_empty and query.cache_suffix() == ""
+    assert apply_query(frame, query) is frame
+
+
+def test_fields_sort_and_page_on_flattened_columns():
+    query = parse_query(fields="player, Performance_Gls,missing", sort="-Performance_Gls", limit=2, offset=1)
+    result = apply_query(players(), query)
+    assert list(result.columns) == ["player", "Performance_Gls"]
+    assert result["player"].tolist() == ["Edin Džeko", "Ciro Immobile"]
+    assert result.index.tolist() == [0, 1]
+
+
+def test_sort_is_stable_with_secondary_key():
+    result = apply_query(players(), parse_query(fields="player", sort="team,-Performance_Ast"))
+    assert result["player"].tolist() == ["Ciro Immobile", "Edin Džeko", "Dries Mertens", "Mauro Icardi"]
+
+
+def test_unknown_sort_field_raises():
+    with pytest.raises(ValueError):
+        apply_query(players(), parse_query(sort="xG"))
+
+
+def test_cursor_round_trip_and_page_info():
+    assert decode_cursor(encode_cursor(40)) == 40
+    with pytest.raises(ValueError):
+        decode_cursor("bozuk")
+
+    query = parse_query(limit=2, cursor=encode_cursor(2))
+    assert query.offset == 2
+    assert page_info(5, query) == {"total": 5, "offset": 2, "limit": 2, "next_cursor": encode_cursor(4)}
+    assert page_info(4, query)["next_cursor"] is None
+
+
+def test_cache_suffix_distinguishes_queries():
+    assert FrameQuery(["team"]).cache_suffix() != FrameQuery(["team"], limit=10).cache_suffix()
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from h2h_index import H2HIndex, build_season, pair_key
+
+
+def schedule(rows, score_column=True):
+    records = []
+    for home, away, score in rows:
+        record = {"league": "TUR-Süper Lig", "season": "2425", "game": f"{home}-{away}", "home_team": home, "away_team": away}
+        if score_column:
+            record["score"] = score
+        else:
+            home_goals, away_goals = score.split("–") if score else (np.nan, np.nan)
+            record["home_score"], record["away_score"] = home_goals, away_goals
+        records.append(record)
+    return pd.DataFrame(records).set_index(["league", "season", "game"])
+
+
+ROWS = [
+    ("Galatasaray", "Fenerbahçe", "2–1"),
+    ("Fenerbahçe", "Galatasaray", "1–1"),
+    ("Galatasaray", "Beşiktaş", "0–3"),
+    ("Beşiktaş", "Fenerbahçe", None),     # oynanmamış
+]
+
+
+def test_pair_key_is_unordered():
+    assert pair_key("b", "a") == pair_key("a", "b") == ("a", "b")
+
+
+def test_build_season_parses_soccerdata_score_column():
+    season = build_season(schedule(ROWS))
+    pair = pair_key("Galatasaray", "Fenerbahçe")
+    assert len(season.matches[pair]) == 2
+    # "a" = Fenerbahçe (alfabetik): 1 beraberlik, 1 Galatasaray galibiyeti
+    played, a_wins, b_wins, draws, a_goals, b_goals = season.summary[pair][:6]
+    assert (played, a_wins, b_wins, draws, a_goals, b_goals) == (2, 0, 1, 1, 2, 3)
+
+
+def test_unplayed_matches_are_not_counted():
+    season = build_season(schedule(ROWS))
+    summary = season.summary[pair_key("Beşiktaş", "Fenerbahçe")]
+    assert summary[0] == 0 and summary[1:].sum() == 0
+
+
+def test_score_variants_and_numeric_fallback():
+    variants = schedule([("A", "B", "(4) 1–1 (3)"), ("B", "A", "2-0")])
+    assert build_season(variants).summary[("A", "B")][:6].tolist() == [2, 0, 1, 1, 1, 3]
+
+    numeric = build_season(schedule(ROWS, score_column=False))
+    assert numeric.summary[pair_key("Galatasaray", "Beşiktaş")][0] == 1
+
+
+def test_lookup_is_from_team1_perspective_and_merges_seasons():
+    index = H2HIndex()
+    index.index_schedule("TUR-Süper Lig", "2425", schedule(ROWS))
+    index.index_schedule("TUR-Süper Lig", "2324", schedule([("Fenerbahçe", "Galatasaray", "0–2")]))
+
+    result = index.lookup("Galatasaray", "Fenerbahçe", "TUR-Süper Lig", ["2425", "2324"])
+    summary = result["summary"]
+    assert summary["total_matches"] == 3
+    assert (summary["team1_wins"], summary["team2_wins"], summary["draws"]) == (2, 0, 1)
+    assert (summary["team1_goals"], summary["team2_goals"]) == (5, 2)
+    assert (summary["team1_home_wins"], summary["team1_away_wins"]) == (1, 1)
+
+
+def test_lookup_requires_every_season_indexed():
+    index = H2HIndex()
+    index.index_schedule("TUR-Süper Lig", "2425", schedule(ROWS))
+    assert index.lookup("Galatasaray", "Fenerbahçe", "TUR-Süper Lig", ["2425", "2324"]) is None
@@ -0,0 +1,83 @@
+import asyncio
+
+import httpx
+import pytest
+
+import http_clients
+from http_clients import ClientRegistry
+
+TIMEOUT = httpx.Timeout(5)
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Oluşturulan httpx istemcileri (sahte transport'la)"""
+    clients = []
+    real_client = httpx.AsyncClient
+
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    def make(**kwargs):
+        client = real_client(transport=httpx.MockTransport(handler), **kwargs)
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(http_clients.httpx, "AsyncClient", make)
+    return clients
+
+
+def test_registry_shares_one_client_per_name():
+    registry = ClientRegistry()
+    first = registry.client("api_football", TIMEOUT)
+    assert registry.client("api_football", httpx.Timeout(60)) is first
+    assert registry.client("grok", TIMEOUT) is not first
+    assert set(registry.stats()) == {"api_football", "grok"}
+
+
+def test_requests_reuse_the_pooled_client_until_closed(opened):
+    registry = ClientRegistry()
+    client = registry.client("api_football", TIMEOUT)
+
+    async def run():
+        registry.start()
+        assert client.stats()["started"]
+        for _ in range(3):
+            response = await client.get("https://example.test/fixtures")
+            assert response.json() == {"path": "/fixtures"}
+        assert len(opened) == 1
+
+        await registry.aclose()
+        assert not client.stats()["started"] and opened[0].is_closed
+
+        # Kapanıştan sonraki istek istemciyi yeniden açar
+        await client.get("https://example.test/status")
+        assert len(opened) == 2
+        await registry.aclose()
+
+    asyncio.run(run())
+    assert client.stats()["requests"] == 4
+
+
+def test_in_flight_requests_are_limited_to_pool_size(opened):
+    registry = ClientRegistry()
+    client = registry.client("grok", TIMEOUT, max_connections=2)
+    peak = []
+
+    async def watch():
+        while True:
+            peak.append(client.stats()["in_flight"])
+            await asyncio.sleep(0.002)
+
+    async def run():
+        watcher = asyncio.ensure_future(watch())
+        await asyncio.gather(*[client.post("https://example.test/chat") for _ in range(6)])
+        watcher.cancel()
+        await registry.aclose()
+
+    asyncio.run(run())
+    stats = client.stats()
+    assert max(peak) == 2
+    assert stats["requests"] == 6 and stats["errors"] == 0
+    assert stats["max_wait_ms"] > 0
@@ -0,0 +1,40 @@
+import asyncio
+import json
+
+import id_map as id_map_module
+from id_map import IdMap
+
+
+def test_save_merges_other_workers_entries(tmp_path):
+    path = tmp_path / "id_map.json"
+    path.write_text(json.dumps({"team_aliases": {"besiktas": 549}, "player_aliases": {"icardi": 1}}))
+
+    table = IdMap(str(path))
+    table.learn_team("Göztepe", 994)
+    path.write_text(json.dumps({"team_aliases": {"besiktas": 549, "bodrum fk": 1011}}))
+    asyncio.run(table.save())
+
+    saved = json.loads(path.read_text())
+    assert saved["team_aliases"]["goztepe"] == 994
+    assert saved["team_aliases"]["bodrum fk"] == 1011
+    assert saved["player_aliases"] == {"icardi": 1}
+    assert table.team_id("Bodrum FK") == 1011
+
+
+def test_resolve_player_id_searches_once_and_persists(tmp_path, monkeypatch):
+    calls = []
+
+    async def search_player(name):
+        calls.append(name)
+        return {"response": [{"player": {"id": 7, "name": "M. Icardi", "firstname": "Mauro", "lastname": "Icardi"}}]}
+
+    monkeypatch.setattr(id_map_module, "search_player", search_player)
+    table = IdMap(str(tmp_path / "id_map.json"))
+
+    async def resolve():
+        return [await table.resolve_player_id("Mauro Icardi"), await table.resolve_player_id("mauro icardi")]
+
+    assert asyncio.run(resolve()) == [7, 7]
+    assert calls == ["Mauro Icardi"]
+    assert IdMap(str(tmp_path / "id_map.json")).player_id("Mauro Icardi") == 7
+    assert table.stats()["upstream_lookups"] == 1
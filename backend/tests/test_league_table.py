@@ -0,0 +1,60 @@
+import asyncio
+
+import pandas as pd
+
+from fbref_store import FrameStore
+from frame_query import apply_query, parse_query
+from league_table import build_league_table
+
+
+def schedule():
+    rows = [
+        ("Galatasaray", "Fenerbahçe", "2–1"),
+        ("Beşiktaş", "Galatasaray", "1–1"),
+        ("Fenerbahçe", "Beşiktaş", "3–0"),
+        ("Galatasaray", "Beşiktaş", None),      # oynanmamış
+    ]
+    return pd.DataFrame([
+        {"league": "TUR-Süper Lig", "season": "2425", "game": f"{home}-{away}", "home_team": home, "away_team": away, "score": score}
+        for home, away, score in rows
+    ]).set_index(["league", "season", "game"])
+
+
+def test_build_league_table():
+    table = build_league_table(schedule())
+    rows = table.reset_index().set_index("team")
+
+    assert list(rows.index) == ["Galatasaray", "Fenerbahçe", "Beşiktaş"]
+    assert rows.loc["Galatasaray", ["Rk", "MP", "W", "D", "L", "GF", "GA", "GD", "Pts"]].tolist() == [1, 2, 1, 1, 0, 3, 2, 1, 4]
+    assert rows.loc["Fenerbahçe", ["MP", "W", "L", "GD", "Pts"]].tolist() == [2, 1, 1, 2, 3]
+    assert rows.loc["Beşiktaş", ["MP", "Pts", "GD"]].tolist() == [2, 1, -3]
+
+
+def test_standings_projection_matches_frontend_fields():
+    query = parse_query("team,MP,W,D,L,GF,GA,GD,Pts")
+    result = apply_query(build_league_table(schedule()), query)
+    assert list(result.columns) == ["team", "MP", "W", "D", "L", "GF", "GA", "GD", "Pts"]
+
+
+class FakePool:
+    def __init__(self):
+        self.methods = []
+
+    async def run(self, leagues, seasons, method, **kwargs):
+        self.methods.append(method)
+        return schedule()
+
+
+def test_store_derives_league_table_from_schedule():
+    pool = FakePool()
+    store = FrameStore(pool)
+
+    async def read():
+        first = await store.get("TUR-Süper Lig", "2425", "league_table")
+        second = await store.get("TUR-Süper Lig", "2425", "league_table")
+        return first, second
+
+    first, second = asyncio.run(read())
+    assert pool.methods == ["read_schedule"]
+    assert first is second
+    assert store.stats()["derived"] == 1
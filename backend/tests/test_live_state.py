@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+import live_state
+from live_state import LiveStateStore
+
+
+def match(fixture_id, home_goals, away_goals, minute, status="1H", events=None):
+    item = {
+        "fixture": {"id": fixture_id, "status": {"short": status, "elapsed": minute}},
+        "league": {"id": 203},
+        "teams": {"home": {"name": "Galatasaray"}, "away": {"name": "Fenerbahçe"}},
+        "goals": {"home": home_goals, "away": away_goals},
+    }
+    if events is not None:
+        item["events"] = events
+    return item
+
+
+GOAL = {"time": {"elapsed": 12, "extra": None}, "team": {"id": 645}, "player": {"id": 1}, "type": "Goal", "detail": "Normal Goal"}
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = LiveStateStore()
+    fetched = []
+
+    async def events(fixture_id):
+        # Olay çekilirken kilit serbest olmalı
+        assert not store._lock.locked()
+        fetched.append(fixture_id)
+        return {"response": [GOAL]}
+
+    monkeypatch.setattr(live_state, "get_fixture_events", events)
+    store.fetched = fetched
+    return store
+
+
+def test_score_change_fetches_events_outside_lock(store):
+    asyncio.run(store.apply(None, {"response": [match(1, 0, 0, 5)]}))
+    asyncio.run(store.apply(None, {"response": [match(1, 1, 0, 12)]}))
+
+    assert store.fetched == [1]
+    change = store.since(1)["changes"][0]
+    assert change["changes"] == {"score": {"home": 1, "away": 0}, "minute": 12}
+    assert change["new_events"] == [GOAL]
+
+
+def test_minute_only_change_does_not_fetch_events(store):
+    asyncio.run(store.apply(None, {"response": [match(1, 0, 0, 5)]}))
+    asyncio.run(store.apply(None, {"response": [match(1, 0, 0, 6)]}))
+    assert store.fetched == []
+    assert store.version == 2
+
+
+def test_error_response_keeps_matches(store):
+    asyncio.run(store.apply(None, {"response": [match(1, 0, 0, 5)]}))
+    asyncio.run(store.apply(None, {"errors": {"requests": "limit"}, "response": []}))
+    assert list(store.fixtures) == [1]
+    assert store.version == 1
+
+
+def test_removed_when_missing_from_scope(store):
+    asyncio.run(store.apply(None, {"response": [match(1, 0, 0, 5), match(2, 0, 0, 5)]}))
+    asyncio.run(store.apply(None, {"response": [match(2, 0, 0, 6)]}))
+    assert list(store.fixtures) == [2]
+    assert [change["type"] for change in store.since(2)["changes"]] == ["updated", "removed"]
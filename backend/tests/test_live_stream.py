@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+import live_stream
+from apif_quota import Priority, QuotaScheduler
+from live_stream import LIVE_RESERVE_POLL_INTERVAL, LeaguePoller
+
+
+@pytest.fixture
+def poller(monkeypatch):
+    calls = []
+
+    async def refresh(league_id=None, refresh=False, priority=None):
+        calls.append({"league": league_id, "refresh": refresh, "priority": priority})
+        return {"response": [{"fixture": {"id": 1}}], "results": 1}
+
+    quota = QuotaScheduler(per_minute=10, daily_limit=100)
+    monkeypatch.setattr(live_stream.live_state, "refresh", refresh)
+    monkeypatch.setattr(live_stream, "quota", quota)
+    poller = LeaguePoller(203, interval=15)
+    poller.calls = calls
+    poller.quota = quota
+    return poller
+
+
+def test_poll_uses_cache_at_normal_priority(poller):
+    queue = asyncio.Queue()
+    poller.subscribers.add(queue)
+    asyncio.run(poller.poll())
+    asyncio.run(poller.poll())
+
+    assert poller.calls == [{"league": 203, "refresh": False, "priority": Priority.NORMAL}] * 2
+    # Aynı sonuç bir kez yayınlanır
+    assert queue.qsize() == 1
+    assert poller.stats()["broadcasts"] == 1
+
+
+def test_poll_slows_then_stops_as_quota_reserve_is_reached(poller):
+    assert poller.current_interval() == 15
+
+    poller.quota.update({"x-ratelimit-requests-limit": "100", "x-ratelimit-requests-remaining": "20"})
+    assert poller.current_interval() == LIVE_RESERVE_POLL_INTERVAL
+    asyncio.run(poller.poll())
+    assert len(poller.calls) == 1
+
+    poller.quota.update({"x-ratelimit-requests-remaining": "5"})
+    asyncio.run(poller.poll())
+    assert len(poller.calls) == 1
+    assert poller.stats()["skipped"] == 1
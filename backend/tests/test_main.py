@@ -0,0 +1,69 @@
+import asyncio
+
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+import main
+from frame_query import parse_query
+from fixture_index import FixtureIndex
+
+
+def fixture(fixture_id, league_id, timestamp=1723320000):
+    return {
+        "fixture": {"id": fixture_id, "timestamp": timestamp, "status": {"short": "NS"}},
+        "league": {"id": league_id, "season": 2024, "round": "Regular Season - 1"},
+        "teams": {"home": {"id": 645}, "away": {"id": 611}},
+    }
+
+
+@pytest.fixture
+def today(monkeypatch):
+    upstream = []
+
+    async def fixtures(league_id, season):
+        return {"response": [fixture(1, 203)]}
+
+    async def today_matches(league_id=None):
+        upstream.append(league_id)
+        return {"response": [fixture(1, 203), fixture(9, 999)]}
+
+    monkeypatch.setattr("fixture_index.get_fixtures", fixtures)
+    index = FixtureIndex({"super_lig": 203}, 2024)
+    asyncio.run(index.sync_season(203))
+    monkeypatch.setattr(main, "fixture_index", index)
+    monkeypatch.setattr(main, "get_today_matches", today_matches)
+    monkeypatch.setattr(main, "utc_today", lambda: "2024-08-10")
+    return upstream
+
+
+def test_today_for_tracked_league_comes_from_index(today):
+    result = asyncio.run(main.today_matches("super_lig"))
+    assert (result["source"], result["count"]) == ("index", 1)
+    assert today == []
+
+
+def test_today_without_league_returns_every_league_from_upstream(today):
+    result = asyncio.run(main.today_matches())
+    assert (result["source"], result["count"]) == ("api", 2)
+    assert today == [None]
+
+
+def test_bad_sort_is_a_client_error_not_an_upstream_failure(monkeypatch):
+    frame = pd.DataFrame({"team": ["Galatasaray", "Fenerbahçe"], "Pts": [80, 75]})
+    fetched = []
+
+    async def fetch():
+        fetched.append(1)
+        return {"standings": main.query_frame(frame, parse_query(sort="-xG"))}
+
+    async def request():
+        with pytest.raises(HTTPException) as error:
+            await main.cached("standings", "standings_test_q:-xG", fetch)
+        assert error.value.status_code == 400
+
+    for _ in range(2):
+        asyncio.run(request())
+    stats = main.caches["standings"].stats()
+    assert len(fetched) == 2
+    assert (stats["failures"], stats["failing_keys"]) == (0, 0)
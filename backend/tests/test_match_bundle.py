@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+import api_football
+import match_bundle
+from cache import record_cache_state
+from match_bundle import get_match_bundle, get_match_bundles
+
+
+def item(fixture_id):
+    return {
+        "fixture": {"id": fixture_id},
+        "teams": {"home": {"id": 645}, "away": {"id": 611}},
+        "events": [{"type": "Goal"}],
+        "lineups": [{"team": {"id": 645}}],
+        "statistics": [],
+        "players": [{"team": {"id": 645}}],
+    }
+
+
+@pytest.fixture
+def parts(monkeypatch):
+    """Beş parçanın hepsi başlamadan hiçbiri bitmeyen sahte API-Football"""
+    started = []
+
+    def part(name, response, state=None):
+        async def fetch(fixture_id):
+            started.append(name)
+            while len(started) < 5:
+                await asyncio.sleep(0)
+            if state is not None:
+                record_cache_state(state, time.time() - 30)
+            return response if "error" in response else {"response": response}
+        return fetch
+
+    monkeypatch.setattr(match_bundle, "get_fixture_by_id", part("fixture", [item(1)], "hit"))
+    monkeypatch.setattr(match_bundle, "get_fixture_statistics", part("statistics", [{"type": "Shots"}], "stale"))
+    monkeypatch.setattr(match_bundle, "get_fixture_lineups", part("lineups", []))
+    monkeypatch.setattr(match_bundle, "get_fixture_events", part("events", {"error": "API Hatası: 503"}))
+    monkeypatch.setattr(match_bundle, "get_predictions", part("predictions", [{"winner": "Galatasaray"}]))
+    return started
+
+
+def test_bundle_fetches_parts_concurrently_and_reports_each(parts):
+    bundle = asyncio.run(asyncio.wait_for(get_match_bundle(1), timeout=1))
+
+    assert sorted(parts) == ["events", "fixture", "lineups", "predictions", "statistics"]
+    assert bundle["fixture"]["fixture"]["id"] == 1
+    assert bundle["statistics"] == [{"type": "Shots"}]
+    assert bundle["lineups"] == []
+    assert bundle["events"] is None
+    assert bundle["predictions"] == {"winner": "Galatasaray"}
+    assert bundle["parts"]["fixture"]["cache"] == "hit"
+    assert bundle["parts"]["statistics"] == {"cache": "stale", "age": 30}
+    assert bundle["parts"]["events"] == {"error": "API Hatası: 503"}
+    assert bundle["parts"]["lineups"] == {}
+
+
+def test_bundle_for_unknown_fixture_is_none(parts, monkeypatch):
+    async def missing(fixture_id):
+        parts.append("fixture")
+        return {"response": []}
+
+    monkeypatch.setattr(match_bundle, "get_fixture_by_id", missing)
+    assert asyncio.run(get_match_bundle(404)) is None
+
+
+def test_bundles_split_embedded_parts_and_keep_order(monkeypatch):
+    async def by_ids(fixture_ids):
+        return {"response": [item(fixture_id) for fixture_id in fixture_ids if fixture_id != 3]}
+
+    predicted = []
+
+    async def predictions(fixture_id):
+        predicted.append(fixture_id)
+        return {"response": [{"fixture": fixture_id}]}
+
+    monkeypatch.setattr(match_bundle, "get_fixtures_by_ids", by_ids)
+    monkeypatch.setattr(match_bundle, "get_predictions", predictions)
+
+    result = asyncio.run(get_match_bundles([2, 3, 1], predictions=True))
+
+    assert [bundle["fixture_id"] for bundle in result["matches"]] == [2, 1]
+    assert result["missing"] == [3]
+    first = result["matches"][0]
+    assert set(first["fixture"]) == {"fixture", "teams"}
+    assert first["events"] == [{"type": "Goal"}] and first["statistics"] == []
+    assert first["predictions"] == {"fixture": 2}
+    assert set(first["parts"]) == {"fixture", "statistics", "lineups", "events", "predictions"}
+    assert sorted(predicted) == [1, 2, 3]
+
+
+def test_fixtures_by_ids_fans_out_in_chunks(monkeypatch):
+    requests = []
+
+    async def api_request(endpoint, params):
+        ids = [int(fixture_id) for fixture_id in params["ids"].split("-")]
+        requests.append(ids)
+        if 41 in ids:
+            return {"error": "API Hatası: 503"}
+        return {"response": [{"fixture": {"id": fixture_id}} for fixture_id in ids]}
+
+    monkeypatch.setattr(api_football, "api_request", api_request)
+    data = asyncio.run(api_football.get_fixtures_by_ids(list(range(45, 0, -1)) + [1]))
+
+    assert [len(ids) for ids in requests] == [20, 20, 5]
+    assert requests[0][0] == 1
+    assert data["results"] == 40
+    assert data["errors"] == ["API Hatası: 503"]
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from name_index import NameIndex, fold
+
+LEAGUE = "TUR-Süper Lig"
+
+
+def players():
+    return pd.DataFrame({
+        "league": LEAGUE,
+        "season": "2425",
+        "team": ["Galatasaray", "Galatasaray", "Fenerbahçe", "Beşiktaş"],
+        "player": ["Mauro Icardi", "Dries Mertens", "Edin Džeko", "Ciro Immobile"],
+        "Gls": [20, 5, 18, 15],
+    }).set_index(["league", "season", "team", "player"])
+
+
+def schedule():
+    return pd.DataFrame({
+        "home_team": ["Göztepe", "Galatasaray"],
+        "away_team": ["Fenerbahçe", "Eyüpspor"],
+    })
+
+
+def index():
+    names = NameIndex()
+    names.index_frame("players", LEAGUE, players())
+    names.index_frame("schedule", LEAGUE, schedule())
+    return names
+
+
+def test_fold_strips_accents_and_turkish_letters():
+    assert fold("Edin Džeko") == "edin dzeko"
+    assert fold("BEŞİKTAŞ  J.K.") == "besiktas j k"
+    assert fold("Kasımpaşa") == "kasimpasa"
+
+
+def test_prefix_search_ranks_exact_and_prefix_matches_first():
+    names = index()
+    assert [entry.name for entry in names.search("gal", "team")] == ["Galatasaray"]
+    assert names.best("dzeko", "player") == "Edin Džeko"
+    assert names.best("icardi", "player") == "Mauro Icardi"
+
+
+def test_substring_and_multi_token_queries():
+    names = index()
+    assert names.best("tasaray", "team") == "Galatasaray"
+    assert names.best("mau ica", "player") == "Mauro Icardi"
+    assert names.search("mau mer", "player") == []
+
+
+def test_schedule_columns_and_league_filter():
+    names = index()
+    assert names.teams(LEAGUE) == ["Beşiktaş", "Eyüpspor", "Fenerbahçe", "Galatasaray", "Göztepe"]
+    assert names.search("gal", "team", league="ENG-Premier League") == []
+
+
+def test_reindexing_a_source_replaces_its_entries():
+    names = index()
+    names.index_frame("schedule", LEAGUE, pd.DataFrame({"home_team": ["Samsunspor"], "away_team": ["Galatasaray"]}))
+    assert "Göztepe" not in names.teams(LEAGUE)
+    assert names.best("samsun", "team") == "Samsunspor"
+    assert names.names("galatasaray", "team") == ["Galatasaray"]
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+import fbref_pool
+from fbref_pool import FBrefPool
+from resilience import CircuitBreaker, CircuitOpenError, retry_async
+
+
+def test_breaker_opens_after_threshold_and_rejects():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            with breaker.protect((ConnectionError,)):
+                raise ConnectionError
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_breaker_half_open_allows_single_probe():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+    breaker.before()
+    breaker.failure()
+    asyncio.run(asyncio.sleep(0.02))
+
+    breaker.before()                      # deneme isteği
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before()                  # ikinci istek beklemeden reddedilir
+    breaker.success()
+    assert breaker.state == "closed"
+
+
+def test_breaker_ignores_unlisted_errors():
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    with pytest.raises(ValueError):
+        with breaker.protect((ConnectionError,)):
+            raise ValueError
+    assert breaker.state == "closed"
+    assert breaker.stats()["failures"] == 0
+
+
+def test_retry_async_retries_only_listed_errors():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError
+        return "ok"
+
+    assert asyncio.run(retry_async(flaky, retry_on=(ConnectionError,), attempts=2, base_delay=0)) == "ok"
+    assert len(calls) == 3
+
+    calls.clear()
+
+    async def broken():
+        calls.append(1)
+        raise KeyError("x")
+
+    with pytest.raises(KeyError):
+        asyncio.run(retry_async(broken, retry_on=(ConnectionError,), attempts=2, base_delay=0))
+    assert len(calls) == 1
+
+
+class FakeScraper:
+    calls = 0
+
+    def __init__(self, error):
+        self.error = error
+
+    def read_schedule(self):
+        FakeScraper.calls += 1
+        raise self.error
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    def make(error):
+        FakeScraper.calls = 0
+        monkeypatch.setattr(fbref_pool, "get_fbref_scraper", lambda leagues, seasons: FakeScraper(error))
+        monkeypatch.setattr(fbref_pool, "FBREF_RETRIES", 1)
+        pool = FBrefPool(mode="thread", workers=1)
+        pool.breaker = CircuitBreaker("fbref-test", failure_threshold=1, reset_timeout=60)
+        return pool
+    return make
+
+
+def test_pool_programming_errors_skip_retry_and_breaker(pool):
+    fbref = pool(AttributeError("read_league_table"))
+    with pytest.raises(AttributeError):
+        asyncio.run(fbref.run(["TUR-Süper Lig"], ["2425"], "read_schedule"))
+    assert FakeScraper.calls == 1
+    assert fbref.breaker.state == "closed"
+    fbref.shutdown()
+
+
+def test_pool_network_errors_retry_and_open_breaker(pool, monkeypatch):
+    monkeypatch.setattr("resilience.backoff_delay", lambda *args: 0)
+    fbref = pool(ConnectionError("FBref'e ulaşılamadı"))
+    with pytest.raises(ConnectionError):
+        asyncio.run(fbref.run(["TUR-Süper Lig"], ["2425"], "read_schedule"))
+    assert FakeScraper.calls == 2
+    assert fbref.breaker.state == "open"
+    fbref.shutdown()
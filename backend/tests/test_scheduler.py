@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+import scheduler
+from scheduler import PrewarmScheduler
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def today_matches(league_id=None):
+        calls.append(("date", league_id))
+        return {"response": [{"league": {"id": 203}}, {"league": {"id": 39}}, {"league": {"id": 9999}}]}
+
+    async def standings(league_id, refresh=False):
+        calls.append(("standings", league_id))
+        return {"response": []}
+
+    async def fixtures(league_id, refresh=False):
+        calls.append(("fixtures", league_id))
+        return {"response": []}
+
+    monkeypatch.setattr(scheduler, "get_today_matches", today_matches)
+    monkeypatch.setattr(scheduler, "get_standings", standings)
+    monkeypatch.setattr(scheduler, "get_fixtures", fixtures)
+    monkeypatch.setattr(scheduler, "APIF_MATCHDAY_INTERVAL", 0)
+    return calls
+
+
+def run_jobs(prewarm, league_ids):
+    async def run():
+        return [await prewarm._apif_job(league_id)() for league_id in league_ids]
+    return asyncio.run(run())
+
+
+def test_only_playing_leagues_are_polled_with_one_date_call(upstream, monkeypatch):
+    monkeypatch.setattr(scheduler, "APIF_PREWARM_BUDGET", 100)
+    prewarm = PrewarmScheduler(None, {}, "2425")
+
+    assert run_jobs(prewarm, [203, 140, 39]) == ["matchday", "idle", "matchday"]
+    assert upstream.count(("date", None)) == 1
+    assert {league for name, league in upstream if name != "date"} == {203, 39}
+    assert prewarm.apif_budget()["playing_leagues"] == [39, 203]
+
+
+def test_refreshes_stay_within_daily_budget(upstream, monkeypatch):
+    monkeypatch.setattr(scheduler, "APIF_PREWARM_BUDGET", 5)
+    prewarm = PrewarmScheduler(None, {}, "2425")
+
+    for _ in range(10):
+        prewarm._apif_last_refresh.clear()
+        run_jobs(prewarm, [203, 39])
+
+    assert len(upstream) <= 5
+    assert {league for name, league in upstream if name != "date"} == {203, 39}
+    assert prewarm.apif_budget()["remaining"] >= 0
+
+
+def test_concurrent_jobs_share_the_daily_date_lookup(upstream, monkeypatch):
+    monkeypatch.setattr(scheduler, "APIF_PREWARM_BUDGET", 100)
+    original = scheduler.get_today_matches
+
+    async def slow_today_matches(league_id=None):
+        await asyncio.sleep(0.01)
+        return await original(league_id)
+
+    monkeypatch.setattr(scheduler, "get_today_matches", slow_today_matches)
+    prewarm = PrewarmScheduler(None, {}, "2425")
+
+    async def run():
+        return await asyncio.gather(*[prewarm._apif_job(league_id)() for league_id in (203, 39, 140)])
+
+    assert asyncio.run(run()) == ["matchday", "matchday", "idle"]
+    assert upstream.count(("date", None)) == 1
+    assert prewarm.apif_budget()["remaining"] == 100 - 1 - 2 * scheduler.APIF_REFRESH_COST
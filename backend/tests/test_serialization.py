@@ -0,0 +1,74 @@
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from serialization import content_version, dumps, encode, flatten_columns, frame_records
+
+
+def stats():
+    frame = pd.DataFrame({
+        "league": "TUR-Süper Lig",
+        "season": "2425",
+        "team": ["Galatasaray", "Fenerbahçe"],
+        "Gls": [20, np.nan],
+        "Ast": [4, 6],
+        "date": [pd.Timestamp("2024-08-10 19:00"), pd.NaT],
+    }).set_index(["league", "season", "team"])
+    frame.columns = pd.MultiIndex.from_tuples([
+        ("Performance", "Gls"), ("Performance", "Ast"), ("Unnamed: 5_level_0", "date"),
+    ])
+    return frame
+
+
+def test_flatten_columns_skips_unnamed_levels():
+    assert list(flatten_columns(stats()).columns) == ["Performance_Gls", "Performance_Ast", "date"]
+
+
+def test_frames_are_spliced_into_the_envelope():
+    payload = {
+        "league": "super_lig",
+        "data": stats(),
+        "other": stats().iloc[:1],
+        "count": np.int64(2),
+        "missing": np.float64("nan"),
+        "updated_at": datetime(2024, 8, 10, 21, 0),
+    }
+    decoded = json.loads(dumps(payload))
+
+    assert decoded["league"] == "super_lig"
+    assert decoded["count"] == 2 and decoded["missing"] is None
+    assert decoded["updated_at"] == "2024-08-10T21:00:00"
+    assert decoded["data"] == [
+        {"league": "TUR-Süper Lig", "season": "2425", "team": "Galatasaray",
+         "Performance_Gls": 20.0, "Performance_Ast": 4, "date": "2024-08-10T19:00:00"},
+        {"league": "TUR-Süper Lig", "season": "2425", "team": "Fenerbahçe",
+         "Performance_Gls": None, "Performance_Ast": 6, "date": None},
+    ]
+    assert decoded["other"] == decoded["data"][:1]
+    assert frame_records(stats()) == decoded["data"]
+
+
+def test_frame_marker_text_in_data_is_left_alone():
+    decoded = json.loads(dumps({"note": "@@frame-0@@", "data": stats()}))
+    assert decoded["note"] == "@@frame-0@@"
+    assert len(decoded["data"]) == 2
+
+
+def test_volatile_keys_do_not_change_the_version():
+    first = encode({"data": stats(), "updated_at": "2024-08-10T21:00:00", "timestamp": "a"})
+    second = encode({"data": stats(), "updated_at": "2024-08-11T09:00:00", "timestamp": "b"})
+    assert first.version == second.version
+    assert first.body != second.body
+    assert json.loads(second.body)["updated_at"] == "2024-08-11T09:00:00"
+
+    changed = stats()
+    changed.iloc[0, 0] = 21
+    assert encode({"data": changed, "updated_at": "2024-08-10T21:00:00"}).version != first.version
+
+
+def test_encode_without_stable_keys_is_valid_json():
+    encoded = encode({"timestamp": "a"})
+    assert json.loads(encoded.body) == {"timestamp": "a"}
+    assert encoded.version == content_version(b"{}")